@@ -1,5 +1,5 @@
 import streamlit as st
-from utils.db_utils import load_all_jobs,get_statistics
+from utils.db_utils import get_statistics, show_data_access_stats
 import plotly.express as px
 
 # sets page title and icon in the browser tab
@@ -67,13 +67,12 @@ with col2:
 st.divider()
 st.header("Current Database Statistics")
 
-# load statistics and job data
+# load statistics (a single aggregate query)
 with st.spinner("Loading dashboard data..."):
     stats = get_statistics()
-    df = load_all_jobs()
 
 # show warning if no data available
-if df.empty:
+if not stats['total_jobs']:
     st.warning("⚠️ No job data available. The database might be empty or there might be a connection issue.")
 else:
     col1, col2, col3, col4 = st.columns(4)# display key metrics in four columns
@@ -92,16 +91,14 @@ else:
      #display each source with job count in a row of columns
     st.divider()
     st.header("Integrated Data Sources")
-    sources = df['source'].unique()
-    cols = st.columns(len(sources))
-    for i, source in enumerate(sources):
+    source_counts = sorted(stats['per_source'].items(), key=lambda item: item[1], reverse=True)
+    cols = st.columns(len(source_counts))
+    for i, (source, count) in enumerate(source_counts):
         with cols[i]:
-            count = len(df[df['source'] == source])
             st.info(f"**{source}**\n\n{count:,} jobs")
 
     #Pie chart: Job distribution by Source
-    source_counts = df['source'].value_counts()
-    fig = px.pie(values=source_counts.values, names=source_counts.index, 
+    fig = px.pie(values=[count for _, count in source_counts], names=[source for source, _ in source_counts], 
                 title="Distribution by Source",
                 color_discrete_sequence=['#42A5F5', '#90CAF9', '#BBDEFB']
                 )
@@ -133,3 +130,5 @@ with col3:
 # Footer
 st.divider()
 st.caption("🛡️ CyberScrape • 2025–2026")
+
+show_data_access_stats()
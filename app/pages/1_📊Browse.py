@@ -1,6 +1,7 @@
 import streamlit as st
-from utils.db_utils import load_all_jobs
-import pandas as pd
+from utils.db_utils import (
+    get_facet_counts, get_filtered_statistics, get_jobs_page, search_jobs, show_data_access_stats
+)
 
 # Sets page title and icon
 st.set_page_config(page_title="Browse Jobs", page_icon="📊", layout="wide")
@@ -10,74 +11,110 @@ st.title("📊 Browse Job Opportunities")
 st.write("Explore all available cybersecurity job listings from multiple sources.")
 st.divider()
 
-# Load all jobs
+# columns shown on a job card
+CARD_COLUMNS = ('title', 'company', 'location', 'source', 'date_posted', 'url')
+
+# jobs per page of each listing mode
+PAGE_SIZES = {"Cards": 20, "Table": 100}
+
+# sort options -> (column, descending) pairs applied by the database
+SORT_ORDERS = {
+    "Most Recent": (('scraped_at', True),),
+    "Company": (('company', False),),
+    "Location": (('location', False),),
+    "Source": (('source', False),),
+}
+
+# Current filter values ('All' means no filter), kept by the sidebar widgets
+filters = {
+    field: None if st.session_state.get(f"filter_{field}", 'All') == 'All' else st.session_state[f"filter_{field}"]
+    for field in ('source', 'company', 'location')
+}
+
+# Load the filter values with their job counts (in-memory facet index)
 with st.spinner("Loading job listings..."):
-    df = load_all_jobs()
+    facets = get_facet_counts(**filters)
 
 # Check if data is available
-if df.empty:
+if not facets['source']:
     st.warning("⚠️ No job data available. The database might be empty.")
     st.info("💡 Run the scrapers to collect job listings first.")
 else:
+    # Full-text search over titles, companies and locations (local index)
+    search_query = st.text_input(
+        "🔎 Search jobs",
+        placeholder="e.g. ingénieur sécurité, SOC analyst, الجزائر",
+        on_change=lambda: st.session_state.update(current_page=1),
+    ).strip()
+    
     # Filters sidebar
     st.sidebar.header("🔍 Filters")
     
+    def facet_filter(label, field):
+        # each value shows how many jobs it gives with the other filters
+        counts = facets[field]
+        total = sum(counts.values())
+        st.sidebar.selectbox(
+            label,
+            ['All'] + list(counts),
+            format_func=lambda value: f"{value} ({total if value == 'All' else counts[value]:,})",
+            key=f"filter_{field}",
+        )
+    
     # Source filter
-    sources = ['All'] + sorted(df['source'].unique().tolist())
-    selected_source = st.sidebar.selectbox("Data Source", sources)
+    facet_filter("Data Source", 'source')
     
     # Company filter
-    companies = ['All'] + sorted(df['company'].unique().tolist())
-    selected_company = st.sidebar.selectbox("Company", companies)
+    facet_filter("Company", 'company')
     
     # Location filter
-    locations = ['All'] + sorted(df['location'].unique().tolist())
-    selected_location = st.sidebar.selectbox("Location", locations)
-    
-    # Apply filters
-    filtered_df = df.copy()
-    
-    if selected_source != 'All':
-        filtered_df = filtered_df[filtered_df['source'] == selected_source]
-    
-    if selected_company != 'All':
-        filtered_df = filtered_df[filtered_df['company'] == selected_company]
-    
-    if selected_location != 'All':
-        filtered_df = filtered_df[filtered_df['location'] == selected_location]
+    facet_filter("Location", 'location')
     
     # Sort options
     st.sidebar.divider()
     st.sidebar.header("📋 Sort Options")
     sort_by = st.sidebar.selectbox(
         "Sort by",
-        ["Most Recent", "Company", "Location", "Source"]
+        (["Relevance"] if search_query else []) + list(SORT_ORDERS)
     )
     
-    if sort_by == "Most Recent":
-        filtered_df = filtered_df.sort_values('scraped_at', ascending=False)
-    elif sort_by == "Company":
-        filtered_df = filtered_df.sort_values('company')
-    elif sort_by == "Location":
-        filtered_df = filtered_df.sort_values('location')
-    elif sort_by == "Source":
-        filtered_df = filtered_df.sort_values('source')
+    # Listing mode: one card per job, or the whole page in one scrollable table
+    view = st.sidebar.radio("Display", list(PAGE_SIZES), horizontal=True, key="browse_view")
+    
+    if search_query:
+        # Ranked matches of the search, filtered, sorted and counted locally
+        matches = search_jobs(search_query, CARD_COLUMNS + ('scraped_at',), **filters)
+        if sort_by != "Relevance":
+            column, descending = SORT_ORDERS[sort_by][0]
+            matches = matches.sort_values(column, ascending=not descending, kind='stable')
+        summary = {
+            'total_jobs': len(matches),
+            'companies': matches['company'].nunique(),
+            'locations': matches['location'].nunique(),
+            'sources': matches['source'].nunique(),
+        }
+    else:
+        # Counts of the filtered jobs (facet index, synced with the dropdown counts)
+        summary = get_filtered_statistics(**filters)
+    total_jobs = summary['total_jobs']
     
     # Display results count
-    st.header(f"📋 Results: {len(filtered_df)} job(s) found")
+    st.header(f"📋 Results: {total_jobs} job(s) found")
     
-    if filtered_df.empty:
+    if total_jobs == 0:
         st.info("No jobs match the selected filters. Try adjusting your filter criteria.")
     else:
         # Pagination
-        items_per_page = 20  # Fixed number of items per page
+        items_per_page = PAGE_SIZES[view]
         
         # Calculate pagination
-        total_pages = (len(filtered_df) // items_per_page) + (1 if len(filtered_df) % items_per_page > 0 else 0)
+        total_pages = (total_jobs // items_per_page) + (1 if total_jobs % items_per_page > 0 else 0)
         
         
         if 'current_page' not in st.session_state:
             st.session_state.current_page = 1
+        # the filters may have reduced the number of pages
+        st.session_state.current_page = min(st.session_state.current_page, total_pages)
         
         # Pagination controls
         col1, col2, col3 = st.columns([1, 2, 1])
@@ -93,39 +130,60 @@ else:
             if st.button("Next ▶", disabled=(st.session_state.current_page >= total_pages), key="next_btn"):
                 st.session_state.current_page = min(total_pages, st.session_state.current_page + 1)
         
-        # Calculate start and end indices
-        start_idx = (st.session_state.current_page - 1) * items_per_page
-        end_idx = start_idx + items_per_page
-        
-        # Get current page data
-        page_df = filtered_df.iloc[start_idx:end_idx]
+        # Get current page data (only these rows are transferred)
+        if search_query:
+            offset = (st.session_state.current_page - 1) * items_per_page
+            page_df = matches.iloc[offset:offset + items_per_page]
+        else:
+            page_df = get_jobs_page(
+                CARD_COLUMNS, SORT_ORDERS[sort_by], st.session_state.current_page, items_per_page, **filters
+            )
         
         st.divider()
         
         # Display jobs
-        for idx, job in page_df.iterrows():
-            with st.container():
-                # Create columns for job card
-                col1, col2 = st.columns([3, 1])
+        if view == "Table":
+            # a single grid element: rows are scrolled client-side, links open without a rerun
+            st.dataframe(
+                page_df[list(CARD_COLUMNS)],
+                column_config={
+                    'title': "Title",
+                    'company': "Company",
+                    'location': "Location",
+                    'source': "Source",
+                    'date_posted': "Date Posted",
+                    'url': st.column_config.LinkColumn("Link", display_text="🔗 View Job"),
+                },
+                hide_index=True,
+                use_container_width=True,
+                height=600,
+            )
+        else:
+            for idx, job in page_df.iterrows():
+                with st.container():
+                    # Create columns for job card
+                    col1, col2 = st.columns([3, 1])
                 
-                with col1:
-                    st.subheader(job['title'])
-                    st.write(f"**Company:** {job['company']}")
-                    st.write(f"**Location:** {job['location']}")
-                    st.write(f"**Source:** {job['source']}")
-                    st.write(f"**Date Posted:** {job['date_posted']}")
+                    with col1:
+                        st.subheader(job['title'])
+                        st.write(f"**Company:** {job['company']}")
+                        st.write(f"**Location:** {job['location']}")
+                        st.write(f"**Source:** {job['source']}")
+                        st.write(f"**Date Posted:** {job['date_posted']}")
                 
-                with col2:
-                    st.write("")
-                    if st.button("🔗 View Job", key=f"view_{idx}"):
-                        st.markdown(f"[Open Job Listing]({job['url']})")
+                    with col2:
+                        st.write("")
+                        if st.button("🔗 View Job", key=f"view_{idx}"):
+                            st.markdown(f"[Open Job Listing]({job['url']})")
                 
-                st.divider()
+                    st.divider()
         
         # Summary statistics
         st.sidebar.divider()
         st.sidebar.header("📊 Summary")
-        st.sidebar.metric("Total Jobs", len(filtered_df))
-        st.sidebar.metric("Unique Companies", filtered_df['company'].nunique())
-        st.sidebar.metric("Unique Locations", filtered_df['location'].nunique())
-        st.sidebar.metric("Data Sources", filtered_df['source'].nunique())
\ No newline at end of file
+        st.sidebar.metric("Total Jobs", total_jobs)
+        st.sidebar.metric("Unique Companies", summary['companies'])
+        st.sidebar.metric("Unique Locations", summary['locations'])
+        st.sidebar.metric("Data Sources", summary['sources'])
+
+show_data_access_stats()
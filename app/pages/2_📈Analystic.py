@@ -2,53 +2,21 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from supabase import create_client, Client
-import os
 from datetime import datetime
-from dotenv import load_dotenv
-
-# Charger les variables d'environnement
-load_dotenv()
+from utils.db_utils import load_all_jobs, show_data_access_stats, get_jobs_cache
 
 # Configuration de la page
 st.set_page_config(page_title="Analytics - CyberScraper", page_icon="📊", layout="wide")
 
-# Configuration Supabase
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-
-# Initialiser le client Supabase
-@st.cache_resource
-def init_supabase():
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
-
-
-supabase: Client = init_supabase()
-
-
-# Chargement des données depuis Supabase
-@st.cache_data(ttl=300)  # Cache pendant 5 minutes
+# Chargement des données (cache local partagé, dates déjà converties)
 def load_data():
     try:
         # Récupérer toutes les données de la table 'jobs'
-        response = supabase.table("jobs").select("*").execute()
-
-        if not response.data:
-            st.warning("⚠️ Aucune donnée disponible dans la base de données.")
-            return pd.DataFrame()
-
-        # Convertir en DataFrame
-        df = pd.DataFrame(response.data)
-
+        df = load_all_jobs(parsed_dates=True)
         if df.empty:
             st.warning("⚠️ Aucune donnée disponible dans la base de données.")
             return pd.DataFrame()
 
-        # Convertir les dates
-        df["scraped_at"] = pd.to_datetime(df["scraped_at"])
-        df["date_posted"] = pd.to_datetime(df["date_posted"], errors="coerce")
-
         return df
     except Exception as e:
         st.error(f"❌ Erreur lors du chargement des données : {e}")
@@ -65,6 +33,7 @@ if df.empty:
     st.info(
         "🔍 Aucune donnée à afficher. Veuillez d'abord scraper des jobs depuis la page Browse."
     )
+    show_data_access_stats()
     st.stop()
 
 # Titre
@@ -72,6 +41,8 @@ st.title("📊 Analytics & Insights")
 
 # Bouton de rafraîchissement
 if st.button("🔄 Refresh Data", help="Actualiser les données"):
+    # récupère immédiatement les nouvelles lignes depuis la base
+    get_jobs_cache().refresh(force=True)
     st.cache_data.clear()
     st.rerun()
 
@@ -136,7 +107,7 @@ with col2:
 
     # Tableau des statistiques par location
     location_stats = (
-        df.groupby("location").agg({"id": "count", "company": "nunique"}).reset_index()
+        df.groupby("location", observed=True).agg({"id": "count", "company": "nunique"}).reset_index()
     )
     location_stats.columns = ["Location", "Total Jobs", "Companies"]
     location_stats = location_stats.sort_values("Total Jobs", ascending=False).head(10)
@@ -204,7 +175,7 @@ with col1:
 
     # Tableau de comparaison des sources
     source_stats = (
-        df.groupby("source")
+        df.groupby("source", observed=True)
         .agg({"id": "count", "company": "nunique", "location": "nunique"})
         .reset_index()
     )
@@ -249,8 +220,9 @@ with col2:
     else:
         filtered_df = df[df["source"] == selected_source]
 
-    # Compter les entreprises
-    company_counts = filtered_df["company"].value_counts().head(10)
+    # Compter les entreprises (sans les catégories absentes de la source)
+    company_counts = filtered_df["company"].value_counts()
+    company_counts = company_counts[company_counts > 0].head(10)
 
     # Créer le graphique en barres horizontales
     fig_companies = px.bar(
@@ -321,6 +293,15 @@ st.markdown("---")
 # ===== Section 5: Data Quality Insights =====
 st.header("🔍 Data Quality Insights")
 
+# Clusters de quasi-doublons calculés à l'ingestion (database/identity.py)
+has_clusters = "cluster_id" in df and df["cluster_id"].notna().any()
+if has_clusters:
+    # les lignes sans cluster (pas encore identifiées) comptent comme offres uniques
+    clusters = df.groupby(df["cluster_id"].fillna(df["url"].astype(str)), observed=True).agg(
+        jobs=("url", "size"), sources=("source", "nunique")
+    )
+    duplicate_clusters = clusters[clusters["jobs"] > 1]
+
 col1, col2, col3 = st.columns(3)
 
 with col1:
@@ -353,12 +334,20 @@ with col2:
     st.subheader("Duplicates Check")
 
     total_urls = len(df)
-    unique_urls = df["url"].nunique()
-    duplicates = total_urls - unique_urls
 
-    st.metric("Total Records", total_urls)
-    st.metric("Unique URLs", unique_urls)
-    st.metric("Duplicates", duplicates)
+    if has_clusters:
+        st.metric("Total Records", total_urls)
+        st.metric("Unique Offers", len(clusters))
+        st.metric("Duplicates", total_urls - len(clusters))
+        st.metric("Cross-source Clusters", int((duplicate_clusters["sources"] > 1).sum()))
+    else:
+        unique_urls = df["url"].nunique()
+        duplicates = total_urls - unique_urls
+
+        st.metric("Total Records", total_urls)
+        st.metric("Unique URLs", unique_urls)
+        st.metric("Duplicates", duplicates)
+        st.caption("Install database/sql/job_identity.sql to detect near-duplicates.")
 
 with col3:
     st.subheader("Database Info")
@@ -367,8 +356,27 @@ with col3:
     st.metric("Status", "🟢 Connected")
     st.metric("Last Update", df["scraped_at"].max().strftime("%Y-%m-%d %H:%M"))
 
+# Plus gros clusters de doublons (même offre publiée plusieurs fois)
+if has_clusters and not duplicate_clusters.empty:
+    with st.expander(f"🧬 Duplicate clusters ({len(duplicate_clusters)})"):
+        largest = duplicate_clusters.nlargest(20, "jobs")
+        members = df[df["cluster_id"].isin(largest.index)]
+        cluster_details = (
+            members.groupby("cluster_id", observed=True)
+            .agg(
+                Title=("title", "first"),
+                Company=("company", "first"),
+                Jobs=("url", "size"),
+                Sources=("source", lambda s: ", ".join(sorted(s.astype(str).unique()))),
+            )
+            .sort_values("Jobs", ascending=False)
+        )
+        st.dataframe(cluster_details, hide_index=True, use_container_width=True)
+
 # Footer
 st.markdown("---")
 st.markdown(
     "**CyberScraper Analytics** - Real-time insights from Emploitic, France Travail & Wuzzuf"
 )
+
+show_data_access_stats()
@@ -1,54 +1,22 @@
 import streamlit as st
 import pandas as pd
-from supabase import create_client, Client
-import os
 from datetime import datetime
 import io
 import json
-from dotenv import load_dotenv
-
-# Charger les variables d'environnement
-load_dotenv()
+from utils.db_utils import load_all_jobs, show_data_access_stats
 
 # Configuration de la page
 st.set_page_config(page_title="Export - CyberScraper", page_icon="💾", layout="wide")
 
-# Configuration Supabase
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-
-# Initialiser le client Supabase
-@st.cache_resource
-def init_supabase():
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
-
-
-supabase: Client = init_supabase()
-
-
-# Chargement des données depuis Supabase
-@st.cache_data(ttl=300)
+# Chargement des données (cache local partagé, dates déjà converties)
 def load_data():
     try:
         # Récupérer toutes les données de la table 'jobs'
-        response = supabase.table("jobs").select("*").execute()
-
-        if not response.data:
-            st.warning("⚠️ Aucune donnée disponible dans la base de données.")
-            return pd.DataFrame()
-
-        # Convertir en DataFrame
-        df = pd.DataFrame(response.data)
-
+        df = load_all_jobs(parsed_dates=True)
         if df.empty:
             st.warning("⚠️ Aucune donnée disponible dans la base de données.")
             return pd.DataFrame()
 
-        # Convertir les dates
-        df["scraped_at"] = pd.to_datetime(df["scraped_at"])
-        df["date_posted"] = pd.to_datetime(df["date_posted"], errors="coerce")
-
         return df
     except Exception as e:
         st.error(f"❌ Erreur lors du chargement des données : {e}")
@@ -121,6 +89,7 @@ if df.empty:
     st.info(
         "🔍 Aucune donnée à exporter. Veuillez d'abord scraper des jobs depuis la page Browse."
     )
+    show_data_access_stats()
     st.stop()
 
 # Section Export Data
@@ -268,3 +237,5 @@ with col4:
 # Footer
 st.markdown("---")
 st.markdown("**CyberScraper Export** - Download your job data in multiple formats")
+
+show_data_access_stats()
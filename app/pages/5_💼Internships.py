@@ -1,16 +1,21 @@
 import streamlit as st
-from supabase import create_client
-import os
-import base64
-from dotenv import load_dotenv
-
-load_dotenv()
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-# create Supabase client
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+from utils.applications import (
+    STATUSES,
+    get_application_counts,
+    get_company_applications,
+    invalidate_company_applications,
+)
+from utils.db_utils import get_session_client, show_data_access_stats
+from utils.internship_feed import get_feed, get_feed_page, get_internship_locations, invalidate_feed_page
+from utils.queries import guard_selects, spec_query
+from utils.resumes import get_resume_store, resume_opener
+
+# Supabase client of this browser session (keeps the signed-in user);
+# QUERY_GUARD=1 flags the select("*") on wide tables
+supabase = guard_selects(get_session_client())
+
+# resumes are stored once by content, outside the applications rows
+resume_store = get_resume_store(supabase)
 
 # initialize session state
 if "user" not in st.session_state:
@@ -34,7 +39,7 @@ def check_auth_status():
 def get_user_role(user_id):
     """retrieve user role from database"""
     try:
-        result = supabase.table("users").select("role").eq("id", user_id).execute()
+        result = spec_query(supabase, "user.role").eq("id", user_id).execute()
         if result.data and len(result.data) > 0:
             return result.data[0]["role"]
     except Exception as e:
@@ -208,9 +213,7 @@ def student_page():
     # Fetch student profile for personalization
     profile_data = None
     try:
-        profile_res = (
-            supabase.table("student_profiles").select("*").eq("id", user_id).execute()
-        )
+        profile_res = spec_query(supabase, "student.profile").eq("id", user_id).execute()
         profile_data = profile_res.data[0] if profile_res.data else None
     except Exception as e:
         st.warning(f"Unable to load profile information: {str(e)}")
@@ -224,83 +227,43 @@ def student_page():
 
     st.divider()
 
-    # Load internships and existing applications
-    try:
-        internships_res = (
-            supabase.table("internships")
-            .select("*")
-            .order("created_at", desc=True)
-            .execute()
-        )
-        internships = internships_res.data or []
-    except Exception as e:
-        st.error(f"Unable to load internships: {str(e)}")
-        return
-
-    try:
-        applications_res = (
-            supabase.table("applications")
-            .select("*")
-            .eq("student_id", user_id)
-            .execute()
-        )
-        applications = {app["internship_id"]: app for app in (applications_res.data or [])}
-    except Exception as e:
-        st.warning(f"Unable to load your applications: {str(e)}")
-        applications = {}
-
-    # Fetch company data for labels
-    company_map = {}
-    company_ids = list({internship["company_id"] for internship in internships})
-    if company_ids:
-        try:
-            companies_res = (
-                supabase.table("company_profiles")
-                .select("id, company_name, location, phone")
-                .in_("id", company_ids)
-                .execute()
-            )
-            company_map = {company["id"]: company for company in (companies_res.data or [])}
-        except Exception as e:
-            st.warning(f"Unable to load company details: {str(e)}")
-
-    # Filters
+    # Filters, applied by the database
     col_search, col_type, col_location = st.columns([2, 1, 1])
     search_query = col_search.text_input(
         "🔍 Search internships", placeholder="Search by title, company or location"
     ).strip()
     job_type_filter = col_type.selectbox("Work type", ["All", "on-site", "remote", "hybrid"])
-    locations = sorted({i["location"] for i in internships if i.get("location")})
+    try:
+        locations = get_internship_locations(supabase)
+    except Exception as e:
+        st.warning(f"Unable to load locations: {str(e)}")
+        locations = []
     location_filter = col_location.selectbox("Location", ["All"] + locations) if locations else "All"
 
-    def matches_filters(internship):
-        if search_query:
-            company = company_map.get(internship["company_id"], {})
-            target = " ".join(
-                [
-                    internship.get("title", ""),
-                    internship.get("location", ""),
-                    company.get("company_name", ""),
-                ]
-            ).lower()
-            if search_query.lower() not in target:
-                return False
-        if job_type_filter != "All" and internship.get("job_type") != job_type_filter:
-            return False
-        if location_filter != "All" and internship.get("location") != location_filter:
-            return False
-        return True
-
-    filtered_internships = [internship for internship in internships if matches_filters(internship)]
-
-    st.subheader(f"Available Internships ({len(filtered_internships)})")
-    if not filtered_internships:
+    # One page of internships at a time (keyset pagination, newest first)
+    feed = get_feed(
+        search_query,
+        job_type=None if job_type_filter == "All" else job_type_filter,
+        location=None if location_filter == "All" else location_filter,
+    )
+    try:
+        feed_page = get_feed_page(supabase, user_id, feed)
+    except Exception as e:
+        st.error(f"Unable to load internships: {str(e)}")
+        return
+
+    st.subheader(f"Available Internships ({feed_page.total or 0})")
+    if not feed_page.internships:
         st.info("No internships match your filters yet. Try adjusting your search.")
         return
 
-    for internship in filtered_internships:
-        company = company_map.get(internship["company_id"], {})
-        application = applications.get(internship["id"])
+    if "applying_to" not in st.session_state:
+        st.session_state.applying_to = None
+
+    for internship in feed_page.internships:
+        company = feed_page.company(internship)
+        application = feed_page.application(internship)
+        is_applying = st.session_state.applying_to == internship["id"]
         with st.container():
             st.markdown(f"### {internship['title']} · {company.get('company_name', 'Company')}")
             col1, col2, col3 = st.columns(3)
@@ -316,14 +279,20 @@ def student_page():
                 if internship.get("application_deadline"):
                     st.caption(f"⏰ Apply before: {internship['application_deadline']}")
 
-            st.write("**Description**")
-            st.write(internship.get("description", "No description provided."))
-            st.write("**Requirements**")
-            st.write(internship.get("requirements", "No requirements provided."))
+            with st.expander("Details", expanded=is_applying):
+                st.write("**Description**")
+                st.write(internship.get("description", "No description provided."))
+                st.write("**Requirements**")
+                st.write(internship.get("requirements", "No requirements provided."))
 
             if application:
                 status = application.get("status", "pending").capitalize()
                 st.success(f"You already applied · Status: {status}")
+            elif not is_applying:
+                # the apply form is only built for the internship being applied to
+                if st.button("📝 Apply", key=f"apply_{internship['id']}"):
+                    st.session_state.applying_to = internship["id"]
+                    st.rerun()
             else:
                 with st.form(key=f"apply_form_{internship['id']}"):
                     cover_letter = st.text_area(
@@ -334,23 +303,30 @@ def student_page():
                     resume_file = st.file_uploader(
                         "Upload resume (PDF, optional)", type=["pdf"], key=f"resume_{internship['id']}"
                     )
-                    submit = st.form_submit_button("📤 Apply now", use_container_width=True)
+                    col_submit, col_cancel = st.columns(2)
+                    submit = col_submit.form_submit_button("📤 Apply now", use_container_width=True)
+                    cancel = col_cancel.form_submit_button("❌ Cancel", use_container_width=True)
+
+                    if cancel:
+                        st.session_state.applying_to = None
+                        st.rerun()
 
                     if submit:
-                        resume_data = (
-                            "\\x" + resume_file.read().hex() if resume_file else None
-                        )
                         try:
+                            # the row only keeps the content hash of the PDF
+                            resume_key = resume_store.put(resume_file.getvalue()) if resume_file else None
                             supabase.table("applications").insert(
                                 {
                                     "internship_id": internship["id"],
                                     "student_id": user_id,
                                     "cover_letter": cover_letter.strip() if cover_letter else None,
-                                    "resume_pdf": resume_data,
+                                    "resume_key": resume_key,
                                     "status": "pending",
                                     "applied_at": datetime.utcnow().isoformat(),
                                 }
                             ).execute()
+                            st.session_state.applying_to = None
+                            invalidate_feed_page()
                             st.success("Application submitted! 🎉")
                             st.rerun()
                         except Exception as e:
@@ -358,6 +334,19 @@ def student_page():
 
             st.divider()
 
+    # Pagination
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("◀ Previous", disabled=feed["page"] == 0, key="feed_prev_btn"):
+            feed["page"] -= 1
+            st.rerun()
+    with col_page:
+        st.write(f"Page {feed['page'] + 1}")
+    with col_next:
+        if st.button("Next ▶", disabled=not feed_page.has_next, key="feed_next_btn"):
+            feed["page"] += 1
+            st.rerun()
+
 
 from datetime import datetime
 
@@ -370,9 +359,7 @@ def company_page():
     # Get company profile
     user_id = st.session_state.user.id
     try:
-        profile = (
-            supabase.table("company_profiles").select("*").eq("id", user_id).execute()
-        )
+        profile = spec_query(supabase, "company.profile").eq("id", user_id).execute()
         company_name = profile.data[0]["company_name"] if profile.data else "Company"
     except:
         company_name = "Company"
@@ -415,34 +402,11 @@ def show_overview(user_id):
     st.header("📊 Overview")
 
     try:
-        # Get all internships for this company
-        internships = (
-            supabase.table("internships")
-            .select("*")
-            .eq("company_id", user_id)
-            .execute()
-        )
-        total_internships = len(internships.data)
-
-        # Tous les stages publiés sont actifs
-        active_internships = total_internships
-
-        # Get all applications for company's internships
-        internship_ids = [i["id"] for i in internships.data]
-        if internship_ids:
-            applications = (
-                supabase.table("applications")
-                .select("*")
-                .in_("internship_id", internship_ids)
-                .execute()
-            )
-            total_applications = len(applications.data)
-            pending_applications = len(
-                [a for a in applications.data if a["status"] == "pending"]
-            )
-        else:
-            total_applications = 0
-            pending_applications = 0
+        # internships, applications and applicants of this company (three queries, cached)
+        view = get_company_applications(supabase, user_id)
+        total_internships = len(view.internships)
+        total_applications = view.count()
+        pending_applications = view.count("pending")
 
         # Display metrics
         col1, col2, col3 = st.columns(3)
@@ -456,34 +420,18 @@ def show_overview(user_id):
         st.divider()
 
         # Recent applications
-        if internship_ids and applications.data:
+        if view.applications:
             st.subheader("🆕 Recent Applications")
-            recent_apps = sorted(
-                applications.data, key=lambda x: x["applied_at"], reverse=True
-            )[:5]
+            # the view is sorted by applied_at, newest first
+            recent_apps = view.applications[:5]
 
             for app in recent_apps:
-                internship = next(
-                    (i for i in internships.data if i["id"] == app["internship_id"]),
-                    None,
+                internship = view.internship(app)
+                student = view.student(app)
+                student_name = (
+                    f"{student['first_name']} {student['last_name']}" if student else "Unknown"
                 )
 
-                # Get student info
-                try:
-                    student = (
-                        supabase.table("student_profiles")
-                        .select("*")
-                        .eq("id", app["student_id"])
-                        .execute()
-                    )
-                    student_name = (
-                        f"{student.data[0]['first_name']} {student.data[0]['last_name']}"
-                        if student.data
-                        else "Unknown"
-                    )
-                except:
-                    student_name = "Unknown"
-
                 with st.container():
                     col1, col2, col3 = st.columns([3, 2, 1])
                     with col1:
@@ -607,6 +555,7 @@ def show_post_internship_form():
                 result = supabase.table("internships").insert(internship_data).execute()
 
                 if result.data:
+                    invalidate_company_applications()
                     st.success("✅ Internship posted successfully!")
                     st.balloons()
                     st.rerun()
@@ -627,8 +576,7 @@ def show_my_internships(user_id):
 
     try:
         internships = (
-            supabase.table("internships")
-            .select("*")
+            spec_query(supabase, "company.my_internships")
             .eq("company_id", user_id)
             .order("created_at", desc=True)
             .execute()
@@ -638,18 +586,15 @@ def show_my_internships(user_id):
             st.info("You haven't posted any internships yet.")
             return
 
+        # Nombre de candidatures de tous les stages, par statut, en une seule requête
+        counts = get_application_counts(
+            supabase, user_id, [internship["id"] for internship in internships.data]
+        )
+
         # Display internships
         for internship in internships.data:
-            # Calculer le nombre de candidatures
-            applications_count = (
-                supabase.table("applications")
-                .select("id", count="exact")
-                .eq("internship_id", internship["id"])
-                .execute()
-            )
-            app_count = (
-                applications_count.count if hasattr(applications_count, "count") else 0
-            )
+            internship_counts = counts.get(internship["id"], {})
+            app_count = internship_counts.get("total", 0)
 
             is_editing = st.session_state.editing_internship == internship["id"]
 
@@ -785,6 +730,7 @@ def show_my_internships(user_id):
                                     supabase.table("internships").update(
                                         updated_data
                                     ).eq("id", internship["id"]).execute()
+                                    invalidate_company_applications()
                                     st.success("✅ Stage mis à jour avec succès!")
                                     st.session_state.editing_internship = None
                                     st.rerun()
@@ -817,6 +763,15 @@ def show_my_internships(user_id):
                             f"📆 **Publié:** {datetime.fromisoformat(internship['created_at'].replace('Z', '+00:00')).strftime('%d/%m/%Y')}"
                         )
 
+                    if app_count:
+                        st.caption(
+                            " · ".join(
+                                f"{internship_counts[status]} {status}"
+                                for status in STATUSES
+                                if internship_counts.get(status)
+                            )
+                        )
+
                     st.divider()
                     st.write("**Description:**")
                     st.write(internship["description"])
@@ -863,6 +818,7 @@ def show_my_internships(user_id):
                                     supabase.table("internships").delete().eq(
                                         "id", internship["id"]
                                     ).execute()
+                                    invalidate_company_applications()
                                     st.success("✅ Stage supprimé avec succès!")
                                     st.session_state[delete_key] = False
                                     st.rerun()
@@ -878,25 +834,12 @@ def show_applications(user_id):
     st.header("👥 Applications")
 
     try:
-        internships = (
-            supabase.table("internships")
-            .select("*")
-            .eq("company_id", user_id)
-            .execute()
-        )
-        if not internships.data:
+        # internships, applications and applicants of this company (three queries, cached)
+        view = get_company_applications(supabase, user_id)
+        if not view.internships:
             st.info("You don't have any internships yet.")
             return
-
-        internship_ids = [i["id"] for i in internships.data]
-        applications = (
-            supabase.table("applications")
-            .select("*")
-            .in_("internship_id", internship_ids)
-            .order("applied_at", desc=True)
-            .execute()
-        )
-        if not applications.data:
+        if not view.applications:
             st.info("No applications received yet.")
             return
 
@@ -904,21 +847,19 @@ def show_applications(user_id):
         col1, col2 = st.columns(2)
         with col1:
             filter_internship = st.selectbox(
-                "Filter by Internship", ["All"] + [i["title"] for i in internships.data]
+                "Filter by Internship", ["All"] + [i["title"] for i in view.internships]
             )
         with col2:
             filter_status = st.selectbox(
                 "Filter by Status",
-                ["All", "pending", "reviewed", "accepted", "rejected", "withdrawn"],
+                ["All", *STATUSES],
             )
 
         st.divider()
 
-        for app in applications.data:
+        for app in view.applications:
             # Appliquer les filtres
-            internship = next(
-                (i for i in internships.data if i["id"] == app["internship_id"]), None
-            )
+            internship = view.internship(app)
 
             if (
                 filter_internship != "All"
@@ -929,13 +870,7 @@ def show_applications(user_id):
             if filter_status != "All" and app["status"] != filter_status:
                 continue
 
-            student = (
-                supabase.table("student_profiles")
-                .select("*")
-                .eq("id", app["student_id"])
-                .execute()
-            )
-            student_data = student.data[0] if student.data else {}
+            student_data = view.student(app)
             student_name = f"{student_data.get('first_name', 'Unknown')} {student_data.get('last_name', '')}"
 
             with st.expander(
@@ -966,29 +901,19 @@ def show_applications(user_id):
 
                 st.divider()
 
-                resume_data = app.get("resume_pdf")
-                if resume_data:
-                    try:
-                        resume_bytes = None
-                        if isinstance(resume_data, str) and resume_data.startswith("\\x"):
-                            resume_bytes = bytes.fromhex(resume_data[2:])
-                        else:
-                            resume_clean = "".join(str(resume_data).split())
-                            padding = len(resume_clean) % 4
-                            if padding:
-                                resume_clean += "=" * (4 - padding)
-                            resume_bytes = base64.b64decode(resume_clean)
-                        if resume_bytes:
-                            st.download_button(
-                                "⬇️ Download resume",
-                                data=resume_bytes,
-                                file_name=f"resume_{student_name.replace(' ', '_')}.pdf",
-                                mime="application/pdf",
-                                key=f"download_resume_{app['id']}",
-                                use_container_width=True,
-                            )
-                    except Exception as e:
-                        st.warning(f"Unable to render resume: {str(e)}")
+                # the resume is only fetched (streamed from the store) when the button is clicked
+                open_resume = resume_opener(
+                    resume_store, app, client=supabase, legacy=view.has_legacy_resume(app)
+                )
+                if open_resume:
+                    st.download_button(
+                        "⬇️ Download resume",
+                        data=open_resume,
+                        file_name=f"resume_{student_name.replace(' ', '_')}.pdf",
+                        mime="application/pdf",
+                        key=f"download_resume_{app['id']}",
+                        use_container_width=True,
+                    )
 
                 # Actions
                 col_accept, col_reject, col_review = st.columns(3)
@@ -1000,6 +925,7 @@ def show_applications(user_id):
                             supabase.table("applications").update(
                                 {"status": "accepted"}
                             ).eq("id", app["id"]).execute()
+                            invalidate_company_applications()
                             st.success("Application accepted!")
                             st.rerun()
                         except Exception as e:
@@ -1013,6 +939,7 @@ def show_applications(user_id):
                             supabase.table("applications").update(
                                 {"status": "rejected"}
                             ).eq("id", app["id"]).execute()
+                            invalidate_company_applications()
                             st.success("Application rejected!")
                             st.rerun()
                         except Exception as e:
@@ -1028,6 +955,7 @@ def show_applications(user_id):
                             supabase.table("applications").update(
                                 {"status": "reviewed"}
                             ).eq("id", app["id"]).execute()
+                            invalidate_company_applications()
                             st.success("Marked as reviewed!")
                             st.rerun()
                         except Exception as e:
@@ -1049,8 +977,10 @@ def main():
 
         if role == "student":
             student_page()
+            show_data_access_stats()
         elif role == "company":
             company_page()
+            show_data_access_stats()
         else:
             st.error("Unable to determine user role. Please contact support.")
             if st.button("Logout"):
@@ -0,0 +1,185 @@
+"""
+Applications received by a company, joined with their internship and
+student in Python instead of one request per row.
+
+A view costs three requests whatever the number of applicants: the
+company's internships, their applications (one more request per 1000
+applications, paged by keyset), then the profiles of every applicant in
+one in_() request (plus the ids of the applications whose
+resume was not moved out of resume_pdf yet, while there are some). Rows are joined through dicts keyed by
+id. The view is kept in the session (the client is signed in as the
+company) for VIEW_TTL seconds and dropped as soon as the company changes
+an application or an internship.
+
+The application counts of My Internships come from the grouped
+application_counts view (database/sql/application_counts.sql) in one
+request, or from the internship_id / status columns counted in Python
+when the view is not deployed.
+"""
+
+import time
+
+import streamlit as st
+
+from .db_utils import record_data_access
+from .queries import STATUSES, spec_query
+
+# seconds a company's view is reused across reruns before being loaded again
+VIEW_TTL = 60
+
+# ids per in_() request: keeps the query string well under the proxies' url limits
+ID_CHUNK = 200
+
+# PostgREST returns at most 1000 rows per request
+PAGE_SIZE = 1000
+
+SESSION_KEY = "company_applications"
+COUNTS_SESSION_KEY = "application_counts"
+
+
+def index_by(rows, key="id"):
+    """{row[key]: row}"""
+    return {row[key]: row for row in rows}
+
+
+def fetch_by_ids(client, view, ids, key="id"):
+    """{key: row} of the rows of the query spec `view` whose `key` is in `ids`, one request per ID_CHUNK ids"""
+    ids = list(dict.fromkeys(ids))
+    rows = {}
+    for start in range(0, len(ids), ID_CHUNK):
+        response = spec_query(client, view).in_(key, ids[start:start + ID_CHUNK]).execute()
+        rows.update(index_by(response.data or [], key))
+    return rows
+
+
+class CompanyApplications:
+    """The internships of a company and their applications, newest first."""
+
+    def __init__(self, internships, applications, students, legacy_resumes=()):
+        self.internships = internships
+        self.applications = applications
+        self.students = students
+        self.internships_by_id = index_by(internships)
+        self.legacy_resumes = set(legacy_resumes)
+
+    def internship(self, application):
+        """internship of an application, None when it was deleted"""
+        return self.internships_by_id.get(application["internship_id"])
+
+    def student(self, application):
+        """profile of the applicant, {} when it is missing"""
+        return self.students.get(application["student_id"], {})
+
+    def has_legacy_resume(self, application):
+        """the resume of the application is still in resume_pdf (not moved by --migrate)"""
+        return application["id"] in self.legacy_resumes
+
+    def count(self, status=None):
+        if status is None:
+            return len(self.applications)
+        return sum(application["status"] == status for application in self.applications)
+
+
+def fetch_applications(client, internship_ids, page_size=PAGE_SIZE):
+    """applications of the internships, newest first, read by keyset on (applied_at, id)"""
+    applications = []
+    last = None
+    while True:
+        query = spec_query(client, "company.applications").in_("internship_id", internship_ids)
+        if last is not None:
+            applied_at, row_id = last
+            query = query.or_(f'applied_at.lt."{applied_at}",and(applied_at.eq."{applied_at}",id.lt.{row_id})')
+        rows = query.order("applied_at", desc=True).order("id", desc=True).limit(page_size).execute().data or []
+        applications.extend(rows)
+        if len(rows) < page_size:
+            return applications
+        last = (rows[-1]["applied_at"], rows[-1]["id"])
+
+
+def load_company_applications(client, company_id):
+    """CompanyApplications of `company_id`, in three requests"""
+    internships = spec_query(client, "company.internships").eq("company_id", company_id).execute().data or []
+    applications = []
+    if internships:
+        applications = fetch_applications(client, [internship["id"] for internship in internships])
+    students = fetch_by_ids(client, "company.applicants", [a["student_id"] for a in applications])
+    return CompanyApplications(internships, applications, students, load_legacy_resumes(client, applications))
+
+
+def load_legacy_resumes(client, applications):
+    """ids of the applications without resume_key whose resume_pdf is set (ids only, not the files)"""
+    ids = [application["id"] for application in applications if not application.get("resume_key")]
+    legacy = set()
+    for start in range(0, len(ids), ID_CHUNK):
+        response = (
+            spec_query(client, "company.legacy_resumes")
+            .in_("id", ids[start:start + ID_CHUNK])
+            .not_.is_("resume_pdf", "null")
+            .execute()
+        )
+        legacy.update(row["id"] for row in response.data or [])
+    return legacy
+
+
+def get_company_applications(client, company_id):
+    """the company's view, reused for VIEW_TTL seconds within the session"""
+    start = time.perf_counter()
+    cached = st.session_state.get(SESSION_KEY)
+    hit = cached is not None and cached[0] == company_id and time.monotonic() - cached[1] < VIEW_TTL
+    if hit:
+        view = cached[2]
+    else:
+        view = load_company_applications(client, company_id)
+        st.session_state[SESSION_KEY] = (company_id, time.monotonic(), view)
+    record_data_access("applications", hit, time.perf_counter() - start, len(view.applications))
+    return view
+
+
+def compute_application_counts(rows):
+    """pure-Python equivalent of the application_counts view: {internship_id: {"total", status: count}}"""
+    counts = {}
+    for row in rows:
+        entry = counts.setdefault(row["internship_id"], dict.fromkeys(("total",) + STATUSES, 0))
+        entry["total"] += 1
+        if row["status"] in entry:
+            entry[row["status"]] += 1
+    return counts
+
+
+def load_application_counts(client, internship_ids):
+    """{internship_id: {"total", status: count}} of the internships that received applications"""
+    if not internship_ids:
+        return {}
+    try:
+        response = spec_query(client, "company.application_counts").in_("internship_id", internship_ids).execute()
+        return {
+            row["internship_id"]: {key: row[key] for key in ("total",) + STATUSES}
+            for row in response.data or []
+        }
+    except Exception:
+        pass
+
+    # the view is not deployed: count the applications' statuses locally
+    response = spec_query(client, "company.application_statuses").in_("internship_id", internship_ids).execute()
+    return compute_application_counts(response.data or [])
+
+
+def get_application_counts(client, company_id, internship_ids):
+    """application counts of the company's internships, reused for VIEW_TTL seconds within the session"""
+    start = time.perf_counter()
+    key = (company_id, tuple(internship_ids))
+    cached = st.session_state.get(COUNTS_SESSION_KEY)
+    hit = cached is not None and cached[0] == key and time.monotonic() - cached[1] < VIEW_TTL
+    if hit:
+        counts = cached[2]
+    else:
+        counts = load_application_counts(client, list(internship_ids))
+        st.session_state[COUNTS_SESSION_KEY] = (key, time.monotonic(), counts)
+    record_data_access("application counts", hit, time.perf_counter() - start, len(counts))
+    return counts
+
+
+def invalidate_company_applications():
+    """drop the cached view and counts, after a change of an application or an internship"""
+    st.session_state.pop(SESSION_KEY, None)
+    st.session_state.pop(COUNTS_SESSION_KEY, None)
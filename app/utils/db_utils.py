@@ -1,44 +1,352 @@
+"""
+Data access shared by every page of the app.
+
+One Supabase client for the public job data, one delta-synced copy of
+the jobs table with parsed dates, its full-text and facet indexes, and a
+per-render log of the data calls (cache hit or miss, time spent, payload
+of the internship portal's queries) shown in the sidebar when the
+DATA_ACCESS_STATS environment variable is set to 1.
+"""
+
 import streamlit as st
 import pandas as pd
 from supabase import create_client
 from dotenv import load_dotenv
 import os
+import threading
+import time
+from .facets import FACET_FIELDS, FacetIndex
+from .jobs_cache import JobsCache
+from .search import SearchIndex
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-# create the client
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+SHOW_DATA_ACCESS_STATS = os.getenv("DATA_ACCESS_STATS") == "1"
+
+# PostgREST caps responses at 1000 rows by default
+CHUNK_SIZE = 1000
+
+# seconds between two syncs of the jobs cache, also the lifetime of the cached job pages
+SYNC_INTERVAL = 60
+
+# set by cached functions when their body actually runs (cache miss)
+_calls = threading.local()
+
+
+@st.cache_resource
+def get_client():
+    # one client (and its keep-alive connection pool) for every page and session
+    return create_client(SUPABASE_URL, SUPABASE_KEY)
+
+
+def get_session_client():
+    """client of the current browser session, for pages that sign users in
+
+    Supabase keeps the signed-in user on the client, so it can't be shared
+    between sessions; it is reused across the reruns of one session.
+    """
+    if "supabase_client" not in st.session_state:
+        st.session_state.supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return st.session_state.supabase_client
+
+
+def record_data_access(call, hit, seconds, rows=None, kb=None):
+    """add one data call to the log of the current render (`kb`: size of the payload)"""
+    try:
+        log = st.session_state.setdefault("data_access_log", [])
+    except Exception:
+        # no Streamlit session (scripts, benchmarks)
+        return
+    entry = {"call": call, "cache": "hit" if hit else "miss", "ms": round(seconds * 1000, 1), "rows": rows}
+    if kb is not None:
+        entry["kb"] = round(kb, 1)
+    log.append(entry)
+
+
+def show_data_access_stats():
+    """sidebar summary of the data calls made during this render"""
+    log = st.session_state.pop("data_access_log", [])
+    if not SHOW_DATA_ACCESS_STATS or not log:
+        return
+    with st.sidebar.expander("⚙️ Data access"):
+        st.dataframe(pd.DataFrame(log), hide_index=True, use_container_width=True)
+        hits = sum(entry["cache"] == "hit" for entry in log)
+        total_ms = sum(entry["ms"] for entry in log)
+        st.caption(f"{hits} hit(s), {len(log) - hits} miss(es), {total_ms:.0f} ms")
 
 
 # data loading functions
-@st.cache_data(ttl=3600)# the decorator tells Streamlit to cache the result of this function
-def load_all_jobs():
-    response = supabase.table('jobs').select('*').order('scraped_at', desc=True).execute()
-    df = pd.DataFrame(response.data)
+def iter_job_chunks(columns=None, chunk_size=CHUNK_SIZE, client=None, since=None):
+    """yield the jobs table as DataFrame chunks, newest first
+
+    Pages by keyset on (scraped_at, id) instead of OFFSET, so each request
+    stays cheap however deep it goes. `columns` limits the selected columns
+    (all of them when None). With `since=(scraped_at, id)` the walk goes
+    forward instead, oldest first, and only returns the rows after that mark.
+    """
+    client = client or get_client()
+    if columns is None:
+        select = '*'
+    else:
+        # the keyset columns are always fetched, then dropped if not requested
+        select = ','.join(dict.fromkeys([*columns, 'scraped_at', 'id']))
+
+    forward = since is not None
+    op = 'gt' if forward else 'lt'
+    last = since
+    while True:
+        query = (
+            client.table('jobs')
+            .select(select)
+            .order('scraped_at', desc=not forward)
+            .order('id', desc=not forward)
+            .limit(chunk_size)
+        )
+        if last is not None:
+            scraped_at, row_id = last
+            query = query.or_(
+                f'scraped_at.{op}."{scraped_at}",'
+                f'and(scraped_at.eq."{scraped_at}",id.{op}.{row_id})'
+            )
+        rows = query.execute().data
+        if not rows:
+            return
+
+        last = (rows[-1]['scraped_at'], rows[-1]['id'])
+        chunk = pd.DataFrame(rows)
+        yield chunk if columns is None else chunk[list(columns)]
+
+        if len(rows) < chunk_size:
+            return
+
+
+# text columns stored as categoricals when their values repeat
+CATEGORY_COLUMNS = ('source', 'company', 'location', 'title')
+
+
+def type_jobs(df):
+    """memory-optimized jobs frame, built when rows enter the cache
+
+    Dates are parsed once: `date_posted` keeps the text shown by the job
+    board ("2 days ago"...), `posted_on` holds it as a date when it can be
+    parsed. Repeated text columns become categoricals (when less than half
+    of their values are distinct) and urls and identity hashes share Arrow
+    string buffers instead of one Python object per row.
+    """
+    if df.empty:
+        return df
+    df = df.copy()
+    df['scraped_at'] = pd.to_datetime(df['scraped_at'], utc=True, format='ISO8601')
+    df['posted_on'] = pd.to_datetime(df['date_posted'], errors='coerce', format='ISO8601')
+    for column in CATEGORY_COLUMNS:
+        if column in df and df[column].nunique() < len(df) / 2:
+            df[column] = df[column].astype('category')
+    for column in ('url', 'job_key', 'fingerprint', 'cluster_id'):
+        if column in df:
+            df[column] = df[column].astype('string[pyarrow]')
+    return df
+
+
+@st.cache_resource
+def get_jobs_cache():
+    # one on-disk copy of the jobs table shared by every page and session
+    return JobsCache(fetch=lambda since: iter_job_chunks(since=since), prepare=type_jobs, min_interval=SYNC_INTERVAL)
+
+
+@st.cache_resource
+def get_search_index():
+    # full-text index of the cached jobs, fed with the new rows of each sync
+    index = SearchIndex()
+    get_jobs_cache().subscribe(index.add_frame)
+    return index
+
+
+@st.cache_resource
+def get_facet_index():
+    # source / company / location counts of the cached jobs, updated on each sync
+    index = FacetIndex()
+    get_jobs_cache().subscribe(index.add_frame)
+    return index
+
+
+def get_facet_counts(source=None, company=None, location=None):
+    """{field: {value: job count}} for the filter dropdowns
+
+    Every known value is listed, sorted; its count is the number of jobs it
+    would give combined with the current filters on the other fields.
+    """
+    start = time.perf_counter()
+    index = get_facet_index()
+    sync = {}
+    get_jobs_cache().refresh(stats=sync)
+
+    filters = {'source': source, 'company': company, 'location': location}
+    facets = {}
+    for field in FACET_FIELDS:
+        counts = index.counts(field, **filters)
+        facets[field] = {value: counts.get(value, 0) for value in index.values(field)}
+
+    record_data_access('facets', not sync['synced'], time.perf_counter() - start, sync['delta'])
+    return facets
+
+
+def get_filtered_statistics(source=None, company=None, location=None):
+    """total and distinct counts of the cached jobs matching the filters
+
+    Read from the facet index, synced with the jobs cache like the
+    dropdown counts, so the Browse totals and page count follow them.
+    """
+    start = time.perf_counter()
+    index = get_facet_index()
+    sync = {}
+    get_jobs_cache().refresh(stats=sync)
+    total, distinct = index.summary(source=source, company=company, location=location)
+    record_data_access('facet summary', not sync['synced'], time.perf_counter() - start, sync['delta'])
+    return {
+        'total_jobs': total,
+        'sources': distinct['source'],
+        'companies': distinct['company'],
+        'locations': distinct['location'],
+    }
+
+
+def search_jobs(query, columns, source=None, company=None, location=None):
+    """cached jobs matching every word of `query` in their title, company or location
+
+    Best matches first (a word in the title counts more than in the company
+    or location), then newest first. The filters are applied to the matches.
+    """
+    start = time.perf_counter()
+    index = get_search_index()
+    sync = {}
+    df = get_jobs_cache().refresh(stats=sync)
+
+    results = index.search(query)
+    if df.empty or not results:
+        matches = pd.DataFrame(columns=list(columns))
+    else:
+        scores = pd.Series(dict(results))
+        matches = df[df['id'].isin(scores.index)]
+        for column, value in (('source', source), ('company', company), ('location', location)):
+            if value is not None:
+                matches = matches[matches[column] == value]
+        # the cached frame is newest first and a stable sort keeps that order between equal scores
+        rank = matches['id'].map(scores)
+        matches = matches.loc[rank.sort_values(ascending=False, kind='stable').index, list(columns)]
+
+    record_data_access('search', not sync['synced'], time.perf_counter() - start, len(matches))
+    return matches.reset_index(drop=True)
+
+
+def load_all_jobs(columns=None, parsed_dates=False):
+    """the full jobs table from the local cache, synced with the new rows first
+
+    `scraped_at` is a datetime; with `parsed_dates` the `date_posted` column
+    holds parsed dates (NaT for relative texts) instead of the board's text.
+    """
+    start = time.perf_counter()
+    sync = {}
+    df = get_jobs_cache().refresh(stats=sync)
+
+    if not df.empty:
+        if parsed_dates:
+            df = df.assign(date_posted=df['posted_on'])
+        df = df.drop(columns='posted_on') if columns is None else df[list(columns)]
+    else:
+        df = df.copy(deep=False)
+
+    record_data_access('jobs', not sync['synced'], time.perf_counter() - start, sync['delta'])
     return df
 
 
+def compute_statistics(rows):
+    """pure-Python equivalent of the job_statistics() database function"""
+    per_source = {}
+    for row in rows:
+        per_source[row.get('source')] = per_source.get(row.get('source'), 0) + 1
+
+    def distinct(column):
+        return len({row.get(column) for row in rows} - {None})
+
+    return {
+        'total_jobs': len(rows),
+        'sources': distinct('source'),
+        'companies': distinct('company'),
+        'locations': distinct('location'),
+        'per_source': {source: count for source, count in per_source.items() if source is not None},
+    }
+
+
+def _tracked(call, cached_func, *args):
+    """call a cached loader and log whether its body ran (cache miss)"""
+    start = time.perf_counter()
+    _calls.miss = False
+    result = cached_func(*args)
+    record_data_access(call, not _calls.miss, time.perf_counter() - start)
+    return result
+
+
+def _filtered(query, source=None, company=None, location=None):
+    for column, value in (('source', source), ('company', company), ('location', location)):
+        if value is not None:
+            query = query.eq(column, value)
+    return query
+
+
+def get_statistics(source=None, company=None, location=None):
+    """job counts and distinct counts, for the whole table or the jobs matching the filters"""
+    return _tracked('statistics', _load_statistics, source, company, location)
+
+
 @st.cache_data(ttl=3600)
-def get_statistics():
-    stats = {}
-    
-    # jobs count
-    total_response = supabase.table('jobs').select('*', count='exact').execute()
-    stats['total_jobs'] = total_response.count
-    
-    # sources count
-    sources_response = supabase.table('jobs').select('source').execute()
-    stats['sources'] = pd.DataFrame(sources_response.data)['source'].nunique()
-    
-    # companies count
-    companies_response = supabase.table('jobs').select('company').execute()
-    stats['companies'] = pd.DataFrame(companies_response.data)['company'].nunique()
-    
-    # locations count
-    locations_response = supabase.table('jobs').select('location').execute()
-    stats['locations'] = pd.DataFrame(locations_response.data)['location'].nunique()
-    
-    return stats
\ No newline at end of file
+def _load_statistics(source, company, location):
+    _calls.miss = True
+    client = get_client()
+    # one aggregate call computed by Postgres (database/sql/job_statistics.sql)
+    try:
+        response = client.rpc(
+            'job_statistics', {'p_source': source, 'p_company': company, 'p_location': location}
+        ).execute()
+        if response.data:
+            return response.data
+    except Exception:
+        pass
+
+    # the function is not deployed: aggregate the needed columns locally, read by
+    # keyset on id (one request would stop at the 1000 rows PostgREST returns)
+    rows = []
+    last_id = None
+    while True:
+        query = _filtered(client.table('jobs').select('id,source,company,location'), source, company, location)
+        if last_id is not None:
+            query = query.gt('id', last_id)
+        chunk = query.order('id').limit(CHUNK_SIZE).execute().data
+        rows.extend(chunk)
+        if len(chunk) < CHUNK_SIZE:
+            return compute_statistics(rows)
+        last_id = chunk[-1]['id']
+
+
+def get_jobs_page(columns, order, page, page_size, source=None, company=None, location=None):
+    """one page of jobs, filtered, sorted and paginated by the database
+
+    `order` is a tuple of (column, descending) pairs; `id` is appended so
+    rows with equal sort values keep the same order from page to page.
+    """
+    return _tracked(
+        'jobs page', _load_jobs_page, tuple(columns), tuple(order), page, page_size, source, company, location
+    )
+
+
+@st.cache_data(ttl=SYNC_INTERVAL)
+def _load_jobs_page(columns, order, page, page_size, source, company, location):
+    _calls.miss = True
+    query = _filtered(get_client().table('jobs').select(','.join(columns)), source, company, location)
+    for column, desc in order + (('id', True),):
+        query = query.order(column, desc=desc)
+    offset = (page - 1) * page_size
+    response = query.range(offset, offset + page_size - 1).execute()
+    return pd.DataFrame(response.data, columns=list(columns))
@@ -0,0 +1,115 @@
+"""
+Facet counts for the Browse filters, kept up to date as jobs arrive.
+
+FacetIndex keeps, for every field, the number of jobs per value, and for
+every pair of fields the number of jobs per value of one field given a
+value of the other. Dropdowns with no or one other filter selected are
+read straight from these maps. With two other filters, only the
+(source, company, location) combinations holding the most selective
+selected value are visited, which stays small when companies number in
+the tens of thousands.
+"""
+
+import threading
+from collections import Counter
+
+FACET_FIELDS = ("source", "company", "location")
+
+
+class FacetIndex:
+    """Incremental value -> job count maps over FACET_FIELDS."""
+
+    def __init__(self, fields=FACET_FIELDS):
+        self.fields = fields
+        self.lock = threading.Lock()
+        self.combinations = Counter()  # (source, company, location) -> number of jobs
+        self.totals = {field: Counter() for field in fields}
+        # (given field, counted field) -> given value -> Counter of counted values
+        self.pairs = {(given, field): {} for given in fields for field in fields if given != field}
+        # field -> value -> combinations holding that value
+        self.with_value = {field: {} for field in fields}
+        self.sorted_values = {}  # field -> sorted values, dropped when a new value appears
+
+    def add_frame(self, df):
+        """count the rows of a DataFrame having the facet columns"""
+        if df.empty:
+            return
+        keys = df[list(self.fields)].astype(object)
+        counts = keys.where(keys.notna(), None).value_counts(dropna=False)
+        with self.lock:
+            for combination, count in counts.items():
+                self._add(combination, int(count))
+
+    def add(self, record):
+        """count one job (a mapping with the facet fields)"""
+        with self.lock:
+            self._add(tuple(record.get(field) for field in self.fields), 1)
+
+    def _add(self, combination, count):
+        values = dict(zip(self.fields, combination))
+        if combination not in self.combinations:
+            for field, value in values.items():
+                if value not in self.with_value[field]:
+                    self.sorted_values.pop(field, None)
+                self.with_value[field].setdefault(value, set()).add(combination)
+        self.combinations[combination] += count
+        for field, value in values.items():
+            self.totals[field][value] += count
+        for (given, field), by_value in self.pairs.items():
+            by_value.setdefault(values[given], Counter())[values[field]] += count
+
+    def values(self, field):
+        """sorted known values of `field`"""
+        with self.lock:
+            if field not in self.sorted_values:
+                self.sorted_values[field] = sorted(value for value in self.totals[field] if value is not None)
+            return self.sorted_values[field]
+
+    def counts(self, field, **filters):
+        """value -> number of jobs matching the filters on the *other* fields
+
+        A filter set to None is ignored; the filter on `field` itself is
+        ignored too, so the dropdown of a selected field still shows how
+        many jobs every alternative value would give.
+        """
+        selected = [
+            (other, value) for other, value in filters.items() if other != field and value is not None
+        ]
+        with self.lock:
+            if not selected:
+                counts = Counter(self.totals[field])
+            elif len(selected) == 1:
+                given, value = selected[0]
+                counts = Counter(self.pairs[(given, field)].get(value, {}))
+            else:
+                candidates = min(
+                    (self.with_value[given].get(value, set()) for given, value in selected), key=len
+                )
+                positions = [(self.fields.index(given), value) for given, value in selected]
+                position = self.fields.index(field)
+                counts = Counter()
+                for combination in candidates:
+                    if all(combination[i] == value for i, value in positions):
+                        counts[combination[position]] += self.combinations[combination]
+        counts.pop(None, None)
+        return counts
+
+    def summary(self, **filters):
+        """(number of jobs matching every filter, {field: number of distinct values among them})"""
+        selected = [(field, value) for field, value in filters.items() if value is not None]
+        positions = [(self.fields.index(field), value) for field, value in selected]
+        total = 0
+        distinct = [set() for _ in self.fields]
+        with self.lock:
+            if selected:
+                candidates = min((self.with_value[field].get(value, set()) for field, value in selected), key=len)
+            else:
+                candidates = self.combinations
+            for combination in candidates:
+                if all(combination[i] == value for i, value in positions):
+                    total += self.combinations[combination]
+                    for values, value in zip(distinct, combination):
+                        # missing values come back as None or NaN (NaN != NaN)
+                        if value is not None and value == value:
+                            values.add(value)
+        return total, {field: len(values) for field, values in zip(self.fields, distinct)}
@@ -0,0 +1,235 @@
+"""
+Internship feed of the student dashboard, one page at a time.
+
+Pages are fetched by keyset on (created_at, id), newest first, like the
+jobs table in db_utils.iter_job_chunks: each page costs one request of
+FEED_PAGE_SIZE rows however deep the student goes, and the work type and
+location filters are applied by the database
+(database/sql/internship_feed.sql indexes them). The companies and the
+student's applications are only read for the internships of the page.
+
+A text search ranks the internships with the accent-insensitive
+SearchIndex of the job search, built on a narrow projection of every
+internship (id, title, company, location, work type) kept VIEW_TTL
+seconds in the session; only the cards of the shown page are then
+fetched in full. That projection and the locations of the filter are
+read by the same keyset, PAGE_SIZE rows per request, under the row cap
+of a PostgREST response.
+"""
+
+import time
+
+import streamlit as st
+
+from .applications import PAGE_SIZE, VIEW_TTL, fetch_by_ids, index_by
+from .db_utils import record_data_access
+from .queries import spec_query
+from .search import SearchIndex
+
+# internships per page of the feed
+FEED_PAGE_SIZE = 10
+
+FEED_SESSION_KEY = "internship_feed"
+SEARCH_SESSION_KEY = "internship_search"
+LOCATIONS_SESSION_KEY = "internship_locations"
+
+
+def keyset_after(created_at, row_id):
+    """PostgREST filter of the internships after (created_at, id), newest first"""
+    return f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{row_id})'
+
+
+def _filtered(query, job_type=None, location=None):
+    for column, value in (("job_type", job_type), ("location", location)):
+        if value is not None:
+            query = query.eq(column, value)
+    return query
+
+
+def fetch_feed_page(client, after=None, job_type=None, location=None, page_size=None, count=False):
+    """(internships, cursor of the next page or None, total or None) of the page after `after`
+
+    One more row than the page is fetched to know whether a next page
+    exists; with `count` the response also carries the number of
+    internships matching the filters.
+    """
+    page_size = page_size or FEED_PAGE_SIZE
+    query = _filtered(spec_query(client, "student.internships", count="exact" if count else None), job_type, location)
+    if after is not None:
+        query = query.or_(keyset_after(*after))
+    response = query.order("created_at", desc=True).order("id", desc=True).limit(page_size + 1).execute()
+    rows = response.data or []
+    cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        cursor = (rows[-1]["created_at"], rows[-1]["id"])
+    return rows, cursor, response.count
+
+
+class InternshipSearch:
+    """Search index over the title, company and location of every internship."""
+
+    def __init__(self, internships, companies):
+        # newest first: the index keeps that order between equal scores
+        self.internships = index_by(internships)
+        self.index = SearchIndex()
+        for internship in internships:
+            self.index.add(
+                internship["id"],
+                {
+                    "title": internship.get("title"),
+                    "company": companies.get(internship["company_id"], {}).get("company_name"),
+                    "location": internship.get("location"),
+                },
+            )
+
+    def __len__(self):
+        return len(self.internships)
+
+    def search(self, query, job_type=None, location=None):
+        """ids of the internships matching `query` and the filters, best first"""
+        ids = []
+        for key, _ in self.index.search(query):
+            internship = self.internships[key]
+            if job_type is not None and internship.get("job_type") != job_type:
+                continue
+            if location is not None and internship.get("location") != location:
+                continue
+            ids.append(key)
+        return ids
+
+
+def fetch_all_internships(client, view, page_size=PAGE_SIZE):
+    """every row of the query spec `view`, newest first, read by keyset on (created_at, id)"""
+    internships = []
+    after = None
+    while True:
+        query = spec_query(client, view)
+        if after is not None:
+            query = query.or_(keyset_after(*after))
+        rows = query.order("created_at", desc=True).order("id", desc=True).limit(page_size).execute().data or []
+        internships.extend(rows)
+        if len(rows) < page_size:
+            return internships
+        after = (rows[-1]["created_at"], rows[-1]["id"])
+
+
+def load_internship_search(client):
+    internships = fetch_all_internships(client, "student.internship_search")
+    companies = fetch_by_ids(client, "student.companies", [internship["company_id"] for internship in internships])
+    return InternshipSearch(internships, companies)
+
+
+def load_internship_locations(client):
+    rows = fetch_all_internships(client, "student.internship_locations")
+    return sorted({row["location"] for row in rows if row.get("location")})
+
+
+def _session_cached(session_key, call, load):
+    """value of `load()`, reused for VIEW_TTL seconds within the session"""
+    start = time.perf_counter()
+    cached = st.session_state.get(session_key)
+    hit = cached is not None and time.monotonic() - cached[0] < VIEW_TTL
+    if hit:
+        value = cached[1]
+    else:
+        value = load()
+        st.session_state[session_key] = (time.monotonic(), value)
+    record_data_access(call, hit, time.perf_counter() - start, len(value))
+    return value
+
+
+def get_internship_search(client):
+    return _session_cached(SEARCH_SESSION_KEY, "internship search", lambda: load_internship_search(client))
+
+
+def get_internship_locations(client):
+    """locations of the filter dropdown"""
+    return _session_cached(LOCATIONS_SESSION_KEY, "internship locations", lambda: load_internship_locations(client))
+
+
+class FeedPage:
+    """The internships of one page of the feed, with their company and the student's application."""
+
+    def __init__(self, internships, companies, applications, has_next, total):
+        self.internships = internships
+        self.companies = companies
+        self.applications = applications
+        self.has_next = has_next
+        self.total = total
+
+    def company(self, internship):
+        """company of an internship, {} when its profile is missing"""
+        return self.companies.get(internship["company_id"], {})
+
+    def application(self, internship):
+        """the student's application to an internship, None when they haven't applied"""
+        return self.applications.get(internship["id"])
+
+
+def get_feed(query, job_type=None, location=None):
+    """feed state of the session, back to the first page when the search or the filters change"""
+    filters = (query, job_type, location)
+    feed = st.session_state.get(FEED_SESSION_KEY)
+    if feed is None or feed["filters"] != filters:
+        # cursors[n]: (created_at, id) of the last internship before page n
+        feed = {"filters": filters, "page": 0, "cursors": [None], "total": None, "loaded": None}
+        st.session_state[FEED_SESSION_KEY] = feed
+    return feed
+
+
+def load_feed_page(client, student_id, feed, page_size=None):
+    """FeedPage of the feed's current page: the page's internships, companies and applications"""
+    page_size = page_size or FEED_PAGE_SIZE
+    query, job_type, location = feed["filters"]
+    page = feed["page"]
+    if query:
+        ids = get_internship_search(client).search(query, job_type, location)
+        page_ids = ids[page * page_size:(page + 1) * page_size]
+        cards = fetch_by_ids(client, "student.internships", page_ids)
+        internships = [cards[key] for key in page_ids if key in cards]
+        has_next = (page + 1) * page_size < len(ids)
+        feed["total"] = len(ids)
+    else:
+        internships, cursor, total = fetch_feed_page(
+            client, feed["cursors"][page], job_type, location, page_size, count=feed["total"] is None
+        )
+        if total is not None:
+            feed["total"] = total
+        if cursor is not None and len(feed["cursors"]) == page + 1:
+            feed["cursors"].append(cursor)
+        has_next = cursor is not None
+
+    companies = fetch_by_ids(client, "student.companies", [internship["company_id"] for internship in internships])
+    applications = []
+    if internships:
+        applications = (
+            spec_query(client, "student.applications")
+            .eq("student_id", student_id)
+            .in_("internship_id", [internship["id"] for internship in internships])
+            .execute()
+            .data
+            or []
+        )
+    return FeedPage(internships, companies, index_by(applications, "internship_id"), has_next, feed["total"])
+
+
+def get_feed_page(client, student_id, feed):
+    """FeedPage of the feed's current page, reused for VIEW_TTL seconds until the student applies or moves"""
+    start = time.perf_counter()
+    loaded = feed["loaded"]
+    hit = loaded is not None and loaded[0] == feed["page"] and time.monotonic() - loaded[1] < VIEW_TTL
+    if hit:
+        view = loaded[2]
+    else:
+        view = load_feed_page(client, student_id, feed)
+        feed["loaded"] = (feed["page"], time.monotonic(), view)
+    record_data_access("internship feed", hit, time.perf_counter() - start, len(view.internships))
+    return view
+
+
+def invalidate_feed_page():
+    """drop the loaded page, after the student applied"""
+    feed = st.session_state.get(FEED_SESSION_KEY)
+    if feed is not None:
+        feed["loaded"] = None
@@ -0,0 +1,188 @@
+"""
+Local Parquet copy of the jobs table kept up to date by delta sync.
+
+The whole table lives in one file on disk. A refresh only asks the
+database for the rows scraped after the newest cached row (the
+high-water mark on (scraped_at, id)) and merges them in, so a refresh
+after a scrape costs as much as the new rows, not the whole table.
+
+The scrapers only ever insert jobs (upserts ignore known urls); rows are
+only updated in place by maintenance commands such as
+`python -m database.identity --backfill`, which delete the file. A cache
+whose file disappeared downloads the whole table again on its next sync,
+like full_refresh(), which also rebuilds it after rows were deleted.
+"""
+
+import os
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_PATH = Path(__file__).resolve().parents[2] / ".cache" / "jobs.parquet"
+
+
+def _sort_key(column):
+    # timestamps may come back with different fractional precisions
+    if column.name == 'scraped_at':
+        return pd.to_datetime(column, utc=True, format='ISO8601')
+    return column
+
+
+def _align_dtypes(cached, new_rows):
+    """(cached, new_rows) with the dtypes of the cached frame, categories widened to both sides"""
+    new_rows = new_rows.copy()
+    for column in cached.columns.intersection(new_rows.columns):
+        dtype = cached[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            values = new_rows[column]
+            extra = values.cat.categories if isinstance(values.dtype, pd.CategoricalDtype) else values.dropna().unique()
+            extra = pd.Index(extra).difference(dtype.categories)
+            if len(extra):
+                cached = cached.assign(**{column: cached[column].cat.add_categories(extra)})
+            new_rows[column] = values.astype(cached[column].dtype)
+        elif new_rows[column].dtype != dtype:
+            new_rows[column] = new_rows[column].astype(dtype)
+    return cached, new_rows
+
+
+class JobsCache:
+    """Thread-safe delta-synced cache of the jobs table.
+
+    `fetch(since)` must return DataFrame chunks of the rows after the
+    (scraped_at, id) mark `since`, or the whole table when it is None.
+    `prepare(frame)` (dtype conversions...) is applied to the file read from
+    disk, to a full download and to the new rows of each delta only; their
+    categoricals are widened to the union of both categories before the
+    new rows are put in front of the cached ones (categoricals with
+    different categories don't concat).
+    The database is asked for new rows at most every `min_interval` seconds.
+    Functions registered with subscribe() receive every row entering the
+    cache (the file when it is read, then each batch of new rows).
+    """
+
+    def __init__(self, fetch, prepare=None, path=None, min_interval=60):
+        self.fetch = fetch
+        self.prepare = prepare or (lambda frame: frame)
+        self.path = Path(path or os.getenv("JOBS_CACHE_PATH") or DEFAULT_PATH)
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.frame = None
+        self.last_sync = None
+        self.last_delta = 0
+        self.listeners = []
+
+    def subscribe(self, listener):
+        """call `listener(frame)` with the cached rows now and with the new rows of each sync"""
+        with self.lock:
+            self.listeners.append(listener)
+            if self.frame is not None and not self.frame.empty:
+                listener(self.frame)
+
+    def _notify(self, frame):
+        for listener in self.listeners:
+            listener(frame)
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                return self.prepare(pd.read_parquet(self.path))
+            except Exception as e:
+                # unreadable file: start over with a full sync
+                print(f"Ignoring unreadable jobs cache {self.path}: {e}")
+        return pd.DataFrame()
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        self.frame.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.path)
+
+    def high_water_mark(self):
+        """(scraped_at, id) of the newest cached row, None when the cache is empty"""
+        if self.frame is None or self.frame.empty:
+            return None
+        newest = self.frame.iloc[0]
+        scraped_at = newest['scraped_at']
+        if not isinstance(scraped_at, str):
+            scraped_at = pd.Timestamp(scraped_at).isoformat()
+        return scraped_at, int(newest['id'])
+
+    def refresh(self, force=False, stats=None):
+        """merge the rows scraped since the last sync and return the full table
+
+        `stats`, when given, receives `synced` (the database was queried)
+        and `delta` (number of new rows).
+        """
+        stats = stats if stats is not None else {}
+        stats.update(synced=False, delta=0)
+        with self.lock:
+            if self.frame is None:
+                self.frame = self._load()
+                if not self.frame.empty:
+                    self._notify(self.frame)
+            elif not self.frame.empty and not self.path.exists():
+                # deleted after rows were updated in place: the delta sync would not see them
+                return self._full_sync(stats)
+            if (
+                not force
+                and self.last_sync is not None
+                and time.monotonic() - self.last_sync < self.min_interval
+            ):
+                return self.frame
+
+            chunks = list(self.fetch(self.high_water_mark()))
+            self.last_sync = time.monotonic()
+            self.last_delta = sum(len(chunk) for chunk in chunks)
+            stats.update(synced=True, delta=self.last_delta)
+            if self.last_delta:
+                new_rows = pd.concat(chunks, ignore_index=True)
+                self._notify(new_rows)
+                if self._merge(new_rows):
+                    self._save()
+            return self.frame
+
+    def _merge(self, new_rows):
+        """put the typed new rows in front of the cached ones, returns whether any was added (lock held)"""
+        new_rows = self.prepare(new_rows).drop_duplicates(subset='id', keep='last')
+        new_rows = new_rows.sort_values(['scraped_at', 'id'], ascending=False, key=_sort_key, ignore_index=True)
+        if self.frame.empty:
+            self.frame = new_rows
+            return not new_rows.empty
+        # rows after the high-water mark are newer than every cached one: no need to sort the table again
+        cached = self.frame[~self.frame['id'].isin(new_rows['id'])]
+        cached, new_rows = _align_dtypes(cached, new_rows)
+        self.frame = pd.concat([new_rows, cached], ignore_index=True)
+        return not new_rows.empty
+
+    def _full_sync(self, stats):
+        """replace the cached rows with the whole table (lock held)"""
+        known = set(self.frame['id']) if self.frame is not None and not self.frame.empty else set()
+        chunks = list(self.fetch(None))
+        self.last_sync = time.monotonic()
+        self.last_delta = sum(len(chunk) for chunk in chunks)
+        stats.update(synced=True, delta=self.last_delta)
+        if not chunks:
+            self.frame = pd.DataFrame()
+            return self.frame
+        frame = pd.concat(chunks, ignore_index=True)
+        # the listeners already received the rows that were cached
+        new_rows = frame[~frame['id'].isin(known)]
+        if not new_rows.empty:
+            self._notify(new_rows)
+        self.frame = self.prepare(frame).sort_values(
+            ['scraped_at', 'id'], ascending=False, key=_sort_key, ignore_index=True
+        )
+        self._save()
+        return self.frame
+
+    def full_refresh(self, stats=None):
+        """drop the local copy and download the whole table again"""
+        stats = stats if stats is not None else {}
+        with self.lock:
+            if self.frame is None:
+                self.frame = self._load()
+                if not self.frame.empty:
+                    self._notify(self.frame)
+            return self._full_sync(stats)
@@ -0,0 +1,163 @@
+"""
+Columns read by each view of the internship portal.
+
+Every query of the portal names its view in QUERY_SPECS, which declares
+the table and the only columns the view displays: listing applications
+no longer drags cover letters or resumes along, and the company views
+that only show an internship's title don't download its description.
+
+    rows = spec_query(supabase, "student.applications").eq("student_id", user_id).execute().data
+
+spec_query() returns the usual query builder; its execute() is timed and
+logged under the view name in the data-access report of the sidebar
+(DATA_ACCESS_STATS=1), with the rows and the size of the payload.
+
+With QUERY_GUARD=1 (development), a select("*") on one of the WIDE_TABLES
+through a client wrapped by guard_selects() is flagged in the sidebar and
+as a warning; QUERY_GUARD=strict raises instead.
+"""
+
+import json
+import os
+import time
+import warnings
+
+import streamlit as st
+
+from .db_utils import SHOW_DATA_ACCESS_STATS, record_data_access
+
+STATUSES = ("pending", "reviewed", "accepted", "rejected", "withdrawn")
+
+INTERNSHIP_CARD_COLUMNS = (
+    "id", "company_id", "title", "location", "duration", "job_type", "salary", "spots_available",
+    "start_date", "application_deadline", "description", "requirements", "created_at",
+)
+
+# view -> (table, columns)
+QUERY_SPECS = {
+    "user.role": ("users", ("role",)),
+    # student dashboard
+    "student.profile": ("student_profiles", ("first_name", "major", "university")),
+    "student.internships": ("internships", INTERNSHIP_CARD_COLUMNS),
+    "student.internship_search": ("internships", ("id", "company_id", "title", "location", "job_type", "created_at")),
+    "student.internship_locations": ("internships", ("id", "location", "created_at")),
+    "student.applications": ("applications", ("internship_id", "status")),
+    "student.companies": ("company_profiles", ("id", "company_name")),
+    # company dashboard
+    "company.profile": ("company_profiles", ("company_name",)),
+    "company.my_internships": ("internships", INTERNSHIP_CARD_COLUMNS),
+    "company.internships": ("internships", ("id", "title")),
+    "company.applications": (
+        "applications",
+        ("id", "internship_id", "student_id", "status", "applied_at", "cover_letter", "resume_key"),
+    ),
+    # ids of the applications whose resume is still in resume_pdf, then one of those files when clicked
+    "company.legacy_resumes": ("applications", ("id",)),
+    "company.resume_pdf": ("applications", ("resume_pdf",)),
+    "company.applicants": ("student_profiles", ("id", "first_name", "last_name", "university", "major", "phone")),
+    "company.application_counts": ("application_counts", ("internship_id", "total") + STATUSES),
+    "company.application_statuses": ("applications", ("internship_id", "status")),
+}
+
+# tables whose rows carry long texts or files, never to be read with select("*")
+WIDE_TABLES = {
+    "applications": ("resume_pdf", "cover_letter"),
+    "internships": ("description", "requirements"),
+    "student_profiles": (),
+    "company_profiles": (),
+}
+
+QUERY_GUARD = os.getenv("QUERY_GUARD", "")
+
+
+class SpecQuery:
+    """Query builder of a view: chained calls go to the client's builder, execute() is logged."""
+
+    def __init__(self, view, builder):
+        self.view = view
+        self._builder = builder
+
+    def __getattr__(self, name):
+        attr = getattr(self._builder, name)
+        if hasattr(attr, "execute"):
+            # properties such as not_ return the builder itself
+            self._builder = attr
+            return self
+        if not callable(attr):
+            return attr
+
+        def chained(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            if hasattr(result, "execute"):
+                self._builder = result
+                return self
+            return result
+
+        return chained
+
+    def execute(self):
+        start = time.perf_counter()
+        response = self._builder.execute()
+        seconds = time.perf_counter() - start
+        rows = response.data or []
+        # serializing the rows again costs time: only when the report is shown
+        kb = len(json.dumps(rows, default=str)) / 1024 if SHOW_DATA_ACCESS_STATS else None
+        record_data_access(self.view, False, seconds, len(rows) if isinstance(rows, list) else 1, kb=kb)
+        return response
+
+
+def spec_query(client, view, count=None):
+    """query of `view` selecting only its declared columns"""
+    table, columns = QUERY_SPECS[view]
+    builder = client.table(table)
+    select = ",".join(columns)
+    builder = builder.select(select, count=count) if count else builder.select(select)
+    return SpecQuery(view, builder)
+
+
+def flag_wide_select(table):
+    message = (
+        f"select('*') on {table} reads every column ({', '.join(WIDE_TABLES[table]) or 'all of them'}): "
+        "declare the columns of the view in QUERY_SPECS"
+    )
+    if QUERY_GUARD == "strict":
+        raise ValueError(message)
+    warnings.warn(message, stacklevel=3)
+    try:
+        st.sidebar.warning(f"⚠️ {message}")
+    except Exception:
+        # no Streamlit session (scripts, benchmarks)
+        pass
+
+
+class _GuardedTable:
+    def __init__(self, builder, table):
+        self._builder = builder
+        self._table = table
+
+    def __getattr__(self, name):
+        return getattr(self._builder, name)
+
+    def select(self, *columns, **kwargs):
+        selected = ",".join(columns) if columns else "*"
+        if self._table in WIDE_TABLES and "*" in (column.strip() for column in selected.split(",")):
+            flag_wide_select(self._table)
+        return self._builder.select(*columns, **kwargs)
+
+
+class _GuardedClient:
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+    def table(self, name):
+        return _GuardedTable(self._client.table(name), name)
+
+
+def guard_selects(client):
+    """`client`, wrapped to flag select("*") on wide tables when QUERY_GUARD is set"""
+    if not QUERY_GUARD or QUERY_GUARD == "0":
+        return client
+    return _GuardedClient(client)
@@ -0,0 +1,214 @@
+"""
+Resume PDFs of the internship applications, stored once by content.
+
+A resume is kept under the SHA-256 of its bytes, referenced by the
+`resume_key` column of applications (database/sql/resume_blobs.sql),
+instead of a hex string in the row. The same file uploaded twice is
+stored once, listing applications no longer downloads the resumes, and a
+resume is only read when its download button is clicked, streamed in
+chunks and handed to the button as bytes.
+
+Two stores share the put(data) -> key / read(key) -> bytes interface:
+Supabase Storage (the private `resumes` bucket, the default) and a local
+directory (RESUME_STORE=local, RESUME_STORE_PATH, default .cache/resumes)
+for development and tests.
+
+Resumes saved in applications.resume_pdf before are moved with the
+service-role key (SUPABASE_SERVICE_ROLE_KEY: the anon key can't update
+other users' applications):
+
+    cd app && python -m utils.resumes --migrate
+"""
+
+import argparse
+import base64
+import hashlib
+import os
+from pathlib import Path
+
+DEFAULT_PATH = Path(__file__).resolve().parents[2] / ".cache" / "resumes"
+
+BUCKET = "resumes"
+
+# read / write size of the streamed transfers
+CHUNK_SIZE = 64 * 1024
+
+# lifetime of the signed urls used to stream a download, in seconds
+SIGNED_URL_TTL = 60
+
+
+def resume_key(data):
+    """content address of a resume: SHA-256 of its bytes, in hex"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def blob_path(key):
+    # two-level fan-out keeps directories (and storage listings) small
+    return f"{key[:2]}/{key}.pdf"
+
+
+def decode_legacy_resume(value):
+    """bytes of a resume_pdf value: "\\x" + hex (bytea) or base64 text"""
+    if isinstance(value, str) and value.startswith("\\x"):
+        return bytes.fromhex(value[2:])
+    text = "".join(str(value).split())
+    return base64.b64decode(text + "=" * (-len(text) % 4))
+
+
+class LocalResumeStore:
+    """Resumes as files of a local directory."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.getenv("RESUME_STORE_PATH") or DEFAULT_PATH)
+
+    def exists(self, key):
+        return (self.path / blob_path(key)).exists()
+
+    def put(self, data):
+        """store `data` unless the same bytes are already stored, returns its key"""
+        key = resume_key(data)
+        target = self.path / blob_path(key)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = target.with_name(target.name + ".tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, target)
+        return key
+
+    def read(self, key):
+        """bytes of a stored resume"""
+        with open(self.path / blob_path(key), "rb") as f:
+            return f.read()
+
+
+class SupabaseResumeStore:
+    """Resumes as objects of a private Supabase Storage bucket.
+
+    `client` is the signed-in client of the session: the bucket policies
+    let students upload and companies read the resumes of their applicants.
+    """
+
+    def __init__(self, client, bucket=BUCKET):
+        self.client = client
+        self.bucket = bucket
+
+    def _bucket(self):
+        return self.client.storage.from_(self.bucket)
+
+    def exists(self, key):
+        return self._bucket().exists(blob_path(key))
+
+    def put(self, data):
+        """upload `data` unless the same bytes are already stored, returns its key"""
+        key = resume_key(data)
+        if not self.exists(key):
+            try:
+                self._bucket().upload(blob_path(key), data, {"content-type": "application/pdf", "upsert": "false"})
+            except Exception as e:
+                # uploaded meanwhile by another session: same key, same bytes
+                if "exists" not in str(e).lower() and "duplicate" not in str(e).lower():
+                    raise
+        return key
+
+    def read(self, key):
+        """bytes of a stored resume, streamed from a short-lived signed url"""
+        import httpx
+
+        url = self._bucket().create_signed_url(blob_path(key), SIGNED_URL_TTL)["signedURL"]
+        with httpx.stream("GET", url, timeout=30) as response:
+            response.raise_for_status()
+            return b"".join(response.iter_bytes(CHUNK_SIZE))
+
+
+def get_resume_store(client):
+    """store selected by RESUME_STORE ("supabase", the default, or "local")"""
+    if os.getenv("RESUME_STORE", "supabase") == "local":
+        return LocalResumeStore()
+    return SupabaseResumeStore(client)
+
+
+def read_legacy_resume(client, application_id):
+    """bytes of the resume saved in applications.resume_pdf of one application"""
+    from .queries import spec_query
+
+    rows = spec_query(client, "company.resume_pdf").eq("id", application_id).execute().data
+    if not rows or not rows[0].get("resume_pdf"):
+        return b""
+    return decode_legacy_resume(rows[0]["resume_pdf"])
+
+
+def resume_opener(store, application, client=None, legacy=False):
+    """callable returning the resume of an application, for a lazy download button
+
+    None when the application has no resume. The listings don't read
+    resume_pdf: for a row whose resume is still there (`legacy`, until
+    --migrate moves it), the file of this application alone is fetched
+    through `client` when the button is clicked.
+    """
+    key = application.get("resume_key")
+    if key:
+        return lambda: store.read(key)
+    if legacy and client is not None:
+        return lambda: read_legacy_resume(client, application["id"])
+    return None
+
+
+def migrate(client, store, batch_size=50):
+    """move the resumes of applications.resume_pdf to the store, returns (moved, stored)
+
+    `stored` counts the distinct files: identical resumes are stored once.
+    """
+    moved, keys = 0, set()
+    while True:
+        rows = (
+            client.table("applications")
+            .select("id,resume_pdf")
+            .not_.is_("resume_pdf", "null")
+            .limit(batch_size)
+            .execute()
+            .data
+        )
+        if not rows:
+            return moved, len(keys)
+        for row in rows:
+            key = store.put(decode_legacy_resume(row["resume_pdf"]))
+            keys.add(key)
+            # the row only keeps the reference, which also takes it out of the next batch
+            changes = {"resume_key": key, "resume_pdf": None}
+            response = client.table("applications").update(changes).eq("id", row["id"]).execute()
+            if not response.data:
+                # row-level security filters the update out without an error:
+                # the same batch would come back forever
+                raise RuntimeError(
+                    f"application {row['id']} was not updated: run the migration with the service-role key"
+                )
+            moved += 1
+        print(f"→ {moved} resumes moved")
+
+
+def main():
+    from supabase import create_client
+
+    from .db_utils import SUPABASE_URL
+
+    parser = argparse.ArgumentParser(description="Resume blob store")
+    parser.add_argument(
+        "--migrate",
+        action="store_true",
+        help="move applications.resume_pdf to the store (needs SUPABASE_SERVICE_ROLE_KEY)",
+    )
+    args = parser.parse_args()
+    if not args.migrate:
+        parser.print_help()
+        return
+
+    service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+    if not service_key:
+        parser.error("set SUPABASE_SERVICE_ROLE_KEY: the anon key of the app can't update the applications")
+    client = create_client(SUPABASE_URL, service_key)
+    moved, stored = migrate(client, get_resume_store(client))
+    print(f"✅ {moved} resumes moved, {stored} distinct files stored")
+
+
+if __name__ == "__main__":
+    main()
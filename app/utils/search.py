@@ -0,0 +1,165 @@
+"""
+Full-text search over job titles, companies and locations.
+
+Text is normalized the same way for documents and queries: case folded,
+Latin accents removed (é -> e), Arabic diacritics and tatweel removed and
+Arabic letter variants unified (أ إ آ -> ا, ة -> ه, ى -> ي). Tokens are
+word characters runs of at least two characters.
+
+SearchIndex is an inverted index built incrementally: documents are
+appended as they arrive and each token keeps a compact posting list of
+(document number, weight). Queries match all their tokens (the last one
+as a prefix, for search-as-you-type) and results are ranked by the sum of
+field weight x idf of the matched tokens.
+"""
+
+import bisect
+import math
+import re
+import threading
+import unicodedata
+from array import array
+
+import numpy as np
+
+# a match in the title counts more than one in the company or location
+FIELD_WEIGHTS = {"title": 3.0, "company": 2.0, "location": 1.0}
+
+# prefixes expanding to more tokens than this only use the most common ones
+MAX_PREFIX_EXPANSIONS = 256
+
+# a completion of the last query word scores less than the word itself
+PREFIX_WEIGHT = 0.8
+
+TOKEN_RE = re.compile(r"\w{2,}")
+ARABIC_LETTERS = str.maketrans({"ة": "ه", "ى": "ي", "ـ": None})
+
+
+def normalize(text):
+    """case-fold and strip accents / Arabic diacritics so that "Sécurité" matches "securite" """
+    # missing values of the pandas frame are NaN, not None
+    if text is None or (isinstance(text, float) and math.isnan(text)):
+        return ""
+    decomposed = unicodedata.normalize("NFKD", str(text))
+    # hamza and madda on alef decompose into combining marks, like the Latin accents
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return stripped.casefold().translate(ARABIC_LETTERS)
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(normalize(text))
+
+
+class SearchIndex:
+    """Incremental inverted index over records with the FIELD_WEIGHTS fields."""
+
+    def __init__(self, fields=FIELD_WEIGHTS):
+        self.fields = fields
+        self.lock = threading.Lock()
+        self.keys = []  # document number -> external key
+        self.known = set()
+        self.postings = {}  # token -> (array of document numbers, array of weights)
+        self.vocabulary = []  # sorted tokens, for prefix lookups
+        self.frozen = {}  # token -> numpy copies of its posting list
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key, record):
+        """index one record (a mapping with the field names), ignoring known keys"""
+        with self.lock:
+            return self._add(key, record)
+
+    def add_frame(self, df, key="id"):
+        """index the rows of a DataFrame, keyed by its `key` column"""
+        columns = [column for column in self.fields if column in df]
+        with self.lock:
+            for values in df[[key, *columns]].itertuples(index=False, name=None):
+                self._add(values[0], dict(zip(columns, values[1:])))
+
+    def _add(self, key, record):
+        if key in self.known:
+            return False
+        doc = len(self.keys)
+        self.keys.append(key)
+        self.known.add(key)
+
+        weights = {}
+        for field, weight in self.fields.items():
+            for token in tokenize(record.get(field)):
+                weights[token] = weights.get(token, 0.0) + weight
+
+        for token, weight in weights.items():
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = (array("i"), array("f"))
+                bisect.insort(self.vocabulary, token)
+            posting[0].append(doc)
+            posting[1].append(weight)
+        return True
+
+    def _arrays(self, token):
+        docs, weights = self.postings[token]
+        cached = self.frozen.get(token)
+        if cached is None or len(cached[0]) != len(docs):
+            # copies: an array can't grow while numpy holds a view on it
+            idf = math.log(1 + len(self.keys) / len(docs))
+            cached = (np.array(docs, dtype=np.int64), np.array(weights, dtype=np.float32) * idf)
+            self.frozen[token] = cached
+        return cached
+
+    def _term(self, token, prefix):
+        """document numbers (sorted) and scores of one query token"""
+        exact = [token] if token in self.postings else []
+        completions = []
+        if prefix:
+            start = bisect.bisect_right(self.vocabulary, token)
+            end = bisect.bisect_left(self.vocabulary, token + "\uffff")
+            completions = self.vocabulary[start:end]
+            if len(completions) > MAX_PREFIX_EXPANSIONS:
+                completions = sorted(completions, key=lambda t: len(self.postings[t][0]), reverse=True)
+                completions = completions[:MAX_PREFIX_EXPANSIONS]
+
+        if not completions:
+            if not exact:
+                return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+            return self._arrays(token)
+
+        # a document matching several completions scores their best one
+        parts = [self._arrays(t) for t in exact]
+        parts += [(docs, scores * PREFIX_WEIGHT) for docs, scores in map(self._arrays, completions)]
+        docs = np.concatenate([part[0] for part in parts])
+        scores = np.concatenate([part[1] for part in parts])
+        order = np.lexsort((-scores, docs))
+        docs, scores = docs[order], scores[order]
+        first = np.ones(len(docs), dtype=bool)
+        first[1:] = docs[1:] != docs[:-1]
+        return docs[first], scores[first]
+
+    def search(self, query, limit=None, prefix=True):
+        """[(key, score)] of the records matching every token of `query`, best first"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        with self.lock:
+            terms = [
+                self._term(token, prefix and i == len(tokens) - 1) for i, token in enumerate(tokens)
+            ]
+            terms.sort(key=lambda term: len(term[0]))
+
+            docs, scores = terms[0]
+            for other_docs, other_scores in terms[1:]:
+                if not len(docs):
+                    break
+                positions = np.searchsorted(other_docs, docs)
+                positions[positions == len(other_docs)] = 0
+                found = other_docs[positions] == docs
+                docs = docs[found]
+                scores = scores[found] + other_scores[positions[found]]
+
+            if limit is not None and len(docs) > limit:
+                best = np.argpartition(-scores, limit)[:limit]
+                docs, scores = docs[best], scores[best]
+            # best score first, in insertion order among equal scores
+            order = np.lexsort((docs, -scores))
+            return [(self.keys[doc], float(score)) for doc, score in zip(docs[order], scores[order])]
@@ -0,0 +1,99 @@
+"""
+Rerun time and message payload of the Browse page in card and table
+listing modes, run headless with Streamlit's AppTest against an
+in-memory copy of the jobs table.
+
+    python -m benchmarks.browse_render --jobs 5000 2>/dev/null
+
+(stderr only carries Streamlit's "no runtime" warnings of a headless run)
+
+For each mode, a plain rerun and a click on "Next ▶" are measured (after
+a first run that fills the caches): wall time of the script run, number
+of messages sent to the browser and their serialized size.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+BROWSE_PAGE = ROOT / "app" / "pages" / "1_📊Browse.py"
+
+
+def synthetic_rows(size):
+    sources = ["Emploitic", "France Travail", "Wuzzuf"]
+    return [
+        {
+            "id": i,
+            "source": sources[i % 3],
+            "title": f"Cybersecurity Analyst {i % 500}",
+            "company": f"Company {i % 400}",
+            "location": f"City {i % 60}",
+            "date_posted": f"2025-01-{1 + i % 28:02d}",
+            "url": f"https://jobs.example.com/offer/{i}",
+            "scraped_at": f"2025-02-{1 + i % 28:02d}T10:00:00+00:00",
+        }
+        for i in range(size)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=5000)
+    args = parser.parse_args()
+
+    # the pages import `utils.db_utils` with app/ on the path, like `streamlit run`
+    os.environ.setdefault("SUPABASE_URL", "http://localhost")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    os.environ["JOBS_CACHE_PATH"] = str(Path(tempfile.mkdtemp()) / "jobs.parquet")
+    sys.path.insert(0, str(ROOT / "app"))
+
+    import utils.db_utils as db_utils
+    from streamlit.testing.v1 import AppTest
+    from streamlit.testing.v1.local_script_runner import LocalScriptRunner
+
+    from benchmarks.fake_supabase import FakeSupabase
+
+    fake = FakeSupabase({"jobs": synthetic_rows(args.jobs)})
+    db_utils.get_client = lambda: fake
+
+    # sizes of the messages of the last script run
+    sent = []
+    forward_msgs = LocalScriptRunner.forward_msgs
+
+    def recording_forward_msgs(runner):
+        messages = forward_msgs(runner)
+        sent[:] = [message.ByteSize() for message in messages]
+        return messages
+
+    LocalScriptRunner.forward_msgs = recording_forward_msgs
+
+    def measure(run):
+        start = time.perf_counter()
+        at = run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        return elapsed * 1000, len(sent), sum(sent) / 1024
+
+    print(f"{args.jobs:,} jobs")
+    print(f"{'':<28} {'time (ms)':>10} {'messages':>9} {'payload (KB)':>13}")
+    for view in ("Cards", "Table"):
+        at = AppTest.from_file(str(BROWSE_PAGE), default_timeout=120)
+        at.session_state["browse_view"] = view
+        at.run()  # warms the jobs cache and the cached queries
+        rows = len(at.dataframe[0].value) if view == "Table" else len(at.subheader)
+
+        for label, run in (
+            ("rerun", at.run),
+            ("next page", lambda: at.button(key="next_btn").click().run()),
+        ):
+            ms, messages, kb = measure(run)
+            print(f"{f'{view} ({rows} jobs) {label}':<28} {ms:>10.0f} {messages:>9} {kb:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
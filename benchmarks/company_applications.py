@@ -0,0 +1,174 @@
+"""
+Requests and time of the company pages of the internship portal, before
+and after app/utils/applications.py:
+
+- Applications / Overview: one student_profiles request per application
+  against the batched view;
+- My Internships: one count request per internship against the grouped
+  application_counts view (served here by its Python equivalent) and
+  against the fallback that counts the statuses locally.
+
+    python -m benchmarks.company_applications --applicants 500 --internships 30 --latency-ms 40 2>/dev/null
+
+(stderr only carries Streamlit's "no runtime" warnings of a headless run)
+
+`--latency-ms` adds a simulated network round trip to every request of
+the in-memory Supabase stand-in.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.fake_supabase import FakeSupabase
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def synthetic_tables(internships, applicants):
+    company_id = "company-1"
+    statuses = ["pending", "reviewed", "accepted", "rejected"]
+    return company_id, {
+        "internships": [
+            {"id": i, "company_id": company_id, "title": f"Security intern {i}"} for i in range(1, internships + 1)
+        ],
+        "applications": [
+            {
+                "id": i,
+                "internship_id": 1 + i % internships,
+                "student_id": f"student-{i}",
+                "status": statuses[i % 4],
+                "applied_at": f"2025-03-{1 + i % 28:02d}T10:{i % 60:02d}:00+00:00",
+            }
+            for i in range(applicants)
+        ],
+        "student_profiles": [
+            {"id": f"student-{i}", "first_name": f"First{i}", "last_name": f"Last{i}", "university": "USTHB"}
+            for i in range(applicants)
+        ],
+    }
+
+
+def per_row_lookups(client, company_id):
+    """the loops of show_applications before: a scan and a request per application"""
+    internships = client.table("internships").select("*").eq("company_id", company_id).execute()
+    applications = (
+        client.table("applications")
+        .select("*")
+        .in_("internship_id", [i["id"] for i in internships.data])
+        .order("applied_at", desc=True)
+        .order("id", desc=True)
+        .execute()
+    )
+    rows = []
+    for app in applications.data:
+        internship = next((i for i in internships.data if i["id"] == app["internship_id"]), None)
+        student = client.table("student_profiles").select("*").eq("id", app["student_id"]).execute()
+        rows.append((app, internship, student.data[0] if student.data else {}))
+    return rows
+
+
+def projected(rows, specs):
+    """(application, internship, student) rows cut to the columns the view selects"""
+
+    def cut(row, spec):
+        return {column: row.get(column) for column in specs[spec][1]}
+
+    return [
+        (cut(app, "company.applications"), cut(internship, "company.internships"), cut(student, "company.applicants"))
+        for app, internship, student in rows
+    ]
+
+
+def batched_view(client, company_id, load_company_applications):
+    view = load_company_applications(client, company_id)
+    return [(app, view.internship(app), view.student(app)) for app in view.applications]
+
+
+def per_internship_counts(client, company_id):
+    """the loop of show_my_internships before: a count request per internship"""
+    internships = client.table("internships").select("*").eq("company_id", company_id).execute()
+    counts = {}
+    for internship in internships.data:
+        response = (
+            client.table("applications").select("id", count="exact").eq("internship_id", internship["id"]).execute()
+        )
+        counts[internship["id"]] = response.count
+    return counts
+
+
+def grouped_counts(client, company_id, load_application_counts):
+    internships = client.table("internships").select("*").eq("company_id", company_id).execute()
+    counts = load_application_counts(client, [internship["id"] for internship in internships.data])
+    return {internship["id"]: counts.get(internship["id"], {}).get("total", 0) for internship in internships.data}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--applicants", type=int, default=500)
+    parser.add_argument("--internships", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="simulated round trip per request")
+    args = parser.parse_args()
+
+    # app/utils is imported like `streamlit run` does, with app/ on the path
+    os.environ.setdefault("SUPABASE_URL", "http://localhost")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    sys.path.insert(0, str(ROOT / "app"))
+    from utils.applications import compute_application_counts, load_application_counts, load_company_applications
+    from utils.queries import QUERY_SPECS
+
+    def application_counts_view(client):
+        counts = compute_application_counts(client.tables["applications"])
+        return [{"internship_id": internship_id, **entry} for internship_id, entry in counts.items()]
+
+    company_id, tables = synthetic_tables(args.internships, args.applicants)
+    fake = FakeSupabase(tables, views={"application_counts": application_counts_view})
+    respond = fake.respond
+
+    def slow_respond(data, count=None):
+        time.sleep(args.latency_ms / 1000)
+        return respond(data, count)
+
+    fake.respond = slow_respond
+
+    print(f"{args.applicants} applications, {args.internships} internships, {args.latency_ms:g} ms per request")
+    print(f"{'':<36} {'requests':>9} {'ms':>9} {'KB':>9}")
+
+    def measure(label, load):
+        fake.reset_stats()
+        start = time.perf_counter()
+        result = load(fake, company_id)
+        elapsed = time.perf_counter() - start
+        print(f"{label:<36} {fake.requests:>9} {elapsed * 1000:>9.0f} {fake.bytes_received / 1024:>9.1f}")
+        return result
+
+    before = measure("Applications: per-row lookups", per_row_lookups)
+    after = measure(
+        "Applications: batched view",
+        lambda client, company: batched_view(client, company, load_company_applications),
+    )
+    # the per-row baseline reads every column, the view only those of its query specs
+    assert projected(before, QUERY_SPECS) == projected(after, QUERY_SPECS)
+
+    before = measure("My Internships: per-internship counts", per_internship_counts)
+    after = measure(
+        "My Internships: grouped view",
+        lambda client, company: grouped_counts(client, company, load_application_counts),
+    )
+    assert before == after
+
+    def missing_view(client):
+        raise LookupError('relation "application_counts" does not exist')
+
+    fake.views["application_counts"] = missing_view
+    after = measure(
+        "My Internships: local fallback",
+        lambda client, company: grouped_counts(client, company, load_application_counts),
+    )
+    assert before == after
+
+
+if __name__ == "__main__":
+    main()
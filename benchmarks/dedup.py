@@ -0,0 +1,112 @@
+"""
+Throughput and accuracy of the near-duplicate detection of the ingest
+path (database/identity.py) on synthetic offers, a share of which are
+re-published with another case, accents, a gender marker, a slightly
+different company name or tracking parameters in the url.
+
+    python -m benchmarks.dedup --sizes 10000 100000
+
+"comparisons / job" is the number of candidates verified per new job:
+it stays flat as the index grows, where a pairwise check would compare
+every job with all the previous ones.
+"""
+
+import argparse
+import random
+import time
+
+from database.identity import DedupIndex, canonical_url, identify
+
+TITLE_WORDS = [
+    "Ingénieur", "Analyste", "Consultant", "Architecte", "Responsable", "Technicien",
+    "Sécurité", "Cybersécurité", "SOC", "Pentester", "Cloud", "Réseau", "Systèmes",
+    "Security", "Network", "DevSecOps", "Forensic", "GRC", "Engineer", "Analyst",
+    "Junior", "Senior", "Lead", "Manager", "Audit", "Identité", "Données", "Incident",
+]
+CITIES = ["Paris", "Lyon", "Marseille", "Toulouse", "Nantes", "Alger", "Oran", "Cairo", "Giza"]
+SOURCES = ["Emploitic", "France Travail", "Wuzzuf"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "tek", "vo", "sys", "dor", "ix", "an", "be", "zu", "nel", "qu", "fi", "so"]
+COMPANY_SUFFIXES = ["", "", " Conseil", " Group", " Technologies", " Solutions", " Digital"]
+
+
+def company_names(count, rng):
+    names = set()
+    while len(names) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        names.add(name + rng.choice(COMPANY_SUFFIXES))
+    return sorted(names)
+
+
+def synthetic_offers(size, duplicate_rate, seed=0):
+    """jobs and the id of the original offer of each (ground truth clusters)"""
+    rng = random.Random(seed)
+    companies = company_names(max(size // 20, 100), rng)
+    jobs, truth = [], []
+    originals = []
+    for i in range(size):
+        if originals and rng.random() < duplicate_rate:
+            original_id = rng.randrange(len(originals))
+            job = dict(originals[original_id])
+            variant = rng.randrange(4)
+            if variant == 0:
+                job["title"] = job["title"].upper()
+            elif variant == 1:
+                job["title"] += " H/F"
+            elif variant == 2:
+                job["company"] += " SA"
+            else:
+                job["title"] = job["title"].replace("é", "e")
+            job["source"] = rng.choice(SOURCES)
+            job["url"] = f"https://{job['source'].lower().replace(' ', '')}.example.com/offer/{i}?utm_source=feed"
+        else:
+            original_id = len(originals)
+            job = {
+                "source": rng.choice(SOURCES),
+                "title": " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 4))),
+                "company": rng.choice(companies),
+                "location": rng.choice(CITIES),
+                "url": f"https://jobs.example.com/offer/{i}",
+            }
+            originals.append(job)
+        jobs.append(job)
+        truth.append(original_id)
+    return jobs, truth
+
+
+def pair_counts(labels):
+    """number of job pairs put in the same cluster"""
+    sizes = {}
+    for label in labels:
+        sizes[label] = sizes.get(label, 0) + 1
+    return sum(n * (n - 1) // 2 for n in sizes.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--duplicate-rate", type=float, default=0.15)
+    args = parser.parse_args()
+
+    print(f"{'jobs':>9} {'jobs/s':>8} {'comparisons / job':>18} {'precision':>10} {'recall':>7} {'clusters':>9}")
+    for size in args.sizes:
+        jobs, truth = synthetic_offers(size, args.duplicate_rate)
+        index = DedupIndex()
+        start = time.perf_counter()
+        clusters = [identify(job, index)["cluster_id"] for job in jobs]
+        elapsed = time.perf_counter() - start
+
+        # pairs found / expected, counted on (found cluster, true cluster) intersections
+        together = pair_counts(list(zip(clusters, truth)))
+        precision = together / max(pair_counts(clusters), 1)
+        recall = together / max(pair_counts(truth), 1)
+        print(
+            f"{size:>9,} {size / elapsed:>8,.0f} {index.comparisons / size:>18.2f} "
+            f"{precision:>10.3f} {recall:>7.3f} {len(set(clusters)):>9,}"
+        )
+
+    sample = "https://www.wuzzuf.net/jobs/p/abc-soc-analyst/?o=3&l=sp&t=sj&a=soc|search-v3&utm_source=x"
+    print(f"\ncanonical url: {sample}\n            -> {canonical_url(sample)}")
+
+
+if __name__ == "__main__":
+    main()
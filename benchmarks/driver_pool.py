@@ -0,0 +1,72 @@
+"""
+Browser startup of repeated runs: ChromeDriverManager().install() plus a
+new Chrome for every run (before) against the cached driver path and the
+warm DriverPool (after).
+
+    python -m benchmarks.driver_pool --runs 5
+
+Each "run" gets a browser, opens the France Travail search like a scraper
+and gives the browser back; only the time until the browser is ready is
+reported, the page load is the same for both.
+"""
+
+import argparse
+import statistics
+import time
+
+from webdriver_manager.chrome import ChromeDriverManager
+
+from scrapers.driver import create_driver
+from scrapers.driver_pool import DriverPool, driver_path
+from scrapers.FranceTravail import build_search_url
+
+
+def cold_runs(runs, profile):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        driver = create_driver(ChromeDriverManager().install(), profile=profile)
+        timings.append(time.perf_counter() - start)
+        try:
+            driver.get(build_search_url())
+        finally:
+            driver.quit()
+    return timings
+
+
+def pooled_runs(runs, profile):
+    timings = []
+    with DriverPool(size=1) as pool:
+        for _ in range(runs):
+            start = time.perf_counter()
+            driver = pool.acquire(profile=profile)
+            timings.append(time.perf_counter() - start)
+            try:
+                driver.get(build_search_url())
+            finally:
+                pool.release(driver)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", default="lean")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    driver_path()
+    resolve = time.perf_counter() - start
+    start = time.perf_counter()
+    driver_path()
+    print(f"driver path: {resolve * 1000:.0f} ms first call, {(time.perf_counter() - start) * 1000:.3f} ms cached")
+
+    print(f"\n{'browser':<10} {'first s':>8} {'next runs (median) s':>21}")
+    for label, measure in (("cold", cold_runs), ("pool", pooled_runs)):
+        timings = measure(args.runs, args.profile)
+        following = statistics.median(timings[1:]) if len(timings) > 1 else float("nan")
+        print(f"{label:<10} {timings[0]:>8.2f} {following:>21.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Startup time, page-load time, resources fetched and memory of a Chrome
+driver with the "full" profile (today's browser) and the "lean" one
+(headless, images / CSS / fonts / trackers blocked, eager page loads),
+on the pages the scrapers open.
+
+    python -m benchmarks.driver_profiles --repeat 3
+    python -m benchmarks.driver_profiles --profiles full-headless lean   # no display
+
+RSS is summed over chromedriver and all its Chrome processes (read from
+/proc, Linux only); pages shared between processes are counted once per
+process, so it is an upper bound, comparable between profiles.
+"""
+
+import argparse
+import os
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scrapers.driver import create_driver
+from scrapers.driver_pool import driver_path
+from scrapers.FranceTravail import build_search_url
+
+# (label, url, element the scraper waits for)
+PAGES = [
+    ("france_travail", build_search_url(), "li.result"),
+    ("emploitic", "https://emploitic.com/", 'input[data-testid="search"]'),
+]
+
+# name -> (profile, headless override)
+VARIANTS = {
+    "full": ("full", None),
+    "full-headless": ("full", True),
+    "lean": ("lean", None),
+}
+
+RESOURCES_JS = """
+const entries = performance.getEntriesByType('resource');
+return [entries.length, entries.reduce((total, e) => total + (e.transferSize || 0), 0)];
+"""
+
+
+def tree_rss_mb(pid):
+    """resident memory (MB) of a process and its descendants"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total_kb, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                total_kb += next((int(line.split()[1]) for line in f if line.startswith("VmRSS:")), 0)
+        except OSError:
+            pass
+        stack.extend(children.get(current, []))
+    return total_kb / 1024
+
+
+def measure(driver_path, variant, repeat):
+    profile, headless = VARIANTS[variant]
+    start = time.perf_counter()
+    driver = create_driver(driver_path, headless=headless, profile=profile)
+    startup = time.perf_counter() - start
+    rows = []
+    try:
+        for label, url, selector in PAGES:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                driver.get(url)
+                WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+                elapsed = time.perf_counter() - start
+                resources, transferred = driver.execute_script(RESOURCES_JS)
+                rss = tree_rss_mb(driver.service.process.pid) if os.path.isdir("/proc") else float("nan")
+                rows.append((label, elapsed, resources, transferred, rss))
+    finally:
+        driver.quit()
+    return startup, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--profiles", nargs="+", choices=list(VARIANTS), default=["full", "lean"])
+    parser.add_argument("--repeat", type=int, default=3, help="loads of each page")
+    args = parser.parse_args()
+
+    path = driver_path()
+    print(f"{'profile':<14} {'page':<15} {'startup s':>10} {'load ms':>9} {'resources':>10} {'KB':>8} {'RSS MB':>8}")
+    for variant in args.profiles:
+        startup, rows = measure(path, variant, args.repeat)
+        for label in dict.fromkeys(row[0] for row in rows):
+            runs = [row for row in rows if row[0] == label]
+            # median load, resources / memory of the last load
+            load = sorted(row[1] for row in runs)[len(runs) // 2]
+            _, _, resources, transferred, rss = runs[-1]
+            print(
+                f"{variant:<14} {label:<15} {startup:>10.2f} {load * 1000:>9.0f} "
+                f"{resources:>10} {transferred / 1024:>8.0f} {rss:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Latency of the Browse filter counts from the FacetIndex against computing
+them from the jobs DataFrame on each rerun (boolean masks + value_counts).
+
+    python -m benchmarks.facets --size 1000000 --companies 20000
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from app.utils.db_utils import type_jobs
+from app.utils.facets import FACET_FIELDS, FacetIndex
+
+SOURCES = ["Emploitic", "France Travail", "Wuzzuf"]
+
+# filters as selected in the sidebar
+SELECTIONS = [
+    {},
+    {"source": "Wuzzuf"},
+    {"source": "Wuzzuf", "location": "City 7"},
+    {"company": "Company 42"},
+    {"source": "France Travail", "company": "Company 42", "location": "City 7"},
+]
+
+
+def synthetic_facets(size, companies, locations, seed=0):
+    rng = random.Random(seed)
+    return pd.DataFrame(
+        {
+            "id": range(size),
+            "source": [rng.choice(SOURCES) for _ in range(size)],
+            # half the offers from 100 big employers, the rest from a long tail
+            "company": [
+                f"Company {rng.randrange(100) if rng.random() < 0.5 else rng.randrange(companies)}"
+                for _ in range(size)
+            ],
+            "location": [f"City {rng.randrange(locations)}" for _ in range(size)],
+        }
+    )
+
+
+def frame_counts(df, filters):
+    result = {}
+    for field in FACET_FIELDS:
+        mask = pd.Series(True, index=df.index)
+        for other, value in filters.items():
+            if other != field:
+                mask &= df[other] == value
+        result[field] = df.loc[mask, field].value_counts()
+    return result
+
+
+def index_counts(index, filters):
+    return {field: index.counts(field, **filters) for field in FACET_FIELDS}
+
+
+def timed(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--companies", type=int, default=20_000)
+    parser.add_argument("--locations", type=int, default=300)
+    args = parser.parse_args()
+
+    df = type_jobs(
+        synthetic_facets(args.size, args.companies, args.locations).assign(
+            date_posted=None, url="", scraped_at="2025-01-01T00:00:00"
+        )
+    )
+
+    index = FacetIndex()
+    start = time.perf_counter()
+    index.add_frame(df)
+    build = time.perf_counter() - start
+
+    delta = synthetic_facets(1_000, args.companies, args.locations, seed=1)
+    start = time.perf_counter()
+    index.add_frame(delta)
+    update = time.perf_counter() - start
+
+    print(
+        f"{args.size:,} jobs, {df['company'].nunique():,} companies, "
+        f"{len(index.combinations):,} combinations"
+    )
+    print(f"index build {build:.2f}s, +1,000 rows {update * 1000:.1f} ms")
+    print(f"\n{'filters':<58} {'frame (ms)':>11} {'index (ms)':>11}")
+    for filters in SELECTIONS:
+        label = ", ".join(f"{k}={v}" for k, v in filters.items()) or "(none)"
+        print(f"{label:<58} {timed(frame_counts, df, filters):>11.1f} {timed(index_counts, index, filters):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+In-memory stand-in for the Supabase client used by the benchmarks.
+
+Supports the subset of the PostgREST query builder the app and the
+scrapers use (select, eq, in_, is_, not_, comparison filters, or_,
+order, limit, range, insert, upsert, update, rpc); views are functions of the client returning
+their rows, queried like tables. Every execute() round-trips the rows
+through JSON like the real client and records the number of requests and
+bytes received.
+"""
+
+import json
+import re
+from types import SimpleNamespace
+
+OPERATORS = {
+    "eq": lambda a, b: a == b,
+    "neq": lambda a, b: a != b,
+    "lt": lambda a, b: a is not None and a < b,
+    "lte": lambda a, b: a is not None and a <= b,
+    "gt": lambda a, b: a is not None and a > b,
+    "gte": lambda a, b: a is not None and a >= b,
+}
+
+
+def _cast(raw, sample):
+    raw = raw.strip('"')
+    if isinstance(sample, int) and not isinstance(sample, bool):
+        return int(raw)
+    if isinstance(sample, float):
+        return float(raw)
+    return raw
+
+
+def _split_top_level(expr):
+    parts, depth, current = [], 0, ""
+    for char in expr:
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += char == "("
+        depth -= char == ")"
+        current += char
+    parts.append(current)
+    return parts
+
+
+def _logic_filter(expr, combine):
+    """compile a PostgREST logic tree such as `a.lt.1,and(a.eq.1,b.lt.2)`"""
+    tests = []
+    for part in _split_top_level(expr):
+        nested = re.fullmatch(r"(and|or)\((.*)\)", part)
+        if nested:
+            tests.append(_logic_filter(nested.group(2), all if nested.group(1) == "and" else any))
+            continue
+        column, op, value = part.split(".", 2)
+        tests.append(
+            lambda row, c=column, o=op, v=value: OPERATORS[o](row.get(c), _cast(v, row.get(c)))
+        )
+    return lambda row: combine(test(row) for test in tests)
+
+
+class Query:
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+        self.columns = None
+        self.count = None
+        self.filters = []
+        self.orders = []
+        self.offset = 0
+        self.max_rows = None
+        self.write = None
+        self.changes = None
+        self.negate = False
+
+    def select(self, columns="*", count=None):
+        if columns.strip() != "*":
+            self.columns = [column.strip() for column in columns.split(",")]
+        self.count = count
+        return self
+
+    def _add(self, test):
+        if self.negate:
+            self.negate = False
+            self.filters.append(lambda row: not test(row))
+        else:
+            self.filters.append(test)
+        return self
+
+    def _filter(self, column, op, value):
+        return self._add(lambda row: OPERATORS[op](row.get(column), value))
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def is_(self, column, value):
+        expected = None if value in (None, "null") else value
+        return self._add(lambda row: row.get(column) is expected)
+
+    def eq(self, column, value):
+        return self._filter(column, "eq", value)
+
+    def neq(self, column, value):
+        return self._filter(column, "neq", value)
+
+    def lt(self, column, value):
+        return self._filter(column, "lt", value)
+
+    def lte(self, column, value):
+        return self._filter(column, "lte", value)
+
+    def gt(self, column, value):
+        return self._filter(column, "gt", value)
+
+    def gte(self, column, value):
+        return self._filter(column, "gte", value)
+
+    def in_(self, column, values):
+        values = set(values)
+        return self._add(lambda row: row.get(column) in values)
+
+    def or_(self, expr):
+        return self._add(_logic_filter(expr, any))
+
+    def order(self, column, desc=False):
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size):
+        self.max_rows = size
+        return self
+
+    def range(self, start, end):
+        self.offset = start
+        self.max_rows = end - start + 1
+        return self
+
+    def insert(self, rows):
+        return self.upsert(rows, on_conflict=None)
+
+    def upsert(self, rows, on_conflict="id", ignore_duplicates=False):
+        self.write = (rows if isinstance(rows, list) else [rows], on_conflict, ignore_duplicates)
+        return self
+
+    def update(self, changes):
+        self.changes = changes
+        return self
+
+    def _write(self):
+        rows, on_conflict, ignore_duplicates = self.write
+        table = self.client.tables.setdefault(self.table, [])
+        existing = {row.get(on_conflict): row for row in table} if on_conflict else {}
+        written = []
+        for row in json.loads(json.dumps(rows)):
+            if on_conflict and row.get(on_conflict) in existing:
+                if not ignore_duplicates:
+                    existing[row[on_conflict]].update(row)
+                    written.append(existing[row[on_conflict]])
+                continue
+            if "id" not in row:
+                row["id"] = max((r.get("id", 0) for r in table), default=0) + 1
+            table.append(row)
+            existing[row.get(on_conflict)] = row
+            written.append(row)
+        return self.client.respond(written)
+
+    def execute(self):
+        if self.write is not None:
+            return self._write()
+        if self.changes is not None:
+            rows = [row for row in self.client.tables.get(self.table, []) if all(f(row) for f in self.filters)]
+            for row in rows:
+                row.update(json.loads(json.dumps(self.changes)))
+            return self.client.respond(rows)
+        view = self.client.views.get(self.table)
+        source = view(self.client) if view is not None else self.client.tables.get(self.table, [])
+        rows = [row for row in source if all(f(row) for f in self.filters)]
+        total = len(rows)
+        for column, desc in reversed(self.orders):
+            rows.sort(key=lambda row: (row.get(column) is None, row.get(column)), reverse=desc)
+        end = None if self.max_rows is None else self.offset + self.max_rows
+        rows = rows[self.offset:end]
+        if self.columns is not None:
+            rows = [{column: row.get(column) for column in self.columns} for row in rows]
+        return self.client.respond(rows, total if self.count else None)
+
+
+class FakeSupabase:
+    """tables: {name: [row dicts]}, functions: {rpc name: callable(client, **params)},
+    views: {name: callable(client) -> [row dicts]}"""
+
+    def __init__(self, tables=None, functions=None, views=None):
+        self.tables = tables or {}
+        self.functions = functions or {}
+        self.views = views or {}
+        self.requests = 0
+        self.bytes_received = 0
+
+    def table(self, name):
+        return Query(self, name)
+
+    def rpc(self, name, params=None):
+        return SimpleNamespace(execute=lambda: self.respond(self.functions[name](self, **(params or {}))))
+
+    def respond(self, data, count=None):
+        payload = json.dumps(data)
+        self.requests += 1
+        self.bytes_received += len(payload)
+        return SimpleNamespace(data=json.loads(payload), count=count)
+
+    def reset_stats(self):
+        self.requests = 0
+        self.bytes_received = 0
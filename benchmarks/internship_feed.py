@@ -0,0 +1,85 @@
+"""
+Render time and payload of the student dashboard as the catalogue grows,
+with the paged internship feed of app/utils/internship_feed.py and with
+every internship on one page (the feed before pagination).
+
+    python -m benchmarks.internship_feed --sizes 100 1000 5000 2>/dev/null
+
+(stderr only carries Streamlit's "no runtime" warnings of a headless run)
+
+The dashboard is rendered headless with Streamlit's AppTest, signed in as
+a student against an in-memory copy of the portal tables: first render,
+next page, a work type filter and a text search.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.fake_supabase import FakeSupabase
+from benchmarks.internship_queries import synthetic_tables
+
+ROOT = Path(__file__).resolve().parents[1]
+INTERNSHIPS_PAGE = ROOT / "app" / "pages" / "5_💼Internships.py"
+
+JOB_TYPES = ["on-site", "remote", "hybrid"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--applications", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SUPABASE_URL", "http://localhost")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    os.environ["RESUME_STORE"] = "local"
+    sys.path.insert(0, str(ROOT / "app"))
+
+    import utils.db_utils as db_utils
+    import utils.internship_feed as internship_feed
+    from streamlit.testing.v1 import AppTest
+
+    signed_in = SimpleNamespace(user=SimpleNamespace(id="student-1"))
+    paged = internship_feed.FEED_PAGE_SIZE
+
+    print(f"{'internships':>11} {'feed':<9} {'step':<12} {'ms':>8} {'requests':>9} {'KB':>9} {'cards':>6}")
+    for size in args.sizes:
+        tables = synthetic_tables(size, args.applications)
+        for i, internship in enumerate(tables["internships"]):
+            internship["job_type"] = JOB_TYPES[i % len(JOB_TYPES)]
+        fake = FakeSupabase(tables)
+        fake.auth = SimpleNamespace(get_session=lambda: signed_in, sign_out=lambda: None)
+        db_utils.create_client = lambda url, key: fake
+
+        for label, page_size in (("one page", size), ("paged", paged)):
+            internship_feed.FEED_PAGE_SIZE = page_size
+            at = AppTest.from_file(str(INTERNSHIPS_PAGE), default_timeout=600)
+            steps = [
+                ("first", lambda: at.run()),
+                ("next page", lambda: at.button(key="feed_next_btn").click().run()),
+                ("work type", lambda: at.selectbox[0].set_value("remote").run()),
+                ("search", lambda: at.text_input[0].set_value("intern 12").run()),
+            ]
+            for step, run in steps:
+                if step == "next page" and at.button(key="feed_next_btn").disabled:
+                    continue
+                fake.reset_stats()
+                start = time.perf_counter()
+                run()
+                elapsed = time.perf_counter() - start
+                if at.exception:
+                    raise RuntimeError(at.exception[0].message)
+                cards = len([block for block in at.markdown if block.value.startswith("### ")])
+                print(
+                    f"{size:>11} {label:<9} {step:<12} {elapsed * 1000:>8.0f} {fake.requests:>9}"
+                    f" {fake.bytes_received / 1024:>9.1f} {cards:>6}"
+                )
+    internship_feed.FEED_PAGE_SIZE = paged
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Payload and latency of each query of the internship portal, with every
+column selected (select("*"), before) and with the columns declared by
+the views in app/utils/queries.py (after).
+
+    python -m benchmarks.internship_queries --internships 200 --applications 1000 2>/dev/null
+
+(stderr only carries Streamlit's "no runtime" warnings of a headless run)
+
+The student dashboard and the company's Overview, My Internships and
+Applications sections are rendered headless with Streamlit's AppTest,
+signed in against an in-memory copy of the portal tables. Resumes are
+legacy hex strings in applications.resume_pdf, as before the blob store.
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.fake_supabase import FakeSupabase
+
+ROOT = Path(__file__).resolve().parents[1]
+INTERNSHIPS_PAGE = ROOT / "app" / "pages" / "5_💼Internships.py"
+
+COMPANY_SECTIONS = ["📊 Overview", "📋 My Internships", "👥 Applications"]
+
+
+def synthetic_tables(internships, applications, companies=20, students=300, resume_kb=100):
+    description = "Hands-on work on the SOC: alert triage, detection rules and incident reports. " * 20
+    resume = "\\x" + (b"%PDF-1.4 " * (resume_kb * 1024 // 9)).hex()
+    users = [{"id": f"company-{i}", "role": "company"} for i in range(companies)]
+    users += [{"id": f"student-{i}", "role": "student"} for i in range(students)]
+    return {
+        "users": users,
+        "company_profiles": [
+            {
+                "id": f"company-{i}",
+                "company_name": f"Company {i}",
+                "location": "Algiers",
+                "phone": "0550000000",
+                "description": description,
+            }
+            for i in range(companies)
+        ],
+        "student_profiles": [
+            {
+                "id": f"student-{i}",
+                "first_name": f"First{i}",
+                "last_name": f"Last{i}",
+                "university": "USTHB",
+                "major": "Cybersecurity",
+                "phone": "0660000000",
+                "bio": description,
+            }
+            for i in range(students)
+        ],
+        "internships": [
+            {
+                "id": i,
+                "company_id": f"company-{i % companies}",
+                "title": f"Security intern {i}",
+                "location": "Algiers",
+                "duration": "6 months",
+                "job_type": "on-site",
+                "salary": None,
+                "spots_available": 2,
+                "start_date": None,
+                "application_deadline": None,
+                "description": description,
+                "requirements": description,
+                "created_at": f"2025-03-{1 + i % 28:02d}T10:00:00+00:00",
+            }
+            for i in range(internships)
+        ],
+        "applications": [
+            {
+                "id": i,
+                "internship_id": (i * companies) % internships,
+                "student_id": f"student-{i % students}",
+                "status": "pending",
+                "applied_at": f"2025-03-{1 + i % 28:02d}T10:00:00+00:00",
+                "cover_letter": description,
+                "resume_pdf": resume,
+                "resume_key": None,
+            }
+            for i in range(applications)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--internships", type=int, default=200)
+    parser.add_argument("--applications", type=int, default=1000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SUPABASE_URL", "http://localhost")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    os.environ["DATA_ACCESS_STATS"] = "1"
+    os.environ["RESUME_STORE"] = "local"
+    sys.path.insert(0, str(ROOT / "app"))
+
+    import utils.db_utils as db_utils
+    import utils.queries as queries
+    from streamlit.testing.v1 import AppTest
+    from utils.applications import compute_application_counts
+
+    def application_counts_view(client):
+        counts = compute_application_counts(client.tables["applications"])
+        return [{"internship_id": internship_id, **entry} for internship_id, entry in counts.items()]
+
+    fake = FakeSupabase(
+        synthetic_tables(args.internships, args.applications), views={"application_counts": application_counts_view}
+    )
+    signed_in = SimpleNamespace(user=None)
+    fake.auth = SimpleNamespace(get_session=lambda: signed_in, sign_out=lambda: None)
+    db_utils.create_client = lambda url, key: fake
+    projected = dict(queries.QUERY_SPECS)
+
+    def render(user_id, section=None):
+        """data-access log of one render: {view: (rows, kb, ms)}"""
+        signed_in.user = SimpleNamespace(id=user_id)
+        at = AppTest.from_file(str(INTERNSHIPS_PAGE), default_timeout=120)
+        at.run()
+        if section is not None:
+            # the first run cached the company's view in the session: load it again
+            at.session_state["company_applications"] = None
+            at.session_state["application_counts"] = None
+            at.sidebar.radio[0].set_value(section).run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        # show_data_access_stats() consumed the log: read it back from the sidebar table
+        frame = at.sidebar.dataframe[0].value
+        # the rows without a payload size are the cached loaders, not portal queries
+        queried = frame.dropna(subset=["kb"])
+        return {row["call"]: (row["rows"], row["kb"], row["ms"]) for _, row in queried.iterrows()}
+
+    results = defaultdict(dict)
+    unprojected = {view: (table, ("*",)) for view, (table, _) in projected.items()}
+    for label, specs in (("before", unprojected), ("after", projected)):
+        queries.QUERY_SPECS.clear()
+        queries.QUERY_SPECS.update(specs)
+        renders = [("student", render("student-1"))]
+        renders += [(section, render("company-0", section)) for section in COMPANY_SECTIONS]
+        for page, log in renders:
+            for view, measures in log.items():
+                results[(page, view)][label] = measures
+    queries.QUERY_SPECS.clear()
+    queries.QUERY_SPECS.update(projected)
+
+    print(f"{args.internships} internships, {args.applications} applications")
+    print(f"{'page':<18} {'view':<30} {'rows':>6} {'KB before':>10} {'KB after':>9} {'ms before':>10} {'ms after':>9}")
+    for (page, view), measures in results.items():
+        if "before" not in measures or "after" not in measures:
+            continue
+        rows, kb_before, ms_before = measures["before"]
+        _, kb_after, ms_after = measures["after"]
+        print(
+            f"{page:<18} {view:<30} {rows:>6} {kb_before:>10.1f} {kb_after:>9.1f} {ms_before:>10.1f} {ms_after:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Memory and filter / groupby latency of the jobs DataFrame as the pages
+used to build it (object strings, dates parsed on each page) against the
+memory-optimized frame of type_jobs() (categoricals, Arrow urls).
+
+    python -m benchmarks.jobs_frame --sizes 100000 500000
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from app.utils.db_utils import type_jobs
+from benchmarks.load_jobs import synthetic_jobs
+
+
+def plain_frame(rows):
+    df = pd.DataFrame(rows).astype(object)
+    df["scraped_at"] = pd.to_datetime(df["scraped_at"])
+    df["date_posted"] = pd.to_datetime(df["date_posted"], errors="coerce")
+    return df
+
+
+OPERATIONS = {
+    "filter source+company": lambda df: df[(df["source"] == "Wuzzuf") & (df["company"] == "Company 42")],
+    "value_counts company": lambda df: df["company"].value_counts().head(10),
+    "groupby location": lambda df: df.groupby("location", observed=True).agg({"id": "count", "company": "nunique"}),
+    "groupby source": lambda df: df.groupby("source", observed=True).agg({"id": "count", "company": "nunique", "location": "nunique"}),
+    "sort by company": lambda df: df.sort_values("company"),
+    "unique companies": lambda df: sorted(df["company"].unique().tolist()),
+}
+
+
+def timed(func, df, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        rows = synthetic_jobs(size)
+        frames = {"object": plain_frame(rows), "optimized": type_jobs(pd.DataFrame(rows))}
+
+        print(f"\n{size:,} rows")
+        print(f"{'':<28} {'object':>10} {'optimized':>10}")
+        memory = {name: df.memory_usage(deep=True).sum() / 1e6 for name, df in frames.items()}
+        print(f"{'memory (MB)':<28} {memory['object']:>10.1f} {memory['optimized']:>10.1f}")
+        for label, func in OPERATIONS.items():
+            ms = {name: timed(func, df) for name, df in frames.items()}
+            print(f"{label + ' (ms)':<28} {ms['object']:>10.1f} {ms['optimized']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Memory and time of loading the jobs table on synthetic data: one
+select('*') response (the old load_all_jobs) against the keyset-paged
+chunk loader, with and without column projection.
+
+    python -m benchmarks.load_jobs --sizes 10000 100000 1000000
+
+The synthetic server answers keyset pages from a pre-sorted list (like an
+index on (scraped_at, id)), so the figures are the client-side cost:
+JSON decoding and DataFrame building. Each strategy runs in a forked
+process whose peak RSS growth is read from /proc (Linux only), which also
+covers the Arrow buffers pandas uses for strings.
+"""
+
+import argparse
+import bisect
+import json
+import multiprocessing
+import re
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pandas as pd
+
+from app.utils.db_utils import iter_job_chunks
+
+SOURCES = ["Emploitic", "France Travail", "Wuzzuf"]
+BROWSE_COLUMNS = ("title", "company", "location", "source", "date_posted", "url", "scraped_at")
+KEYSET = re.compile(r'scraped_at\.lt\."([^"]+)".*id\.lt\.(\d+)')
+
+
+def synthetic_jobs(size):
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "id": i,
+            "source": SOURCES[i % 3],
+            "title": f"Cybersecurity Analyst {i % 500}",
+            "company": f"Company {i % 2000}",
+            "location": f"City {i % 300}",
+            "date_posted": (start + timedelta(days=i % 365)).date().isoformat(),
+            "url": f"https://jobs.example.com/offer/{i}",
+            "scraped_at": (start + timedelta(seconds=i // 3)).isoformat(),
+        }
+        for i in range(size)
+    ]
+
+
+class KeysetJobsClient:
+    """answers select / order(scraped_at, id desc) / limit / keyset or_ queries"""
+
+    def __init__(self, rows):
+        # newest first, keys negated so bisect works on an ascending list
+        self.rows = sorted(rows, key=lambda r: (r["scraped_at"], r["id"]), reverse=True)
+        self.keys = [(-datetime.fromisoformat(r["scraped_at"]).timestamp(), -r["id"]) for r in self.rows]
+
+    def table(self, name):
+        query = SimpleNamespace(columns=None, size=None, after=None)
+        builder = SimpleNamespace()
+
+        def select(columns="*", count=None):
+            query.columns = None if columns == "*" else columns.split(",")
+            return builder
+
+        def limit(size):
+            query.size = size
+            return builder
+
+        def or_(expr):
+            scraped_at, row_id = KEYSET.search(expr).groups()
+            query.after = (-datetime.fromisoformat(scraped_at).timestamp(), -int(row_id))
+            return builder
+
+        def execute():
+            start = 0 if query.after is None else bisect.bisect_right(self.keys, query.after)
+            end = len(self.rows) if query.size is None else start + query.size
+            rows = self.rows[start:end]
+            if query.columns:
+                rows = [{c: row[c] for c in query.columns} for row in rows]
+            return SimpleNamespace(data=json.loads(json.dumps(rows)))
+
+        builder.select = select
+        builder.order = lambda column, desc=False: builder
+        builder.limit = limit
+        builder.or_ = or_
+        builder.execute = execute
+        return builder
+
+
+def _status_kb(field):
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith(field):
+                return int(line.split()[1])
+    return 0
+
+
+def _run(func, results):
+    # reset the peak RSS counter of this (forked) process
+    with open("/proc/self/clear_refs", "w") as refs:
+        refs.write("5")
+    before = _status_kb("VmRSS")
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    frame_mb = result.memory_usage(deep=True).sum() / 1e6 if isinstance(result, pd.DataFrame) else 0
+    results.put((elapsed, (_status_kb("VmHWM") - before) / 1024, frame_mb))
+
+
+def measure(func):
+    """(seconds, peak RSS growth in MB, resulting DataFrame size in MB)"""
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    process = context.Process(target=_run, args=(func, results))
+    process.start()
+    measured = results.get()
+    process.join()
+    return measured
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} {'strategy':<28} {'seconds':>8} {'peak MB':>8} {'frame MB':>9}")
+    for size in args.sizes:
+        client = KeysetJobsClient(synthetic_jobs(size))
+
+        def single_response():
+            return pd.DataFrame(client.table("jobs").select("*").execute().data)
+
+        def chunked(columns=None):
+            return pd.concat(iter_job_chunks(columns, args.chunk_size, client), ignore_index=True)
+
+        def streamed():
+            # aggregate chunk by chunk without keeping the rows
+            counts = pd.Series(dtype="int64")
+            for chunk in iter_job_chunks(("source",), args.chunk_size, client):
+                counts = counts.add(chunk["source"].value_counts(), fill_value=0)
+            return counts
+
+        strategies = [
+            ("select('*') one response", single_response),
+            ("keyset chunks, all columns", chunked),
+            ("keyset chunks, Browse cols", lambda: chunked(BROWSE_COLUMNS)),
+            ("keyset stream, source only", streamed),
+        ]
+        for label, func in strategies:
+            elapsed, peak_mb, frame_mb = measure(func)
+            print(f"{size:>9} {label:<28} {elapsed:>8.2f} {peak_mb:>8.1f} {frame_mb:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Payload of the company's Applications view with resumes stored in the
+applications rows (hex text in resume_pdf) and with resumes moved to the
+content-addressed store of app/utils/resumes.py, on synthetic PDFs.
+
+    python -m benchmarks.resume_store --applications 300 --resume-kb 200 2>/dev/null
+
+(stderr only carries Streamlit's "no runtime" warnings of a headless run)
+
+Some students send the same file to several internships: the store keeps
+one copy of each distinct resume.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.fake_supabase import FakeSupabase
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def synthetic_tables(applications, students, resume_kb):
+    # each student reuses one resume for all their applications
+    resumes = [bytes([i % 256]) * 1024 * resume_kb for i in range(students)]
+    return {
+        "internships": [{"id": 1, "company_id": "company-1", "title": "Security intern"}],
+        "applications": [
+            {
+                "id": i,
+                "internship_id": 1,
+                "student_id": f"student-{i % students}",
+                "status": "pending",
+                "applied_at": f"2025-03-{1 + i % 28:02d}T10:00:00+00:00",
+                "resume_pdf": "\\x" + resumes[i % students].hex(),
+                "resume_key": None,
+            }
+            for i in range(applications)
+        ],
+        "student_profiles": [
+            {"id": f"student-{i}", "first_name": "First", "last_name": "Last"} for i in range(students)
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--applications", type=int, default=300)
+    parser.add_argument("--students", type=int, default=100)
+    parser.add_argument("--resume-kb", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SUPABASE_URL", "http://localhost")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    sys.path.insert(0, str(ROOT / "app"))
+    import utils.queries as queries
+    from utils.applications import load_company_applications
+    from utils.resumes import LocalResumeStore, decode_legacy_resume, migrate, resume_opener
+
+    fake = FakeSupabase(synthetic_tables(args.applications, args.students, args.resume_kb))
+    store = LocalResumeStore(Path(tempfile.mkdtemp()) / "resumes")
+
+    def measure(label, columns=()):
+        table, projected = queries.QUERY_SPECS["company.applications"]
+        queries.QUERY_SPECS["company.applications"] = (table, projected + columns)
+        fake.reset_stats()
+        start = time.perf_counter()
+        view = load_company_applications(fake, "company-1")
+        openers = [resume_opener(store, app) for app in view.applications]
+        elapsed = time.perf_counter() - start
+        queries.QUERY_SPECS["company.applications"] = (table, projected)
+        print(f"{label:<22} {elapsed * 1000:>9.0f} {fake.bytes_received / 1024 ** 2:>12.1f}")
+        return view.applications, openers
+
+    print(f"{args.applications} applications from {args.students} students, {args.resume_kb} KB resumes")
+    print(f"{'':<22} {'load ms':>9} {'payload MB':>12}")
+    # the view read the resumes of the rows along with the applications
+    inline = {row["id"]: decode_legacy_resume(row["resume_pdf"]) for row in fake.tables["applications"]}
+    measure("resumes in the rows", ("resume_pdf",))
+
+    moved, stored = migrate(fake, store)
+    stored_mb = sum(f.stat().st_size for f in store.path.rglob("*.pdf")) / 1024 ** 2
+    applications, keyed = measure("resumes in the store")
+    print(f"\n{moved} resumes moved, {stored} distinct files stored ({stored_mb:.1f} MB)")
+
+    # a download reads one resume, only when it is clicked
+    start = time.perf_counter()
+    data = keyed[0]()
+    print(f"one download: {len(data) / 1024:.0f} KB in {(time.perf_counter() - start) * 1000:.1f} ms")
+    assert data == inline[applications[0]["id"]]
+
+
+if __name__ == "__main__":
+    main()
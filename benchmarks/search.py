@@ -0,0 +1,108 @@
+"""
+Full-text search latency of the SearchIndex against a substring scan of
+the normalized text (what a page without an index would do), on a
+synthetic French / English / Arabic job corpus.
+
+    python -m benchmarks.search --size 1000000
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+import pandas as pd
+
+from app.utils.search import SearchIndex, normalize
+
+TITLE_WORDS = [
+    "Ingénieur", "Analyste", "Consultant", "Architecte", "Responsable", "Technicien",
+    "Security", "Sécurité", "Cybersécurité", "SOC", "Pentester", "Cloud", "Réseau",
+    "Network", "DevSecOps", "Forensic", "GRC", "Engineer", "Analyst", "Manager",
+    "Junior", "Senior", "Lead", "Stagiaire", "Alternance", "Systèmes", "Données",
+    "مهندس", "أمن", "المعلومات", "محلل", "الشبكات", "مُطوِّر", "السيبراني",
+]
+CITIES = [
+    "Paris", "Lyon", "Marseille", "Toulouse", "Île-de-France", "Alger", "Oran",
+    "Constantine", "Le Caire", "الجزائر", "وهران", "Cairo", "Giza", "Remote",
+]
+QUERIES = [
+    "securite",          # common word, accent-insensitive
+    "cyber",             # prefix of a common word
+    "ingenieur reseau",  # two words
+    "analyst paris",     # title + location
+    "company 1234",      # company name
+    "امن المعلومات",      # Arabic, without hamza
+    "soc senior lyon",   # three words
+    "forens",            # prefix of a rare-ish word
+]
+
+
+def synthetic_corpus(size, seed=0):
+    rng = random.Random(seed)
+    return pd.DataFrame(
+        {
+            "id": range(size),
+            "title": [" ".join(rng.sample(TITLE_WORDS, rng.randint(2, 5))) for _ in range(size)],
+            "company": [f"Company {rng.randrange(20_000)}" for _ in range(size)],
+            "location": [rng.choice(CITIES) for _ in range(size)],
+        }
+    )
+
+
+def scan(normalized, query):
+    mask = None
+    for word in normalize(query).split():
+        found = normalized.str.contains(word, regex=False)
+        mask = found if mask is None else mask & found
+    return normalized.index[mask]
+
+
+def timings(func, queries, repeat=3):
+    result = {}
+    for query in queries:
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            matches = func(query)
+            samples.append((time.perf_counter() - start) * 1000)
+        result[query] = (statistics.median(samples), len(matches))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=20, help="results kept by the index query")
+    args = parser.parse_args()
+
+    df = synthetic_corpus(args.size)
+
+    index = SearchIndex()
+    start = time.perf_counter()
+    index.add_frame(df)
+    build = time.perf_counter() - start
+
+    # incremental update: one scraper run worth of new rows
+    delta = synthetic_corpus(1_000, seed=1).assign(id=lambda d: d["id"] + args.size)
+    start = time.perf_counter()
+    index.add_frame(delta)
+    update = time.perf_counter() - start
+
+    normalized = (df["title"] + " " + df["company"] + " " + df["location"]).map(normalize)
+
+    print(f"{args.size:,} jobs, {len(index.vocabulary):,} distinct tokens")
+    print(f"index build {build:.1f}s, +1,000 rows {update * 1000:.0f} ms")
+    print(f"\n{'query':<22} {'matches':>9} {'index (ms)':>11} {'top-k (ms)':>11} {'scan (ms)':>10}")
+    indexed = timings(index.search, QUERIES)
+    top_k = timings(lambda q: index.search(q, limit=args.limit), QUERIES)
+    scanned = timings(lambda q: scan(normalized, q), QUERIES, repeat=1)
+    for query in QUERIES:
+        print(
+            f"{query:<22} {indexed[query][1]:>9,} {indexed[query][0]:>11.1f} "
+            f"{top_k[query][0]:>11.1f} {scanned[query][0]:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Count the WebDriver commands needed to extract one France Travail result
+page with the per-element extraction and with the single execute_script.
+
+    python -m benchmarks.webdriver_commands [--pages 3]
+"""
+
+import argparse
+import time
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from scrapers.FranceTravail import PAGE_SIZE, build_search_url, extract_offers
+from scrapers.driver import CommandCounter, create_driver
+from scrapers.driver_pool import driver_path
+
+
+def measure(driver, mode):
+    with CommandCounter(driver) as counter:
+        start = time.perf_counter()
+        offers = extract_offers(driver, 0, mode)
+        elapsed = time.perf_counter() - start
+    return len(offers), counter.total, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=3)
+    args = parser.parse_args()
+
+    driver = create_driver(driver_path(), headless=True)
+    rows = []
+    try:
+        for page in range(args.pages):
+            driver.get(build_search_url(start=page * PAGE_SIZE))
+            WebDriverWait(driver, 10).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.result"))
+            )
+            for mode in ("webdriver", "js"):
+                rows.append((page + 1, mode) + measure(driver, mode))
+    finally:
+        driver.quit()
+
+    print(f"\n{'page':>4} {'mode':>10} {'cards':>6} {'commands':>9} {'ms':>8}")
+    for page, mode, cards, commands, elapsed in rows:
+        print(f"{page:>4} {mode:>10} {cards:>6} {commands:>9} {elapsed * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,178 @@
 import os
+import time
+from datetime import datetime, timedelta, timezone
 from supabase import create_client
 from dotenv import load_dotenv
+from database.identity import IDENTITY_FIELDS, DedupIndex, canonical_url, identify, iter_rows
 
 load_dotenv()
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
 
-# create Supabase client 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+_client = None
+
+
+def get_client():
+    """Supabase client of the scrapers, created on first use"""
+    global _client
+    if _client is None:
+        _client = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _client
+
+# columns of the jobs table filled by the scrapers
+JOB_FIELDS = ("source", "title", "company", "location", "date_posted", "url")
+
+
+# near-duplicates are looked for among the jobs scraped in this many days
+DEDUP_WINDOW_DAYS = 60
+
+
+def normalize_job(job_data):
+    """keep only the jobs table columns, serialize dates to ISO strings and canonicalize the url"""
+    data = {field: job_data.get(field) for field in JOB_FIELDS}
+    if hasattr(data["date_posted"], "isoformat"):
+        data["date_posted"] = data["date_posted"].isoformat()
+    data["url"] = canonical_url(data["url"])
+    return data
+
 
 #insert a job record into the database
 def insert_job(job_data):
-    data = {
-        "source": job_data["source"],
-        "title": job_data["title"],
-        "company": job_data["company"],
-        "location": job_data["location"],
-        "date_posted": job_data["date_posted"],
-        "url": job_data["url"]
-    }
-
-    supabase.table("jobs").insert(data).execute()
-
-  
+    get_client().table("jobs").insert(normalize_job(job_data)).execute()
+
+
+def load_dedup_index(client=None, table="jobs", verbose=True):
+    """DedupIndex of the clusters of the last DEDUP_WINDOW_DAYS days, None without the identity columns"""
+    client = client or get_client()
+    try:
+        client.table(table).select(",".join(IDENTITY_FIELDS)).limit(1).execute()
+    except Exception:
+        if verbose:
+            print("ℹ️ No identity columns (database/sql/job_identity.sql), jobs are not deduplicated")
+        return None
+
+    index = DedupIndex()
+    since = (datetime.now(timezone.utc) - timedelta(days=DEDUP_WINDOW_DAYS)).isoformat()
+    columns = "id,title,company,location,fingerprint,cluster_id"
+    for row in iter_rows(client, columns, table, since=since):
+        if row.get("cluster_id"):
+            index.add(row, row["cluster_id"])
+    return index
+
+
+class JobWriter:
+    """Buffer scraped jobs and write them to Supabase in bulk upserts.
+
+    Rows are flushed when the buffer reaches `batch_size` rows or when
+    `flush_interval` seconds have passed since the last flush, and always
+    when the `with` block exits (normally or on error). Upserts use the
+    `url` column as conflict target, so offers already in the table are
+    counted as skipped instead of raising a duplicate key error.
+
+    With `identify` (and the columns of database/sql/job_identity.sql),
+    rows also get their job_key, fingerprint and near-duplicate cluster_id;
+    the clusters of the jobs of the last DEDUP_WINDOW_DAYS days are read
+    once, on the first flush, unless a `dedup` index is given: the writers
+    of concurrent scrapers share one (load_dedup_index()), so the same
+    offer found on two boards in one run joins one cluster.
+
+        with JobWriter(batch_size=200) as writer:
+            for job in jobs:
+                writer.add(job)
+    """
+
+    def __init__(
+        self, batch_size=100, flush_interval=10.0, table="jobs", client=None, verbose=True, identify=True, dedup=None
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.table = table
+        self.client = client or get_client()
+        self.verbose = verbose
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.totals = {"written": 0, "skipped": 0, "failed": 0}
+        self.identify = identify
+        self.dedup = dedup
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
+        return False
+
+    def add(self, job_data):
+        """queue one job, flushing if the batch is full or too old"""
+        self.buffer.append(normalize_job(job_data))
+        if (
+            len(self.buffer) >= self.batch_size
+            or time.monotonic() - self.last_flush >= self.flush_interval
+        ):
+            return self.flush()
+        return None
+
+    def flush(self):
+        """write the buffered rows and return a {written, skipped, failed} report"""
+        batch, self.buffer = self.buffer, []
+        self.last_flush = time.monotonic()
+        report = {"written": 0, "skipped": 0, "failed": 0}
+        if not batch:
+            return report
+
+        # the same url twice in one upsert statement is rejected by Postgres
+        unique_rows = {}
+        for row in batch:
+            unique_rows.setdefault(row["url"], row)
+        rows = list(unique_rows.values())
+        report["skipped"] = len(batch) - len(rows)
+
+        if self.identify and self._load_dedup():
+            for row in rows:
+                row.update(identify(row, self.dedup))
+
+        self._upsert(rows, report)
+
+        for key in self.totals:
+            self.totals[key] += report[key]
+        if self.verbose:
+            print(
+                f"💾 Flush: {report['written']} written, "
+                f"{report['skipped']} skipped, {report['failed']} failed"
+            )
+        return report
+
+    def _load_dedup(self):
+        """index the recent clusters, False when the identity columns are missing"""
+        if self.dedup is not None:
+            return True
+        self.dedup = load_dedup_index(self.client, self.table, self.verbose)
+        if self.dedup is None:
+            self.identify = False
+            return False
+        return True
+
+    def _upsert(self, rows, report):
+        try:
+            response = (
+                self.client.table(self.table)
+                .upsert(rows, on_conflict="url", ignore_duplicates=True)
+                .execute()
+            )
+        except Exception as e:
+            # split the batch to isolate the rows the database refuses
+            if len(rows) > 1:
+                middle = len(rows) // 2
+                self._upsert(rows[:middle], report)
+                self._upsert(rows[middle:], report)
+            else:
+                report["failed"] += 1
+                if self.verbose:
+                    print(f"❌ Write error ({rows[0]['url']}): {e}")
+            return
+
+        # with ignore_duplicates only the newly inserted rows are returned
+        written = len(response.data or [])
+        report["written"] += written
+        report["skipped"] += len(rows) - written
@@ -0,0 +1,335 @@
+"""
+Job identity and near-duplicate detection for the ingest path.
+
+The same offer often reaches the table several times: with tracking
+parameters in its url, or published on several job boards. Each job gets
+
+    job_key      hash of its canonical url (stable id of the offer)
+    fingerprint  hash of its normalized title + company + location
+    cluster_id   job_key of the first job of its near-duplicate cluster
+
+Near-duplicates are found with MinHash signatures of the character
+3-grams of the normalized text and LSH buckets: a new job is only compared
+with the jobs sharing at least one band of its signature, never with the
+whole table. Candidates must then have similar titles (with the same
+numbers) and companies and a location word in common: the same title in
+two cities is two offers.
+
+Fill the columns of the rows scraped before database/sql/job_identity.sql
+was installed (and store their urls canonicalized, like the new rows) with:
+
+    python -m database.identity --backfill
+
+The backfill updates rows in place, which the delta sync of the app's
+local copy of the table can't see: it deletes that copy, and a running
+app downloads the table again on its next sync.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+# query parameters that only track where a click came from
+TRACKING_PARAMS = {"fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "xtor", "at_medium", "at_campaign"}
+TRACKING_PREFIXES = ("utm_",)
+
+# search context appended by a job board to the offers of a result list
+BOARD_TRACKING_PARAMS = {
+    "wuzzuf.net": {"o", "l", "t", "a", "s"},
+}
+
+# gender markers of the French offers: "Ingénieur sécurité H/F"
+GENDER_MARKERS = re.compile(r"\b(h\s*/\s*f|f\s*/\s*h|m\s*/\s*f|f\s*/\s*m)\b")
+# legal forms that boards add to or drop from company names: "Thales SA"
+LEGAL_FORMS = re.compile(r"\b(sa|sas|sasu|sarl|eurl|spa|llc|ltd|inc|gmbh|plc)\b")
+NON_WORD = re.compile(r"[^\w]+")
+
+IDENTITY_FIELDS = ("job_key", "fingerprint", "cluster_id")
+
+# local copy of the jobs table kept by the app (app/utils/jobs_cache.py)
+JOBS_CACHE_PATH = Path(__file__).resolve().parents[1] / ".cache" / "jobs.parquet"
+
+
+def canonical_url(url):
+    """url without tracking parameters, fragment, default port, www. or trailing slash"""
+    if not url or url == "#":
+        return url
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    dropped = BOARD_TRACKING_PARAMS.get(host, set())
+    query = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS
+        and not name.lower().startswith(TRACKING_PREFIXES)
+        and name not in dropped
+    )
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/") or "/"
+    # http and https links point to the same offer
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def _digest(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def job_key(job):
+    return _digest(canonical_url(job.get("url")) or "")
+
+
+def normalize_text(text):
+    """lowercase words without accents, punctuation or gender markers"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(char for char in text if not unicodedata.combining(char)).casefold()
+    text = GENDER_MARKERS.sub(" ", text)
+    return NON_WORD.sub(" ", text).strip()
+
+
+def content_fields(job):
+    title, company, location = (normalize_text(job.get(field)) for field in ("title", "company", "location"))
+    company = " ".join(LEGAL_FORMS.sub(" ", company).split()) or company
+    return title, company, location
+
+
+def content_text(job):
+    return " | ".join(content_fields(job))
+
+
+def shingles(text):
+    return {text[i:i + 3] for i in range(max(len(text) - 2, 1))}
+
+
+def numbered_words(text):
+    return {word for word in text.split() if any(char.isdigit() for char in word)}
+
+
+def jaccard(a, b):
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def fingerprint(job):
+    return _digest(content_text(job))
+
+
+class MinHasher:
+    """MinHash signatures of the character 3-grams of a text."""
+
+    def __init__(self, num_perm=64, seed=1):
+        rng = np.random.default_rng(seed)
+        # multiply-shift hashing: (a * x + b) mod 2**64, high 32 bits, with odd a
+        self.a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+
+    def signature(self, text):
+        # blake2b rather than hash(), whose values change between runs
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=4).digest(), "big") for s in shingles(text)),
+            dtype=np.uint64,
+        )
+        permuted = (np.outer(hashes, self.a) + self.b) >> np.uint64(32)
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+class DedupIndex:
+    """Assigns each job to a cluster of near-duplicates (LSH over MinHash).
+
+    Two jobs join the same cluster when their normalized content is equal,
+    or when the Jaccard similarity of the 3-grams of their titles and of
+    their companies reaches `threshold` and their locations share a word.
+    The cluster id is the job_key of its first job, so it does not change
+    when more duplicates arrive. One index can be shared by the writers of
+    concurrent scrapers: add() and assign() hold its lock.
+    """
+
+    def __init__(self, num_perm=64, bands=8, threshold=0.7):
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.by_fingerprint = {}  # fingerprint -> cluster id
+        self.buckets = {}  # (band, band values) -> entries
+        self.fields = []  # entry -> normalized (title, company, location)
+        self.clusters = []  # entry -> cluster id
+        self.comparisons = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.by_fingerprint)
+
+    def add(self, job, cluster_id):
+        """register a job whose cluster is already known (rows read back from the table)"""
+        fp = job.get("fingerprint") or fingerprint(job)
+        with self.lock:
+            if fp not in self.by_fingerprint:
+                self.by_fingerprint[fp] = cluster_id
+                self._insert(content_fields(job), cluster_id)
+
+    def assign(self, job, key=None):
+        """cluster id of `job`, which joins the index"""
+        fp = job.get("fingerprint") or fingerprint(job)
+        with self.lock:
+            if fp in self.by_fingerprint:
+                return self.by_fingerprint[fp]
+
+        # the signature is computed outside the lock, the other writers keep going
+        fields = content_fields(job)
+        band_keys = list(self._band_keys(fields))
+        with self.lock:
+            if fp in self.by_fingerprint:
+                # added meanwhile by another writer
+                return self.by_fingerprint[fp]
+
+            candidates = set()
+            for band_key in band_keys:
+                candidates.update(self.buckets.get(band_key, ()))
+
+            cluster_id, best = None, 0.0
+            for entry in candidates:
+                self.comparisons += 1
+                similarity = self.similarity(fields, self.fields[entry])
+                if similarity > best:
+                    cluster_id, best = self.clusters[entry], similarity
+
+            cluster_id = cluster_id or key or job_key(job)
+            self.by_fingerprint[fp] = cluster_id
+            self._insert(fields, cluster_id, band_keys)
+            return cluster_id
+
+    def similarity(self, a, b):
+        """title similarity of two near-duplicates, 0 when they are different offers"""
+        (title_a, company_a, location_a), (title_b, company_b, location_b) = a, b
+        if location_a and location_b and not set(location_a.split()) & set(location_b.split()):
+            return 0.0
+        if jaccard(shingles(company_a), shingles(company_b)) < self.threshold:
+            return 0.0
+        # "Analyste SOC N1" and "Analyste SOC N2" are different positions
+        if numbered_words(title_a) != numbered_words(title_b):
+            return 0.0
+        title = jaccard(shingles(title_a), shingles(title_b))
+        return title if title >= self.threshold else 0.0
+
+    def _band_keys(self, fields):
+        signature = self.hasher.signature(" | ".join(fields))
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _insert(self, fields, cluster_id, band_keys=None):
+        entry = len(self.fields)
+        self.fields.append(fields)
+        self.clusters.append(cluster_id)
+        for band_key in band_keys or self._band_keys(fields):
+            self.buckets.setdefault(band_key, []).append(entry)
+
+
+def identify(job, index=None):
+    """job_key, fingerprint and (with a DedupIndex) cluster_id of a job"""
+    identity = {"job_key": job_key(job), "fingerprint": fingerprint(job)}
+    if index is not None:
+        identity["cluster_id"] = index.assign({**job, **identity}, identity["job_key"])
+    return identity
+
+
+def iter_rows(client, columns, table="jobs", chunk_size=1000, since=None, after_id=None):
+    """rows of the table in insertion order (keyset on id)
+
+    Optionally only the rows scraped after `since` or with an id above `after_id`.
+    """
+    last_id = after_id
+    while True:
+        query = client.table(table).select(columns).order("id").limit(chunk_size)
+        if since is not None:
+            query = query.gte("scraped_at", since)
+        if last_id is not None:
+            query = query.gt("id", last_id)
+        rows = query.execute().data
+        if not rows:
+            return
+        yield from rows
+        last_id = rows[-1]["id"]
+        if len(rows) < chunk_size:
+            return
+
+
+def update_identity(client, table, row, changes):
+    """write the identity of one row, True when its canonical url could be stored too
+
+    The canonical url can already belong to another row (the same offer
+    saved twice with different tracking parameters): that row keeps its url.
+    """
+    if "url" in changes:
+        try:
+            client.table(table).update(changes).eq("id", row["id"]).execute()
+            return True
+        except Exception:
+            changes = {key: value for key, value in changes.items() if key != "url"}
+    client.table(table).update(changes).eq("id", row["id"]).execute()
+    return False
+
+
+def drop_jobs_cache(path=None):
+    """delete the app's local copy of the table, which only syncs the new rows"""
+    path = Path(path or os.getenv("JOBS_CACHE_PATH") or JOBS_CACHE_PATH)
+    if path.exists():
+        path.unlink()
+        print(f"🗑️ {path} deleted: the app downloads the table again")
+
+
+def backfill(client, table="jobs", progress_every=500):
+    """fill the identity columns of the rows that don't have them, oldest first
+
+    Rows are updated one by one (update().eq("id")): an upsert of the
+    identity columns alone would insert rows missing the other columns.
+    Their urls are canonicalized as well, so the scrapers' upserts on `url`
+    match them. Returns the number of rows updated.
+    """
+    index = DedupIndex()
+    updated = duplicates = 0
+    for row in iter_rows(client, "id,url,title,company,location,job_key,cluster_id", table):
+        if row.get("cluster_id"):
+            index.add(row, row["cluster_id"])
+            continue
+        changes = identify(row, index)
+        url = canonical_url(row["url"])
+        if url != row["url"]:
+            changes["url"] = url
+        if not update_identity(client, table, row, changes):
+            duplicates += "url" in changes
+        updated += 1
+        if updated % progress_every == 0:
+            print(f"🔑 {updated} jobs identified")
+    if duplicates:
+        print(f"ℹ️ {duplicates} urls kept as they were: their canonical url belongs to another row")
+    print(f"Backfill done: {updated} jobs, {len(set(index.clusters))} clusters")
+    if updated:
+        drop_jobs_cache()
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job identity columns")
+    parser.add_argument("--backfill", action="store_true", help="fill job_key / fingerprint / cluster_id")
+    args = parser.parse_args()
+    if args.backfill:
+        from database.db import get_client
+
+        backfill(get_client())
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
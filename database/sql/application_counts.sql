@@ -0,0 +1,20 @@
+-- Applications per internship, with their breakdown by status, in one request:
+--   select * from application_counts where internship_id in (...);
+-- returns one row per internship that received applications:
+--   internship_id, total, pending, reviewed, accepted, rejected, withdrawn
+-- security_invoker (Postgres 15+) applies the row-level security of
+-- `applications` to the caller, so a company only counts its own applications.
+create or replace view application_counts
+with (security_invoker = true)
+as
+  select internship_id,
+         count(*) as total,
+         count(*) filter (where status = 'pending') as pending,
+         count(*) filter (where status = 'reviewed') as reviewed,
+         count(*) filter (where status = 'accepted') as accepted,
+         count(*) filter (where status = 'rejected') as rejected,
+         count(*) filter (where status = 'withdrawn') as withdrawn
+    from applications
+   group by internship_id;
+
+grant select on application_counts to authenticated;
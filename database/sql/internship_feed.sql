@@ -0,0 +1,9 @@
+-- Keyset pages of the student internship feed (app/utils/internship_feed.py):
+--   select ... from internships
+--    where [job_type = ...] [and location = ...]
+--      and (created_at < :created_at or (created_at = :created_at and id < :id))
+--    order by created_at desc, id desc limit :page_size + 1;
+-- each page is read from the index, however deep the student goes.
+create index if not exists internships_feed_idx on internships (created_at desc, id desc);
+create index if not exists internships_job_type_feed_idx on internships (job_type, created_at desc, id desc);
+create index if not exists internships_location_feed_idx on internships (location, created_at desc, id desc);
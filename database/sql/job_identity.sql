@@ -0,0 +1,11 @@
+-- Identity columns filled by the scrapers (database/identity.py):
+--   job_key      hash of the canonical url, stable id of an offer
+--   fingerprint  hash of the normalized title + company + location
+--   cluster_id   job_key of the first job of its near-duplicate cluster
+-- Fill the rows scraped before with:  python -m database.identity --backfill
+alter table jobs add column if not exists job_key text;
+alter table jobs add column if not exists fingerprint text;
+alter table jobs add column if not exists cluster_id text;
+
+create index if not exists jobs_job_key_idx on jobs (job_key);
+create index if not exists jobs_cluster_id_idx on jobs (cluster_id);
@@ -0,0 +1,36 @@
+-- Job statistics computed in one round trip, optionally for a filtered subset:
+--   select job_statistics();
+--   select job_statistics(p_source => 'Wuzzuf', p_company => null, p_location => null);
+-- returns {"total_jobs", "sources", "companies", "locations", "per_source": {source: count}}
+drop function if exists job_statistics();
+
+create or replace function job_statistics(
+  p_source text default null,
+  p_company text default null,
+  p_location text default null
+)
+returns json
+language sql
+stable
+as $$
+  with filtered as (
+    select source, company, location
+      from jobs
+     where (p_source is null or source = p_source)
+       and (p_company is null or company = p_company)
+       and (p_location is null or location = p_location)
+  )
+  select json_build_object(
+    'total_jobs', (select count(*) from filtered),
+    'sources', (select count(distinct source) from filtered),
+    'companies', (select count(distinct company) from filtered),
+    'locations', (select count(distinct location) from filtered),
+    'per_source', coalesce(
+      (select json_object_agg(source, total)
+         from (select source, count(*) as total from filtered group by source) as counts),
+      '{}'::json
+    )
+  );
+$$;
+
+grant execute on function job_statistics(text, text, text) to anon, authenticated;
@@ -0,0 +1,31 @@
+-- Resumes stored once by content in the private `resumes` Storage bucket:
+-- applications.resume_key is the SHA-256 (hex) of the PDF, stored at
+-- resumes/<first 2 hex chars>/<key>.pdf. The old resume_pdf column is kept
+-- for the rows not migrated yet:
+--   cd app && python -m utils.resumes --migrate
+alter table applications add column if not exists resume_key text;
+
+insert into storage.buckets (id, name, public)
+values ('resumes', 'resumes', false)
+on conflict (id) do nothing;
+
+-- students upload resumes; an object is never replaced (same key = same bytes)
+drop policy if exists "students upload resumes" on storage.objects;
+create policy "students upload resumes"
+  on storage.objects for insert to authenticated
+  with check (bucket_id = 'resumes');
+
+-- a stored resume is readable by its applicant and by the companies it was sent to
+drop policy if exists "applicants and companies read resumes" on storage.objects;
+create policy "applicants and companies read resumes"
+  on storage.objects for select to authenticated
+  using (
+    bucket_id = 'resumes'
+    and exists (
+      select 1
+        from applications a
+        join internships i on i.id = a.internship_id
+       where a.resume_key = split_part(storage.filename(name), '.', 1)
+         and (a.student_id = auth.uid() or i.company_id = auth.uid())
+    )
+  );
@@ -4,15 +4,15 @@ taper des choses, cliquer, lire du texte, naviguer,
 comme le ferait un humain.
 """
 
-import time
+import argparse
+import queue
+import threading
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from urllib.parse import urljoin
-from selenium import webdriver
+from urllib.parse import urlencode, urljoin, urlsplit
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import sys
@@ -20,10 +20,22 @@ import os
 
 # --- Import de la base de données ---
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from database.db import insert_job
-from webdriver_manager.chrome import ChromeDriverManager
+from database.db import JobWriter
+from scrapers.base import BaseScraper, register
+from scrapers.driver_pool import DriverPool, get_pool
+from scrapers.runner import run_scrapers
+from scrapers.seen import STOP_AFTER_KNOWN
+from scrapers.waits import PACING, SmartWaits
 
 BASE = "https://candidat.francetravail.fr"
+HOST = urlsplit(BASE).hostname
+MOTS_CLES = "cyber securite"
+
+# Nombre d'offres par page de résultats (bouton "Afficher les 20 offres suivantes")
+PAGE_SIZE = 20
+
+# pages en erreur d'affilée (ou tranches en erreur par lieu) avant d'abandonner
+MAX_ECHECS = 3
 
 
 def normalize_text(s):
@@ -31,84 +43,91 @@ def normalize_text(s):
     return s.strip().replace("\n", " ").replace("\r", " ") if s else "—"
 
 
-def extract_from_card(card):
-    """Extrait Titre / Entreprise / Lieu / Date / Lien depuis une carte d'offre France Travail."""
+MOIS_FR = {
+    "janvier": 1,
+    "février": 2,
+    "mars": 3,
+    "avril": 4,
+    "mai": 5,
+    "juin": 6,
+    "juillet": 7,
+    "août": 8,
+    "septembre": 9,
+    "octobre": 10,
+    "novembre": 11,
+    "décembre": 12,
+}
+
+# Lit toutes les cartes li.result (à partir de arguments[0]) en un seul appel WebDriver
+CARDS_JS = """
+const text = (el) => (el ? el.innerText : null);
+return Array.from(document.querySelectorAll('li.result')).slice(arguments[0]).map((card) => {
+    const subtext = card.querySelector('p.subtext');
+    const spans = subtext ? subtext.querySelectorAll('span') : [];
+    const link = card.querySelector('a.media.with-fav');
+    return {
+        title: text(card.querySelector('span.media-heading-title')),
+        subtext: text(subtext),
+        last_span: spans.length ? spans[spans.length - 1].innerText : null,
+        date: text(card.querySelector('p.date')),
+        href: link ? link.getAttribute('href') : null,
+    };
+});
+"""
 
-    # --- Titre ---
-    try:
-        title = normalize_text(
-            card.find_element(By.CSS_SELECTOR, "span.media-heading-title").text
-        )
-    except Exception:
-        title = "—"
 
-    # --- Entreprise + Lieu ---
-    try:
-        subtext = card.find_element(By.CSS_SELECTOR, "p.subtext")
-        spans = subtext.find_elements(By.TAG_NAME, "span")
-        if spans:
-            location_text = normalize_text(spans[-1].text)
-            location = re.sub(r"^\d+\s*-*\s*", "", location_text).strip()
-            full_text = normalize_text(subtext.text)
-            company_part = full_text.replace(spans[-1].text, "").strip(" -\u00a0")
-            company = company_part if company_part else "—"
-        else:
-            full_text = normalize_text(subtext.text)
-            company = full_text if full_text else "—"
-            location = "—"
-    except Exception:
+def parse_date(date_texte):
+    """Convertit "aujourd'hui", "hier", "il y a N jours" ou "12 mars 2025" en date."""
+    date_texte = normalize_text(date_texte.lower())
+    aujourd_hui = datetime.now().date()
+    if "aujourd" in date_texte:
+        return aujourd_hui
+    if "hier" in date_texte:
+        return aujourd_hui - timedelta(days=1)
+    if "il y a" in date_texte:
+        match = re.search(r"il y a (\d+)", date_texte)
+        if match:
+            return aujourd_hui - timedelta(days=int(match.group(1)))
+        return None
+    match = re.search(r"(\d{1,2}) ([a-zéû]+) (\d{4})", date_texte)
+    if match:
+        jour = int(match.group(1))
+        mois = MOIS_FR.get(match.group(2), 1)
+        annee = int(match.group(3))
+        return datetime(annee, mois, jour).date()
+    return aujourd_hui
+
+
+def split_company_location(subtext, last_span):
+    """Sépare "Entreprise - 75 - Paris" en entreprise et lieu (le lieu est le dernier span)."""
+    full_text = normalize_text(subtext)
+    if last_span is None:
+        return (full_text if full_text else "—"), "—"
+    location_text = normalize_text(last_span)
+    location = re.sub(r"^\d+\s*-*\s*", "", location_text).strip()
+    company_part = full_text.replace(last_span, "").strip(" -\u00a0")
+    return (company_part if company_part else "—"), location
+
+
+def build_offer(raw):
+    """Post-traitement Python commun aux deux modes d'extraction.
+
+    `raw` contient les textes bruts d'une carte : title, subtext, last_span,
+    date et href (None quand l'élément est absent).
+    """
+    title = normalize_text(raw["title"]) if raw["title"] is not None else "—"
+
+    if raw["subtext"] is not None:
+        company, location = split_company_location(raw["subtext"], raw["last_span"])
+    else:
         company, location = "—", "—"
 
-    # --- Date ---
-    date_posted = None
     try:
-        date_texte = normalize_text(
-            card.find_element(By.CSS_SELECTOR, "p.date").text.lower()
-        )
-        aujourd_hui = datetime.now().date()
-        if "aujourd" in date_texte:
-            date_posted = aujourd_hui
-        elif "hier" in date_texte:
-            date_posted = aujourd_hui - timedelta(days=1)
-        elif "il y a" in date_texte:
-            match = re.search(r"il y a (\d+)", date_texte)
-            if match:
-                jours = int(match.group(1))
-                date_posted = aujourd_hui - timedelta(days=jours)
-        else:
-            match = re.search(r"(\d{1,2}) ([a-zéû]+) (\d{4})", date_texte)
-            if match:
-                mois_fr = {
-                    "janvier": 1,
-                    "février": 2,
-                    "mars": 3,
-                    "avril": 4,
-                    "mai": 5,
-                    "juin": 6,
-                    "juillet": 7,
-                    "août": 8,
-                    "septembre": 9,
-                    "octobre": 10,
-                    "novembre": 11,
-                    "décembre": 12,
-                }
-                jour = int(match.group(1))
-                mois = mois_fr.get(match.group(2), 1)
-                annee = int(match.group(3))
-                date_posted = datetime(annee, mois, jour).date()
-            else:
-                date_posted = aujourd_hui
+        date_posted = parse_date(raw["date"]) if raw["date"] is not None else None
     except Exception:
         date_posted = None
 
-    # --- URL ---
-    try:
-        first_link = card.find_element(By.CSS_SELECTOR, "a.media.with-fav")
-        href = first_link.get_attribute("href")
-        url = urljoin(BASE, href) if href else "—"
-    except Exception as e:
-        url = "—"
-        print("⚠️ Erreur URL:", e)
+    url = offer_url(raw)
 
     # --- Affichage dans le terminal ---
     print("\n🟢 Nouvelle offre détectée :")
@@ -130,61 +149,286 @@ def extract_from_card(card):
     }
 
 
-def main():
-    print("===  Récupération des offres en Cyber Sécurité... ===")
+def read_card(card):
+    """Textes bruts Titre / Entreprise / Lieu / Date / Lien d'une carte d'offre France Travail.
 
-    options = Options()
-    # options.add_argument("--headless=new")  # Active le mode sans interface si besoin
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--window-size=1600,1000")
+    Mode historique : un appel WebDriver par élément lu.
+    """
+    raw = {"title": None, "subtext": None, "last_span": None, "date": None, "href": None}
 
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    wait = WebDriverWait(driver, 10)
+    # --- Titre ---
+    try:
+        raw["title"] = card.find_element(By.CSS_SELECTOR, "span.media-heading-title").text
+    except Exception:
+        pass
 
+    # --- Entreprise + Lieu ---
     try:
-        url = "https://candidat.francetravail.fr/offres/recherche?motsCles=cyber+securite&offresPartenaires=true&tri=0"
-        driver.get(url)
+        subtext = card.find_element(By.CSS_SELECTOR, "p.subtext")
+        spans = subtext.find_elements(By.TAG_NAME, "span")
+        raw["subtext"] = subtext.text
+        raw["last_span"] = spans[-1].text if spans else None
+    except Exception:
+        pass
 
-        wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.result")))
+    # --- Date ---
+    try:
+        raw["date"] = card.find_element(By.CSS_SELECTOR, "p.date").text
+    except Exception:
+        pass
+
+    # --- URL ---
+    try:
+        first_link = card.find_element(By.CSS_SELECTOR, "a.media.with-fav")
+        raw["href"] = first_link.get_attribute("href")
+    except Exception as e:
+        print("⚠️ Erreur URL:", e)
 
-        offres = []
-        page = 1
+    return raw
 
-        while True:
-            print(f"\n===  Lecture des offres (page {page}) ===")
-            time.sleep(2)
 
-            cards = driver.find_elements(By.CSS_SELECTOR, "li.result")
-            print(f"→ {len(cards)} offres visibles actuellement.")
+def read_cards(driver, start=0, mode="js"):
+    """Textes bruts des cartes de la page à partir de la carte `start`.
 
-            for card in cards[len(offres) :]:
-                offre = extract_from_card(card)
+    mode "js" : une seule commande WebDriver pour toute la page ;
+    mode "webdriver" : lecture élément par élément (5 à 8 commandes par carte).
+    """
+    if mode == "js":
+        return driver.execute_script(CARDS_JS, start)
+    cards = driver.find_elements(By.CSS_SELECTOR, "li.result")[start:]
+    return [read_card(card) for card in cards]
 
-                # Conversion date -> string
-                if offre["date_posted"]:
-                    offre["date_posted"] = offre["date_posted"].isoformat()
-                else:
-                    offre["date_posted"] = datetime.now().date().isoformat()
 
-                offres.append(offre)
+def offer_url(raw):
+    return urljoin(BASE, raw["href"]) if raw["href"] else "—"
+
+
+def build_search_url(mots_cles=MOTS_CLES, start=0, lieu=None):
+    """URL d'une tranche de résultats : offres start..start+19, éventuellement pour un lieu (ex: 75D)."""
+    params = {
+        "motsCles": mots_cles,
+        "offresPartenaires": "true",
+        "range": f"{start}-{start + PAGE_SIZE - 1}",
+        # du plus récent au plus ancien : les offres déjà connues arrivent en fin de liste
+        "tri": "1",
+    }
+    if lieu:
+        params["lieux"] = lieu
+    return f"{BASE}/offres/recherche?{urlencode(params)}"
+
+
+def finalize_offer(offre):
+    """Convertit la date en chaîne ISO (aujourd'hui par défaut)."""
+    if offre["date_posted"]:
+        offre["date_posted"] = offre["date_posted"].isoformat()
+    else:
+        offre["date_posted"] = datetime.now().date().isoformat()
+    return offre
+
+
+def extract_offers(driver, start=0, mode="js"):
+    """Extrait les offres de la page à partir de la carte `start` (voir read_cards)."""
+    return [finalize_offer(build_offer(raw)) for raw in read_cards(driver, start, mode)]
+
+
+class SliceQueue:
+    """Distribue les tranches (lieu, numéro de page) aux navigateurs.
+
+    Chaque recherche est découpée en tranches de PAGE_SIZE offres adressables
+    par URL. Une tranche incomplète marque la fin de sa recherche : les
+    tranches suivantes ne sont plus distribuées. `lues` et `fins` reprennent
+    un parcours interrompu : tranches déjà lues et fins déjà connues par lieu.
+    """
+
+    def __init__(self, lieux, max_pages=None, lues=None, fins=None):
+        self.lock = threading.Lock()
+        self.lieux = list(lieux)
+        self.next_page = {lieu: 0 for lieu in self.lieux}
+        self.end = {lieu: max_pages for lieu in self.lieux}
+        self.lues = {lieu: set((lues or {}).get(lieu, ())) for lieu in self.lieux}
+        self.failures = {lieu: 0 for lieu in self.lieux}
+        for lieu, fin in (fins or {}).items():
+            if lieu in self.end:
+                self.end[lieu] = fin if self.end[lieu] is None else min(fin, self.end[lieu])
+        self.turn = 0
+
+    def claim(self):
+        """Renvoie la prochaine tranche à lire, ou None quand tout est distribué."""
+        with self.lock:
+            for _ in range(len(self.lieux)):
+                lieu = self.lieux[self.turn % len(self.lieux)]
+                self.turn += 1
+                while self.next_page[lieu] in self.lues[lieu]:
+                    self.next_page[lieu] += 1
+                page = self.next_page[lieu]
+                if self.end[lieu] is None or page < self.end[lieu]:
+                    self.next_page[lieu] += 1
+                    return lieu, page
+            return None
+
+    def done(self, lieu, page, count):
+        if count < PAGE_SIZE:
+            with self.lock:
+                if self.end[lieu] is None or page + 1 < self.end[lieu]:
+                    self.end[lieu] = page + 1
+
+    def failed(self, lieu, page):
+        """Une tranche en erreur ne termine pas son lieu, sauf après MAX_ECHECS."""
+        with self.lock:
+            self.failures[lieu] += 1
+            abandon = self.failures[lieu] >= MAX_ECHECS
+        if abandon:
+            print(f"❌ {MAX_ECHECS} tranches en erreur pour le lieu {lieu} : abandon")
+            self.done(lieu, page, 0)
+
+    def fins(self):
+        with self.lock:
+            return {lieu: fin for lieu, fin in self.end.items() if fin is not None}
+
+
+def read_slice(driver, url, mode="js"):
+    """Charge une tranche et lit ses cartes brutes (liste vide après la dernière offre)."""
+    PACING.wait(HOST)
+    driver.get(url)
+    # la liste est dans le HTML : inutile d'attendre les ressources (profil "eager")
+    WebDriverWait(driver, 10).until(
+        lambda d: d.execute_script("return document.readyState") != "loading"
+    )
+    return read_cards(driver, 0, mode)
+
+
+@register
+class FranceTravailScraper(BaseScraper):
+    """France Travail, avec un navigateur ou un pool de `workers` Chrome headless.
+
+    Un navigateur (workers=1) : parcours historique qui clique sur
+    "offres suivantes" ; le point de reprise est le rang de l'offre
+    suivante, un parcours repris rouvre la liste à ce rang et une page en
+    erreur part dans la file de reprise (la liste est rouverte après elle).
+
+    Pool : la recherche est découpée en tranches adressables par URL
+    (éventuellement par lieu), lues par `workers` navigateurs. Le point de
+    reprise liste les tranches lues et la fin connue de chaque lieu ; une
+    tranche entièrement connue termine son lieu.
+    """
+
+    name = "france_travail"
+    default_query = MOTS_CLES
+    resumable = True
+    # liste triée du plus récent au plus ancien ("tri": "1")
+    sorted_by_date = True
+
+    def __init__(self, query=None, workers=1, lieux=None, max_pages=None, mode="js", pool=None, **kwargs):
+        super().__init__(query, **kwargs)
+        self.workers = workers
+        self.lieux = list(lieux or [])
+        self.max_pages = max_pages
+        self.mode = mode
+        self.pool = pool  # navigateurs réutilisables (None : le pool partagé du processus)
+        self.driver = None
+        self.position = 0  # un navigateur : rang de l'offre suivante
+        self.lues = {}  # pool : lieu -> tranches lues
+        self.slices = None
+
+    def checkpoint_key(self):
+        if self.workers <= 1:
+            return self.name, self.query
+        query = f"{self.query} @ {','.join(self.lieux)}" if self.lieux else self.query
+        return f"{self.name}_pool", query
+
+    def open(self):
+        self.pool = self.pool or get_pool()
+        if self.workers <= 1:
+            self.driver = self.pool.acquire(profile=self.profile)
+
+    def close(self):
+        if self.driver is not None:
+            # rendu au pool, session vidée, pour le prochain parcours
+            self.pool.release(self.driver)
+            self.driver = None
+
+    def fetch(self):
+        return self.fetch_pages() if self.workers <= 1 else self.fetch_slices()
+
+    def normalize(self, raw):
+        return finalize_offer(build_offer(raw))
+
+    def cursor(self):
+        if self.workers <= 1:
+            return {"start": self.position}
+        # les lieux sont des clés JSON ("" : pas de lieu)
+        return {
+            "done": {lieu or "": sorted(pages) for lieu, pages in self.lues.items()},
+            "end": {lieu or "": fin for lieu, fin in self.slices.fins().items()},
+        }
+
+    def refetch(self, cursor):
+        if self.driver is None:
+            self.driver = self.pool.acquire(headless=True, profile=self.profile)
+        return read_slice(self.driver, build_search_url(self.query, cursor["start"], cursor.get("lieu")), self.mode)
+
+    def fetch_pages(self):
+        """Un navigateur qui clique sur "Afficher les 20 offres suivantes"."""
+        driver = self.driver
+        # Attentes événementielles (anciennement 2 + 2 + 1 s de pauses fixes par page)
+        waits = SmartWaits(driver, legacy_sleep=5, host=HOST)
+
+        def ouvrir(rang):
+            waits.pace()
+            driver.get(build_search_url(self.query, rang))
+            waits.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.result")))
+
+        # rang dans les résultats de la première carte affichée
+        debut = self.checkpoint.cursor.get("start", 0) if self.checkpoint is not None else 0
+        page = self.checkpoint.page + 1 if self.checkpoint is not None else 1
+        if debut:
+            print(f"↩️  Reprise du parcours {self.checkpoint.run_id} à l'offre {debut} (page {page})")
+        try:
+            ouvrir(debut)
+        except TimeoutException:
+            if not debut:
+                raise
+            # le parcours interrompu avait lu la dernière page
+            print("✅ Fin des offres.")
+            return
+
+        lues = 0  # cartes de la liste affichée déjà lues
+        echecs = 0
 
-                # Gestion des doublons
+        while True:
+            print(f"\n===  Lecture des offres (page {page}) ===")
+            try:
+                # la liste ne bouge plus : toutes les cartes sont rendues
+                waits.dom_quiet()
+                cartes = read_cards(driver, lues, self.mode)
+            except WebDriverException as e:
+                echecs += 1
+                if echecs > MAX_ECHECS:
+                    raise
+                self.page_failed(page, {"start": debut + lues}, e)
+                # on saute la page en erreur : la liste est rouverte sur la suivante
+                debut, lues = debut + lues + PAGE_SIZE, 0
+                page += 1
                 try:
-                    insert_job(offre)
-                except Exception as e:
-                    if "duplicate key" in str(e):
-                        print(f"⚠️  Offre déjà en base (ignorée)")
-                    else:
-                        print(f"❌ Erreur : {e}")
+                    ouvrir(debut)
+                except TimeoutException:
+                    print("✅ Fin des offres.")
+                    return
+                continue
+            echecs = 0
+
+            lues += len(cartes)
+            print(f"→ {lues} offres visibles actuellement.")
+            self.position = debut + lues
+            yield page, cartes
 
             # --- Bouton "Afficher les 20 offres suivantes" ---
             try:
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                # le défilement peut déclencher des chargements : on attend le calme réseau
+                waits.network_idle()
 
-                bouton_suivant = wait.until(
+                bouton_suivant = waits.until(
                     EC.element_to_be_clickable(
                         (
                             By.XPATH,
@@ -196,26 +440,168 @@ def main():
                 driver.execute_script(
                     "arguments[0].scrollIntoView(true);", bouton_suivant
                 )
-                time.sleep(1)
+                waits.pace()
                 driver.execute_script("arguments[0].click();", bouton_suivant)
 
-                wait.until(
-                    lambda d: len(d.find_elements(By.CSS_SELECTOR, "li.result"))
-                    > len(cards)
-                )
+                waits.count_greater("li.result", lues)
+                waits.page_done(page)
                 page += 1
 
             except TimeoutException:
                 print("✅ Fin des offres (plus de lien visible).")
-                break
+                return
             except NoSuchElementException:
                 print("✅ Lien introuvable (probablement dernière page).")
-                break
+                return
+            except WebDriverException as e:
+                echecs += 1
+                if echecs > MAX_ECHECS:
+                    raise
+                # la page est lue : on rouvre directement la liste sur la suivante
+                print(f"⚠️ Passage à la page suivante impossible, réouverture : {e}")
+                debut, lues = debut + lues, 0
+                page += 1
+                try:
+                    ouvrir(debut)
+                except TimeoutException:
+                    print("✅ Fin des offres.")
+                    return
+
+    def fetch_slices(self):
+        """Tranches lues par le pool, dans l'ordre où elles arrivent."""
+        cursor = self.checkpoint.cursor if self.checkpoint is not None else {}
+        lieux = self.lieux or [None]
+        self.lues = {lieu: set(cursor.get("done", {}).get(lieu or "", ())) for lieu in lieux}
+        fins = {lieu: cursor["end"][lieu or ""] for lieu in lieux if (lieu or "") in cursor.get("end", {})}
+        if any(self.lues.values()):
+            print(
+                f"↩️  Reprise du parcours {self.checkpoint.run_id} : "
+                f"{sum(map(len, self.lues.values()))} tranches déjà lues"
+            )
+        self.slices = slices = SliceQueue(lieux, self.max_pages, self.lues, fins)
+        results = queue.Queue()
+        seen_set = self.seen_set
+
+        def worker():
+            driver = self.pool.acquire(headless=True, profile=self.profile)
+            try:
+                while True:
+                    claimed = slices.claim()
+                    if claimed is None:
+                        break
+                    lieu, page = claimed
+                    try:
+                        cartes = read_slice(driver, build_search_url(self.query, page * PAGE_SIZE, lieu), self.mode)
+                    except Exception as e:
+                        # la file de reprise s'en charge : la tranche compte comme lue
+                        self.page_failed(page + 1, {"lieu": lieu, "start": page * PAGE_SIZE}, e)
+                        slices.failed(lieu, page)
+                        results.put((lieu, page, []))
+                        continue
+                    if (
+                        seen_set is not None
+                        and self.stop_after
+                        and cartes
+                        and all(offer_url(carte) in seen_set for carte in cartes)
+                    ):
+                        # les tranches suivantes du lieu sont plus anciennes
+                        slices.done(lieu, page, 0)
+                    else:
+                        slices.done(lieu, page, len(cartes))
+                    results.put((lieu, page, cartes))
+            finally:
+                self.pool.release(driver)
+
+        lues = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(worker) for _ in range(self.workers)]
+            while not (all(f.done() for f in futures) and results.empty()):
+                try:
+                    lieu, page, cartes = results.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.lues[lieu].add(page)
+                # une tranche vide (fin du lieu ou erreur) n'est pas transmise
+                if cartes:
+                    lues += 1
+                    yield lues, cartes
+            for future in futures:
+                # remonte les erreurs de lancement de Chrome
+                future.result()
+
+    def run(self):
+        # le pool arrête chaque lieu sur sa première tranche connue : pas d'arrêt global
+        self.stop_after = self.seen_set.stop_after if self.seen_set is not None else 0
+        if self.workers > 1 and self.seen_set is not None:
+            self.seen_set.stop_after = 0
+        return super().run()
+
+
+def print_report(label, elapsed, pages, offres):
+    per_minute = pages / elapsed * 60 if elapsed else 0
+    print(
+        f"⏱️  {label:<12} : {elapsed:6.1f} s, {pages} pages, "
+        f"{per_minute:.1f} pages/min, {offres} offres"
+    )
 
-        print(f"\n✅ Total d'offres collectées : {len(offres)}")
 
-    finally:
-        driver.quit()
+def main():
+    parser = argparse.ArgumentParser(description="Scraper France Travail")
+    parser.add_argument("--mots-cles", default=MOTS_CLES)
+    parser.add_argument("--workers", type=int, default=1, help="navigateurs en parallèle (1 = parcours historique)")
+    parser.add_argument("--lieux", default="", help="découpage par lieu, ex: 75D,69D,13D")
+    parser.add_argument("--max-pages", type=int, default=None, help="tranches max par lieu")
+    parser.add_argument("--compare", action="store_true", help="compare un navigateur et le pool")
+    parser.add_argument(
+        "--extraction",
+        choices=["js", "webdriver"],
+        default="js",
+        help="js : un execute_script par page ; webdriver : un appel par élément",
+    )
+    parser.add_argument(
+        "--stop-after-known",
+        type=int,
+        default=STOP_AFTER_KNOWN,
+        help="arrête la pagination après N offres déjà en base d'affilée (0 = jamais)",
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="reprend le dernier parcours interrompu de ces mots-clés (et lieux)"
+    )
+    args = parser.parse_args()
+
+    print(f"===  Récupération des offres : {args.mots_cles}... ===")
+
+    lieux = [lieu.strip() for lieu in args.lieux.split(",") if lieu.strip()]
+    options = {"lieux": lieux, "max_pages": args.max_pages, "mode": args.extraction}
+
+    if not args.compare:
+        run_scrapers(
+            ["france_travail"],
+            args.mots_cles,
+            resume=args.resume,
+            stop_after_known=args.stop_after_known,
+            options={"france_travail": {"workers": args.workers, **options}},
+        )
+        return
+
+    # la comparaison mesure le parcours complet : pas d'offres ignorées ni de reprise
+    reports = []
+    with JobWriter() as writer:
+        for workers in sorted({1, args.workers}):
+            # navigateurs neufs à chaque mesure : le pool ne doit pas avantager la seconde
+            with DriverPool(size=workers) as pool:
+                scraper = FranceTravailScraper(args.mots_cles, workers=workers, pool=pool, writer=writer, **options)
+                stats = scraper.run()
+            label = "1 navigateur" if workers == 1 else f"{workers} navigateurs"
+            reports.append((label, stats["elapsed"], stats["pages"], stats["records"]))
+
+    for label, elapsed, pages, total in reports:
+        print_report(label, elapsed, pages, total)
+    totals = writer.totals
+    print(
+        f"💾 Base : {totals['written']} nouvelles, "
+        f"{totals['skipped']} déjà connues, {totals['failed']} en erreur"
+    )
 
 
 if __name__ == "__main__":
@@ -1,79 +1,189 @@
-import sqlite3
-from database.db import insert_job
-import requests
+"""
+Scraper Wuzzuf (Égypte) : les pages de résultats sont téléchargées en
+parallèle avec aiohttp (connexions keep-alive réutilisées, concurrence
+bornée par hôte) et analysées par BeautifulSoup hors de la boucle asyncio.
+
+Les pages N..N+k sont demandées par fenêtres spéculatives ; la première
+page vide ("Search results not found") arrête proprement le parcours.
+Wuzzuf trie les résultats par pertinence : une suite d'offres déjà en
+base n'arrête pas le parcours, de nouvelles offres peuvent venir après.
+
+    python -m scrapers run wuzzuf --query "cyber security"
+
+Pour rejouer des pages enregistrées sur un serveur local :
+    python -m http.server 8000 --directory pages_enregistrees
+    python -m scrapers.Jobsite --url-template "http://127.0.0.1:8000/page_{start}.html"
+"""
+
+import argparse
+import asyncio
+from urllib.parse import quote_plus
+
+import aiohttp
 from bs4 import BeautifulSoup
 import lxml
+from scrapers.base import BaseScraper, register
+from scrapers.runner import run_scrapers
 
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
-page_number = 0
-
-try:
-    while True:
-        url = f"https://wuzzuf.net/search/jobs?q=cyber%20security&start={page_number}"
-        result = requests.get(url, headers=headers)
-
-        # Si la page est vide ou inexistante, on arrête la boucle
-        if result.status_code != 200 or "Search results not found" in result.text:
-            break
-
-        # Analyser le contenu HTML de la page
-        soup = BeautifulSoup(result.content, "lxml")
-        titles = soup.find_all("h2", class_="css-193uk2c")
-        companies = soup.find_all("a", class_="css-ipsyv7")
-        locations = soup.find_all("span", class_="css-16x61xq")
-
-        if not titles:
-            break
- 
-        # Récupérer les données des offres de travail:
-        
-        length = min(len(titles), len(companies), len(locations))
-        for i in range(length):
-            
-            
-            title_text = titles[i].get_text(strip=True)
-            #nom de l'entreprise
-            company_text = companies[i].get_text(strip=True)
-            
-            #localisation
-            location_text = locations[i].get_text(strip=True)
-
-            title_parent = titles[i].find_parent()
-            
-            #date
-            date_elem = title_parent.find("div", class_=["css-eg55jf", "css-1jldrig"])
-            date_text = date_elem.get_text(strip=True) if date_elem else "N/A"
-
-            #lien de l'offre
-            job_link_elem = titles[i].find("a")
-            job_link = job_link_elem.attrs.get('href', '#') if job_link_elem else "#"
-            if job_link.startswith('/'):
-                job_link = "https://wuzzuf.net" + job_link
-
-            # Insérer dans la base
-            job_data = {
-                'source': 'Wuzzuf',
-                'title': title_text,
-                'company': company_text,
-                'location': location_text,
-                'date_posted': date_text,
-                'url': job_link
-            }
-            insert_job(job_data)
-
-        print(f"✓ Page {page_number + 1} scrapée ({length} offres)")
-
-        page_number += 1
-
-    print("Scraping terminé, résultats enregistrés dans jobs.db")
-    
-
-except requests.exceptions.RequestException as e:
-    print(f"Erreur de requête: {e}")
-except Exception as e:
-    print(f"Erreur: {e}")
-finally:
-    print("Scraping terminé.")
+SEARCH_URL = "https://wuzzuf.net/search/jobs?q={query}&start={start}"
+
+# texte affiché par Wuzzuf quand il n'y a plus de résultats
+END_OF_RESULTS = "Search results not found"
+
+
+def parse_page(html):
+    """Extrait les offres d'une page de résultats (liste vide en fin de résultats)."""
+    if END_OF_RESULTS in html:
+        return []
+
+    soup = BeautifulSoup(html, "lxml")
+    titles = soup.find_all("h2", class_="css-193uk2c")
+    companies = soup.find_all("a", class_="css-ipsyv7")
+    locations = soup.find_all("span", class_="css-16x61xq")
+
+    jobs = []
+    length = min(len(titles), len(companies), len(locations))
+    for i in range(length):
+        title_text = titles[i].get_text(strip=True)
+        #nom de l'entreprise
+        company_text = companies[i].get_text(strip=True)
+
+        #localisation
+        location_text = locations[i].get_text(strip=True)
+
+        title_parent = titles[i].find_parent()
+
+        #date
+        date_elem = title_parent.find("div", class_=["css-eg55jf", "css-1jldrig"])
+        date_text = date_elem.get_text(strip=True) if date_elem else "N/A"
+
+        #lien de l'offre
+        job_link_elem = titles[i].find("a")
+        job_link = job_link_elem.attrs.get('href', '#') if job_link_elem else "#"
+        if job_link.startswith('/'):
+            job_link = "https://wuzzuf.net" + job_link
+
+        jobs.append({
+            'source': 'Wuzzuf',
+            'title': title_text,
+            'company': company_text,
+            'location': location_text,
+            'date_posted': date_text,
+            'url': job_link
+        })
+    return jobs
+
+
+async def fetch_page(session, url):
+    """Télécharge une page ; None si le serveur ne renvoie pas 200."""
+    async with session.get(url) as response:
+        if response.status != 200:
+            return None
+        return await response.text()
+
+
+async def crawl(url_template=SEARCH_URL, query="cyber security", window=4, concurrency=4, max_pages=None):
+    """Générateur asynchrone de (numéro de page, HTML), dans l'ordre des pages.
+
+    `window` pages sont demandées en même temps ; `concurrency` borne le
+    nombre de connexions ouvertes vers un même hôte.
+    """
+    connector = aiohttp.TCPConnector(limit_per_host=concurrency, keepalive_timeout=30)
+    timeout = aiohttp.ClientTimeout(total=30)
+
+    async with aiohttp.ClientSession(headers=headers, connector=connector, timeout=timeout) as session:
+        page_number = 0
+        while max_pages is None or page_number < max_pages:
+            last = page_number + window
+            if max_pages is not None:
+                last = min(last, max_pages)
+            numbers = range(page_number, last)
+
+            # Téléchargement spéculatif de toute la fenêtre
+            htmls = await asyncio.gather(
+                *(
+                    fetch_page(session, url_template.format(query=quote_plus(query), start=n))
+                    for n in numbers
+                )
+            )
+
+            for n, html in zip(numbers, htmls):
+                # une page en erreur ou vide termine le parcours : on ignore la suite de la fenêtre
+                if html is None or END_OF_RESULTS in html:
+                    return
+                yield n, html
+
+            page_number = last
+
+
+@register
+class WuzzufScraper(BaseScraper):
+    """Wuzzuf : pages de résultats téléchargées par fenêtres avec aiohttp.
+
+    La boucle asyncio tourne dans fetch() ; l'analyse BeautifulSoup se fait
+    dans l'étape parse, hors de la boucle.
+    """
+
+    name = "wuzzuf"
+    default_query = "cyber security"
+
+    def __init__(self, query=None, window=4, concurrency=4, max_pages=None, url_template=SEARCH_URL, **kwargs):
+        super().__init__(query, **kwargs)
+        self.window = window
+        self.concurrency = concurrency
+        self.max_pages = max_pages
+        self.url_template = url_template
+
+    def fetch(self):
+        loop = asyncio.new_event_loop()
+        pages = crawl(self.url_template, self.query, self.window, self.concurrency, self.max_pages)
+        try:
+            while True:
+                try:
+                    page_number, html = loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield page_number + 1, html
+        finally:
+            # arrêt anticipé (offres déjà connues) : ferme la session HTTP
+            loop.run_until_complete(pages.aclose())
+            loop.close()
+
+    def parse(self, html):
+        return parse_page(html)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper Wuzzuf")
+    parser.add_argument("--query", default="cyber security")
+    parser.add_argument("--window", type=int, default=4, help="pages demandées en parallèle")
+    parser.add_argument("--concurrency", type=int, default=4, help="connexions max par hôte")
+    parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--url-template", default=SEARCH_URL, help="URL avec {query} et {start}")
+    args = parser.parse_args()
+
+    try:
+        run_scrapers(
+            ["wuzzuf"],
+            args.query,
+            options={
+                "wuzzuf": {
+                    "window": args.window,
+                    "concurrency": args.concurrency,
+                    "max_pages": args.max_pages,
+                    "url_template": args.url_template,
+                }
+            },
+        )
+    except aiohttp.ClientError as e:
+        print(f"Erreur de requête: {e}")
+    except Exception as e:
+        print(f"Erreur: {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+"""
+Job board scrapers. Each one is a BaseScraper registered under a name:
+
+    python -m scrapers run emploitic wuzzuf --concurrency 2
+
+    from scrapers import get_scraper
+    scraper = get_scraper("wuzzuf")(query="soc analyst", writer=writer)
+    stats = scraper.run()
+"""
+
+from scrapers.base import BaseScraper, available_scrapers, get_scraper, register
+
+__all__ = ["BaseScraper", "available_scrapers", "get_scraper", "register"]
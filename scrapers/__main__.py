@@ -0,0 +1,90 @@
+"""
+Command line of the scrapers package.
+
+    python -m scrapers list
+    python -m scrapers run emploitic france_travail wuzzuf --concurrency 3
+    python -m scrapers run emploitic --profile full   # visible browser loading every resource
+    python -m scrapers run wuzzuf --query "soc analyst"
+    python -m scrapers run emploitic --resume
+    python -m scrapers run emploitic france_travail --every 60 --warm 2   # hourly, browsers kept warm
+"""
+
+import argparse
+import sys
+import time
+
+from scrapers.base import available_scrapers
+from scrapers.driver import DEFAULT_PROFILE, PROFILES
+from scrapers.seen import STOP_AFTER_KNOWN
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m scrapers", description="Job board scrapers")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list the available scrapers")
+
+    run = commands.add_parser("run", help="run one or several scrapers")
+    run.add_argument("names", nargs="+", choices=available_scrapers(), metavar="name")
+    run.add_argument("--query", default=None, help="search query (default: each scraper's own)")
+    run.add_argument("--concurrency", type=int, default=None, help="scrapers run at the same time (default: all)")
+    run.add_argument("--resume", action="store_true", help="continue the interrupted runs")
+    run.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help="browser profile: lean (headless, no images/CSS/fonts/trackers) or full",
+    )
+    run.add_argument(
+        "--stop-after-known",
+        type=int,
+        default=STOP_AFTER_KNOWN,
+        help="stop paginating after N consecutive known offers, on boards sorted newest first (0 = never)",
+    )
+    run.add_argument(
+        "--every",
+        type=float,
+        default=None,
+        metavar="MINUTES",
+        help="run again every MINUTES from this process, reusing the same browsers",
+    )
+    run.add_argument("--warm", type=int, default=0, help="browsers started (in parallel) before the first run")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        print("\n".join(available_scrapers()))
+        return 0
+
+    from scrapers.driver_pool import get_pool
+    from scrapers.runner import run_scrapers
+
+    pool = get_pool()
+    if args.warm:
+        pool.warm(args.warm, profile=args.profile)
+    resume = args.resume
+    while True:
+        _, failed = run_scrapers(
+            args.names,
+            query=args.query,
+            concurrency=args.concurrency,
+            resume=resume,
+            stop_after_known=args.stop_after_known,
+            profile=args.profile,
+        )
+        if pool.stats:
+            print(
+                f"🌐 browsers: {pool.stats['started']} started, {pool.stats['reused']} reused, "
+                f"{pool.idle()} kept warm"
+            )
+        if args.every is None:
+            return 1 if failed else 0
+        # the next runs start from the newest offers
+        resume = False
+        print(f"⏳ next run in {args.every:g} min")
+        try:
+            time.sleep(args.every * 60)
+        except KeyboardInterrupt:
+            return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
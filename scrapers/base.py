@@ -0,0 +1,246 @@
+"""
+Common skeleton of the scrapers: a run goes through four timed stages.
+
+    fetch      navigate / download the result pages, yielding (page, payload)
+    parse      payload -> raw records (the cards of the page)
+    normalize  raw record -> job dict with the jobs table fields
+    sink       skip the offers already known (SeenSet), queue the others in the JobWriter
+
+Subclasses implement fetch() (and parse() / normalize() when the payload
+needs it) and are registered under their `name`:
+
+    @register
+    class MyBoardScraper(BaseScraper):
+        name = "my_board"
+        default_query = "cybersecurity"
+
+        def fetch(self):
+            for page in range(1, 4):
+                yield page, download(page)
+
+        def parse(self, html):
+            return parse_cards(html)
+
+Resources such as a browser are created in open() and released in
+close(), both called by run(): importing or instantiating a scraper never
+launches anything.
+"""
+
+import time
+from contextlib import contextmanager
+from importlib import import_module
+
+from scrapers.checkpoints import MAX_ATTEMPTS
+
+STAGES = ("fetch", "parse", "normalize", "sink")
+
+# scrapers shipped with the repo, imported on first use only (a Wuzzuf run does not load Selenium)
+BUILTIN_SCRAPERS = {
+    "emploitic": "scrapers.emploitic",
+    "france_travail": "scrapers.FranceTravail",
+    "wuzzuf": "scrapers.Jobsite",
+}
+
+REGISTRY = {}
+
+
+def register(cls):
+    """class decorator adding a scraper to the registry under its `name`"""
+    REGISTRY[cls.name] = cls
+    return cls
+
+
+def available_scrapers():
+    return sorted(set(BUILTIN_SCRAPERS) | set(REGISTRY))
+
+
+def get_scraper(name):
+    """scraper class registered as `name`"""
+    if name not in REGISTRY and name in BUILTIN_SCRAPERS:
+        import_module(BUILTIN_SCRAPERS[name])
+    if name not in REGISTRY:
+        raise ValueError(f"Unknown scraper '{name}' (available: {', '.join(available_scrapers())})")
+    return REGISTRY[name]
+
+
+class StageTimings:
+    """Seconds spent in each stage of a run."""
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+
+    @contextmanager
+    def __call__(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[stage] += time.perf_counter() - start
+
+
+class BaseScraper:
+    """One job board, scraped as fetch -> parse -> normalize -> sink.
+
+    `writer` is the JobWriter of the run, `seen_set` the known urls (a
+    SeenSet, or None to write every offer) and `checkpoint` the position
+    of a resumable run (scrapers with `resumable`): after each page it
+    records `page` and cursor(), and failed pages reported with
+    page_failed() are read again with refetch() at the end of the run.
+
+    Only scrapers whose listing is newest first (`sorted_by_date`) stop
+    paginating after a run of known offers: on a listing sorted by
+    relevance, new offers can come after any number of known ones.
+    """
+
+    name = None
+    default_query = None
+    resumable = False
+    sorted_by_date = False
+
+    def __init__(self, query=None, writer=None, seen_set=None, checkpoint=None, profile=None):
+        self.query = query or self.default_query
+        self.writer = writer
+        self.seen_set = seen_set
+        self.checkpoint = checkpoint
+        self.profile = profile  # browser profile of scrapers/driver.py (None: the default one)
+        self.timings = StageTimings()
+        self.stats = {"pages": 0, "records": 0, "new": 0, "known": 0, "dropped": 0, "failed": 0, "elapsed": 0.0}
+
+    def __repr__(self):
+        return f"{type(self).__name__}(query={self.query!r})"
+
+    # --- stages, overridden by the scrapers ---
+
+    def open(self):
+        """create the resources of the run (browser, session...)"""
+
+    def close(self):
+        """release the resources created by open(), also called after an error"""
+
+    def fetch(self):
+        """yield (page number, payload) for each result page"""
+        raise NotImplementedError
+
+    def parse(self, payload):
+        """raw records of a page; an empty list ends the crawl"""
+        return payload
+
+    def normalize(self, record):
+        """job dict of a raw record; ValueError drops the record"""
+        return record
+
+    def sink(self, jobs):
+        """queue the offers that are not known yet, returns how many"""
+        new = 0
+        for job in jobs:
+            if self.seen_set is not None:
+                if self.seen_set.check(job["url"]):
+                    continue
+                self.seen_set.add(job["url"])
+            if self.writer is not None:
+                self.writer.add(job)
+            new += 1
+        return new
+
+    # --- resumable runs ---
+
+    def checkpoint_key(self):
+        """(scraper, query) under which the checkpoint of the run is stored"""
+        return self.name, self.query
+
+    def cursor(self):
+        """position saved with each completed page (None keeps the previous one)"""
+        return None
+
+    def refetch(self, cursor):
+        """payload of a page of the retry queue"""
+        raise NotImplementedError(f"{self.name} cannot retry pages")
+
+    def page_failed(self, page, cursor, error):
+        """report a page that could not be read: it joins the retry queue"""
+        self.stats["failed"] += 1
+        print(f"❌ [{self.name}] page {page} failed: {error}")
+        if self.checkpoint is not None:
+            self.checkpoint.page_failed(page, cursor, error)
+
+    # --- run ---
+
+    def process(self, page, payload):
+        """parse, normalize and sink one page, returns its raw records"""
+        with self.timings("parse"):
+            records = self.parse(payload)
+        jobs = []
+        with self.timings("normalize"):
+            for record in records:
+                try:
+                    jobs.append(self.normalize(record))
+                except ValueError as e:
+                    self.stats["dropped"] += 1
+                    print(f"⚠️ [{self.name}] record dropped on page {page}: {e}")
+        with self.timings("sink"):
+            new = self.sink(jobs)
+        self.stats["pages"] += 1
+        self.stats["records"] += len(records)
+        self.stats["new"] += new
+        self.stats["known"] += len(jobs) - new
+        if records:
+            print(f"✓ [{self.name}] page {page}: {len(records)} offers, {len(jobs) - new} already known")
+        return records
+
+    def run(self):
+        """scrape every page, returns the stats of the run"""
+        start = time.perf_counter()
+        self.open()
+        try:
+            pages = self.fetch()
+            try:
+                while True:
+                    with self.timings("fetch"):
+                        item = next(pages, None)
+                    if item is None:
+                        break
+                    page, payload = item
+                    if not self.process(page, payload):
+                        print(f"✅ [{self.name}] no offers on page {page}: end of the results")
+                        break
+                    if self.checkpoint is not None:
+                        with self.timings("sink"):
+                            self.checkpoint.page_done(page, self.cursor())
+                    if self.seen_set is not None and self.seen_set.exhausted:
+                        print(f"✅ [{self.name}] the last {self.seen_set.streak} offers are already known: stopping")
+                        break
+            finally:
+                pages.close()
+            if self.checkpoint is not None:
+                self.retry_failed()
+            if self.writer is not None:
+                with self.timings("sink"):
+                    self.writer.flush()
+        finally:
+            self.close()
+            self.stats["elapsed"] = time.perf_counter() - start
+        return self.stats
+
+    def retry_failed(self):
+        """read the pages of the retry queue again; the run is finished once it is empty"""
+        retries = self.checkpoint.retries()
+        if retries:
+            print(f"\n===  [{self.name}] retrying {len(retries)} failed pages ===")
+        for page, cursor in retries:
+            try:
+                with self.timings("fetch"):
+                    payload = self.refetch(cursor)
+            except Exception as e:
+                print(f"❌ [{self.name}] page {page} failed again: {e}")
+                self.checkpoint.page_failed(page, cursor, e)
+                continue
+            self.process(page, payload)
+            self.checkpoint.retry_done(cursor)
+
+        remaining = self.checkpoint.failed()
+        if self.checkpoint.retries():
+            print(f"⚠️ [{self.name}] {remaining} pages still failing: run again with --resume to retry them")
+        else:
+            if remaining:
+                print(f"⚠️ [{self.name}] {remaining} pages given up after {MAX_ATTEMPTS} failures")
+            self.checkpoint.finish()
@@ -0,0 +1,182 @@
+"""
+Resumable crawl checkpoints shared by the scrapers.
+
+A local SQLite file (.cache/checkpoints.sqlite, override with
+SCRAPER_CHECKPOINTS_PATH) records, for every (scraper, query), the run id,
+the last completed page and a scraper-defined cursor (the offset of the
+next result, the slices already read...). A run started with `resume`
+continues from there instead of page 1; a run that completes is marked
+finished, so the next one starts over.
+
+Pages that fail go to a retry queue rather than ending the crawl; the
+scraper retries them at the end of the run (and on --resume), up to
+MAX_ATTEMPTS times each.
+
+    checkpoint = CheckpointStore().start("emploitic", "cybersecurity", resume=args.resume, flush=writer.flush)
+    page = checkpoint.page + 1
+    ...
+    checkpoint.page_done(page, {"start": offset})   # flushes the writer first
+    checkpoint.page_failed(page, {"start": offset}, error)
+    for retry in checkpoint.retries(): ...
+    checkpoint.finish()
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+DEFAULT_PATH = Path(__file__).resolve().parents[1] / ".cache" / "checkpoints.sqlite"
+
+# a page that failed this many times stays in the queue but is no longer retried
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    scraper TEXT NOT NULL,
+    query TEXT NOT NULL,
+    run_id TEXT NOT NULL,
+    page INTEGER NOT NULL DEFAULT 0,
+    cursor TEXT NOT NULL DEFAULT '{}',
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    finished_at TEXT,
+    PRIMARY KEY (scraper, query)
+);
+CREATE TABLE IF NOT EXISTS retries (
+    scraper TEXT NOT NULL,
+    query TEXT NOT NULL,
+    cursor TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    run_id TEXT NOT NULL,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (scraper, query, cursor)
+);
+"""
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _dump(cursor):
+    # sorted keys: the same cursor is always the same retry queue entry
+    return json.dumps(cursor or {}, sort_keys=True, ensure_ascii=False)
+
+
+class CheckpointStore:
+    """SQLite file holding the checkpoints of every scraper (thread-safe)."""
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.getenv("SCRAPER_CHECKPOINTS_PATH") or DEFAULT_PATH)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+        # pool workers record their pages from their own threads
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        with self.db:
+            self.db.executescript(SCHEMA)
+
+    def execute(self, sql, params=()):
+        with self.lock, self.db:
+            return self.db.execute(sql, params).fetchall()
+
+    def start(self, scraper, query, resume=False, flush=None):
+        """checkpoint of a new run, or of the unfinished one when `resume`"""
+        rows = self.execute("SELECT * FROM runs WHERE scraper = ? AND query = ?", (scraper, query))
+        if resume and rows and rows[0]["finished_at"] is None:
+            row = rows[0]
+            return Checkpoint(self, scraper, query, row["run_id"], row["page"], json.loads(row["cursor"]), flush)
+        if resume:
+            print(f"ℹ️ No unfinished {scraper} run for '{query}', starting from the first page")
+        run_id = uuid.uuid4().hex[:12]
+        now = _now()
+        self.execute(
+            "INSERT OR REPLACE INTO runs (scraper, query, run_id, page, cursor, started_at, updated_at) "
+            "VALUES (?, ?, ?, 0, '{}', ?, ?)",
+            (scraper, query, run_id, now, now),
+        )
+        # the failed pages of an abandoned run would be read again anyway
+        self.execute("DELETE FROM retries WHERE scraper = ? AND query = ?", (scraper, query))
+        return Checkpoint(self, scraper, query, run_id, 0, {}, flush)
+
+
+class Checkpoint:
+    """Position of one run of a scraper on one query."""
+
+    def __init__(self, store, scraper, query, run_id, page, cursor, flush=None):
+        self.store = store
+        self.scraper = scraper
+        self.query = query
+        self.run_id = run_id
+        self.page = page  # last completed page, 0 before the first one
+        self.cursor = cursor
+        self.resumed = page > 0 or bool(cursor)
+        self.flush = flush
+
+    def __repr__(self):
+        return f"Checkpoint({self.scraper!r}, {self.query!r}, run={self.run_id}, page={self.page})"
+
+    def page_done(self, page, cursor=None):
+        """record a completed page (and drop it from the retry queue)
+
+        `flush` is called first: a resumed run must not skip rows that
+        were still waiting in the writer buffer.
+        """
+        if self.flush is not None:
+            self.flush()
+        if cursor is not None:
+            self.cursor = cursor
+        self.page = max(self.page, page)
+        self.store.execute(
+            "UPDATE runs SET page = ?, cursor = ?, updated_at = ? WHERE scraper = ? AND query = ?",
+            (self.page, _dump(self.cursor), _now(), self.scraper, self.query),
+        )
+
+    def page_failed(self, page, cursor, error):
+        """put a page in the retry queue"""
+        self.store.execute(
+            "INSERT INTO retries (scraper, query, cursor, page, run_id, error, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (scraper, query, cursor) DO UPDATE SET "
+            "attempts = attempts + 1, error = excluded.error, updated_at = excluded.updated_at",
+            (self.scraper, self.query, _dump(cursor), page, self.run_id, str(error)[:500], _now()),
+        )
+
+    def retry_done(self, cursor):
+        """remove a page read successfully from the retry queue"""
+        if self.flush is not None:
+            self.flush()
+        self.store.execute(
+            "DELETE FROM retries WHERE scraper = ? AND query = ? AND cursor = ?",
+            (self.scraper, self.query, _dump(cursor)),
+        )
+
+    def retries(self, max_attempts=MAX_ATTEMPTS):
+        """(page, cursor) of the queued pages that can still be retried, in page order"""
+        rows = self.store.execute(
+            "SELECT page, cursor FROM retries WHERE scraper = ? AND query = ? AND attempts < ? ORDER BY page",
+            (self.scraper, self.query, max_attempts),
+        )
+        return [(row["page"], json.loads(row["cursor"])) for row in rows]
+
+    def failed(self):
+        """number of pages still in the retry queue"""
+        rows = self.store.execute(
+            "SELECT COUNT(*) AS n FROM retries WHERE scraper = ? AND query = ?", (self.scraper, self.query)
+        )
+        return rows[0]["n"]
+
+    def finish(self):
+        """mark the run complete: the next run starts from the first page"""
+        if self.flush is not None:
+            self.flush()
+        self.store.execute(
+            "UPDATE runs SET finished_at = ?, updated_at = ? WHERE scraper = ? AND query = ?",
+            (_now(), _now(), self.scraper, self.query),
+        )
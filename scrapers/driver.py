@@ -0,0 +1,126 @@
+"""
+Helpers around the Selenium WebDriver shared by the scrapers.
+
+create_driver() starts Chrome with one of two profiles:
+
+    full  today's browser: a 1600x1000 window that loads every resource
+    lean  headless, images / CSS / fonts and ad or analytics hosts blocked
+          through CDP, "eager" page loads (control returns at
+          DOMContentLoaded instead of after every subresource)
+
+The scrapers read texts from the DOM only, so lean (the default, change it
+with SCRAPER_BROWSER_PROFILE=full) gives them the same cards. The styles
+built by JavaScript (MUI on Emploitic) are not files and are kept.
+"""
+
+import os
+from collections import Counter
+
+PROFILES = {
+    "full": {"headless": False, "block_resources": False, "block_hosts": False, "page_load_strategy": "normal"},
+    "lean": {"headless": True, "block_resources": True, "block_hosts": True, "page_load_strategy": "eager"},
+}
+DEFAULT_PROFILE = os.getenv("SCRAPER_BROWSER_PROFILE", "lean")
+
+# files the scrapers never read (Network.setBlockedURLs patterns)
+BLOCKED_RESOURCES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.css",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+]
+
+# third-party ads, analytics and chat widgets loaded by the job boards
+BLOCKED_HOSTS = [
+    "google-analytics.com", "googletagmanager.com", "googlesyndication.com", "doubleclick.net",
+    "googleadservices.com", "adservice.google.com", "connect.facebook.net", "facebook.com/tr",
+    "analytics.tiktok.com", "snap.licdn.com", "static.hotjar.com", "script.hotjar.com",
+    "clarity.ms", "bat.bing.com", "cdn.segment.com", "widget.intercom.io", "js.hs-scripts.com",
+    "cdn.mxpnl.com", "sentry-cdn.com", "cookielaw.org", "tarteaucitron", "xiti.com", "atinternet",
+    "eulerian.net", "smartadserver.com", "criteo.com", "taboola.com", "outbrain.com",
+]
+
+
+def blocked_url_patterns(block_resources=True, block_hosts=True):
+    patterns = list(BLOCKED_RESOURCES) if block_resources else []
+    if block_hosts:
+        patterns += [f"*{host}*" for host in BLOCKED_HOSTS]
+    return patterns
+
+
+def chrome_options(profile=None, headless=None, window_size=(1600, 1000)):
+    """Chrome options of a profile; `headless` overrides the profile's"""
+    # Selenium is imported on use: the runner reads PROFILES for scrapers without a browser too
+    from selenium.webdriver.chrome.options import Options
+
+    settings = PROFILES[profile or DEFAULT_PROFILE]
+    headless = settings["headless"] if headless is None else headless
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"--window-size={window_size[0]},{window_size[1]}")
+    options.page_load_strategy = settings["page_load_strategy"]
+    if settings["block_resources"]:
+        # images are also refused by the renderer itself, before any request
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        options.add_argument("--mute-audio")
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+    return options
+
+
+def create_driver(driver_path=None, headless=None, profile=None, window_size=(1600, 1000)):
+    """Chrome configured for scraping with the `profile` ("lean" or "full")
+
+    `driver_path` is a chromedriver binary (None lets Selenium find one).
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    settings = PROFILES[profile or DEFAULT_PROFILE]
+    options = chrome_options(profile, headless, window_size)
+    service = Service(driver_path) if driver_path else Service()
+    driver = webdriver.Chrome(service=service, options=options)
+    patterns = blocked_url_patterns(settings["block_resources"], settings["block_hosts"])
+    if patterns:
+        # CDP request blocking: the requests fail before leaving the browser
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return driver
+
+
+class CommandCounter:
+    """Count the WebDriver protocol commands sent by a driver.
+
+    Element calls (find_element, .text, get_attribute...) go through the
+    driver's execute() too, so every round trip to chromedriver is counted.
+
+        with CommandCounter(driver) as counter:
+            read_cards(driver)   # scrapers.FranceTravail
+        print(counter.total, counter.counts.most_common())
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.counts = Counter()
+        self._execute = None
+
+    def __enter__(self):
+        self._execute = self.driver.execute
+        self.driver.execute = self._counting_execute
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # drop the instance attribute so the class method is used again
+        del self.driver.execute
+        return False
+
+    def _counting_execute(self, driver_command, params=None):
+        self.counts[driver_command] += 1
+        return self._execute(driver_command, params)
+
+    @property
+    def total(self):
+        return sum(self.counts.values())
@@ -0,0 +1,305 @@
+"""
+Warm Chrome browsers shared by the Selenium scrapers.
+
+ChromeDriverManager().install() asks the network for the latest driver
+version on every call, even when the binary is already downloaded, and
+each run then pays a few seconds to start Chrome. driver_path() resolves
+chromedriver once and remembers it in .cache/chromedriver.json (path
+overridable with CHROMEDRIVER_CACHE_PATH); DriverPool keeps the browsers
+alive when a scraper is done with them and hands them out again with a
+clean session (extra tabs closed, cookies and storage cleared).
+
+    pool = get_pool()
+    driver = pool.acquire(profile="lean")
+    try:
+        driver.get(url)
+    finally:
+        pool.release(driver)
+
+The browsers live as long as the process: `python -m scrapers run ...
+--every 60` runs the scrapers every hour from the same process, and only
+the first run starts Chrome.
+
+SCRAPER_OFFLINE=1 never contacts the network: the driver comes from
+CHROMEDRIVER_PATH, the cache file or the PATH.
+"""
+
+import atexit
+import json
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from scrapers.driver import DEFAULT_PROFILE, PROFILES, create_driver
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[1] / ".cache" / "chromedriver.json"
+
+# idle browsers kept per kind (profile, headless): the France Travail pool uses 4 by default
+POOL_SIZE = int(os.getenv("SCRAPER_DRIVER_POOL_SIZE", "4"))
+
+# sessions served by a browser before it is restarted (Chrome's memory grows with use)
+MAX_USES = int(os.getenv("SCRAPER_DRIVER_MAX_USES", "50"))
+
+# a cached driver is looked up again (when online) after this many days, to follow Chrome updates
+MAX_AGE_DAYS = float(os.getenv("CHROMEDRIVER_MAX_AGE_DAYS", "7"))
+
+_resolve_lock = threading.Lock()
+_resolved = None
+
+
+def is_offline():
+    return os.getenv("SCRAPER_OFFLINE", "").lower() not in ("", "0", "false", "no")
+
+
+def driver_path(offline=None, refresh=False):
+    """chromedriver binary, resolved once per process and cached on disk
+
+    Order: CHROMEDRIVER_PATH, the cache file (younger than MAX_AGE_DAYS, or
+    any age when offline), ChromeDriverManager (online only), chromedriver
+    on the PATH. `refresh` skips the cache, e.g. after a Chrome update made
+    the cached driver incompatible.
+    """
+    global _resolved
+    offline = is_offline() if offline is None else offline
+    explicit = os.getenv("CHROMEDRIVER_PATH")
+    if explicit:
+        return explicit
+
+    with _resolve_lock:
+        if _resolved is not None and not refresh:
+            return _resolved
+        cache_path = Path(os.getenv("CHROMEDRIVER_CACHE_PATH") or DEFAULT_CACHE_PATH)
+        cached = None if refresh else read_cache(cache_path)
+        if cached is not None:
+            path, resolved_at = cached
+            if offline or time.time() - resolved_at < MAX_AGE_DAYS * 86400:
+                _resolved = path
+                return path
+
+        path = None
+        if not offline:
+            try:
+                from webdriver_manager.chrome import ChromeDriverManager
+
+                path = ChromeDriverManager().install()
+            except Exception as e:
+                # no network: an old cached driver is better than none
+                print(f"⚠️ chromedriver lookup failed: {e}")
+                path = cached[0] if cached is not None else None
+        path = path or shutil.which("chromedriver")
+        if path is None:
+            raise RuntimeError(
+                "No chromedriver available offline: set CHROMEDRIVER_PATH or run once with the network"
+            )
+        write_cache(cache_path, path)
+        _resolved = path
+        return path
+
+
+def read_cache(cache_path):
+    """(path, resolved_at) of the cache file, None when missing or the binary is gone"""
+    try:
+        with open(cache_path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    path = cached.get("path")
+    if not path or not os.path.isfile(path):
+        return None
+    return path, cached.get("resolved_at", 0)
+
+
+def write_cache(cache_path, path):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump({"path": path, "resolved_at": time.time()}, f)
+    os.replace(tmp_path, cache_path)
+
+
+def visited_origins(driver):
+    """http(s) origins of the navigation history of the current tab"""
+    history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+    origins = set()
+    for entry in history.get("entries", []):
+        parts = urlsplit(entry.get("url", ""))
+        if parts.scheme in ("http", "https") and parts.netloc:
+            origins.add(f"{parts.scheme}://{parts.netloc}")
+    return origins
+
+
+def reset_session(driver):
+    """close the extra tabs, clear cookies and the storage of the visited origins, back to about:blank
+
+    Storage is cleared for every origin of the tabs' navigation history,
+    not only the pages open at release: a site left earlier in the
+    session keeps its local storage and IndexedDB otherwise.
+    """
+    handles = driver.window_handles
+    origins = set()
+    for handle in reversed(handles):
+        driver.switch_to.window(handle)
+        driver.execute_script("try { sessionStorage.clear(); } catch (e) {}")
+        origins |= visited_origins(driver)
+        if handle != handles[0]:
+            driver.close()
+    driver.switch_to.window(handles[0])
+    driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    for origin in origins:
+        # local storage, IndexedDB, service workers and cache storage; the HTTP cache is kept warm
+        driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+    driver.get("about:blank")
+
+
+class DriverPool:
+    """Idle Chrome browsers ready to be reused, at most `size` of each kind.
+
+    A kind is a (profile, headless) pair: acquire() returns an idle browser
+    of that kind, or starts one; release() resets its session and keeps it
+    for the next acquire(), or quits it when the pool is full, the browser
+    served `max_uses` sessions or it does not answer anymore.
+    """
+
+    def __init__(self, size=POOL_SIZE, max_uses=MAX_USES, driver_path=None, offline=None):
+        self.size = size
+        self.max_uses = max_uses
+        self.offline = offline
+        self._driver_path = driver_path
+        self._idle = {}  # kind -> [driver]
+        self._leased = {}  # id(driver) -> (kind, uses)
+        self._uses = {}  # id(driver) -> sessions served, for the idle ones
+        self._lock = threading.Lock()
+        self.stats = Counter()  # started, reused, discarded
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def kind(self, profile=None, headless=None):
+        profile = profile or DEFAULT_PROFILE
+        return profile, PROFILES[profile]["headless"] if headless is None else headless
+
+    def acquire(self, profile=None, headless=None):
+        """a browser of this kind with a clean session"""
+        kind = self.kind(profile, headless)
+        while True:
+            with self._lock:
+                idle = self._idle.get(kind)
+                driver = idle.pop() if idle else None
+                uses = self._uses.pop(id(driver), 0) if driver is not None else 0
+            if driver is None:
+                break
+            if self.alive(driver):
+                with self._lock:
+                    self.stats["reused"] += 1
+                    self._leased[id(driver)] = (kind, uses + 1)
+                return driver
+            self.discard(driver)
+
+        driver = self.start(kind)
+        with self._lock:
+            self._leased[id(driver)] = (kind, 1)
+        return driver
+
+    def start(self, kind):
+        profile, headless = kind
+        offline = is_offline() if self.offline is None else self.offline
+        path = self._driver_path or driver_path(offline)
+        try:
+            driver = create_driver(path, headless=headless, profile=profile)
+        except Exception as e:
+            # a cached driver that no longer matches Chrome after an update
+            if self._driver_path or offline or "session not created" not in str(e).lower():
+                raise
+            driver = create_driver(driver_path(offline, refresh=True), headless=headless, profile=profile)
+        # the counter is shared by the scrapers' threads
+        with self._lock:
+            self.stats["started"] += 1
+        return driver
+
+    def release(self, driver):
+        """give a browser back: its session is reset and it waits for the next acquire()"""
+        with self._lock:
+            kind, uses = self._leased.pop(id(driver), (None, 0))
+        if kind is None or uses >= self.max_uses:
+            self.discard(driver)
+            return
+        try:
+            reset_session(driver)
+        except Exception:
+            self.discard(driver)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(kind, [])
+            if len(idle) < self.size:
+                idle.append(driver)
+                self._uses[id(driver)] = uses
+                return
+        self.discard(driver)
+
+    def warm(self, count, profile=None, headless=None):
+        """start browsers of this kind in parallel until `count` are idle"""
+        kind = self.kind(profile, headless)
+        with self._lock:
+            missing = min(count, self.size) - len(self._idle.get(kind, []))
+        if missing <= 0:
+            return
+        with ThreadPoolExecutor(max_workers=missing) as pool:
+            drivers = list(pool.map(lambda _: self.start(kind), range(missing)))
+        with self._lock:
+            self._idle.setdefault(kind, []).extend(drivers)
+
+    def alive(self, driver):
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def discard(self, driver):
+        with self._lock:
+            self.stats["discarded"] += 1
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def idle(self):
+        with self._lock:
+            return sum(map(len, self._idle.values()))
+
+    def close(self):
+        """quit the idle browsers (the leased ones are quit when released)"""
+        with self._lock:
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            self._idle = {}
+            self._uses = {}
+            self.size = 0
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """pool shared by the scrapers of the process, closed at exit"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -1,137 +1,213 @@
-# script to scrape job listings from Emploitic (Algeria’s most popular job website)
+# scraper of the job listings of Emploitic (Algeria’s most popular job website)
+#
+#     python -m scrapers.emploitic            # new run
+#     python -m scrapers.emploitic --resume   # continue an interrupted run
+#     python -m scrapers run emploitic        # same, through the common runner
+
+import argparse
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from database.db import insert_job
-
-# initialize Chrome WebDriver 
-service = Service(ChromeDriverManager().install())
-driver = webdriver.Chrome(service=service)
-
-# open the website homepage
-driver.get("https://emploitic.com/")
-
-# create a WebDriverWait object that defines a maximum wait time for 10 seconds
-wait = WebDriverWait(driver, 10)
+from selenium.common.exceptions import NoSuchElementException
+from scrapers.base import BaseScraper, register
+from scrapers.driver import DEFAULT_PROFILE, PROFILES
+from scrapers.driver_pool import get_pool
+from scrapers.runner import run_scrapers
+from scrapers.waits import SmartWaits
+
+# read every job card of the page in a single WebDriver command
+JOBS_JS = """
+const text = (el) => (el ? el.innerText : null);
+return Array.from(document.querySelectorAll('li[data-testid="jobs-item"]')).map((job) => {
+    const link = job.querySelector('a.MuiLink-root');
+    return {
+        title: text(job.querySelector('h2.MuiTypography-root')),
+        company: text(job.querySelector('p[data-testid="jobs-item-company"]')),
+        url: link ? link.href : null,
+        details: Array.from(job.querySelectorAll('div.MuiStack-root.mui-1lwc51h')).map((el) => el.innerText),
+    };
+});
+"""
+
+
+# pages failing in a row before the run stops
+MAX_FAILURES = 3
+
+
+def build_job(raw):
+    """turn the raw texts of one card into a job record (location and date are the first two detail stacks)"""
+    if raw['title'] is None or raw['company'] is None or raw['url'] is None:
+        raise ValueError("missing title, company or link")
+    if len(raw['details']) < 2:
+        raise ValueError("missing location or posting date")
+    return {
+        'source': "Emploitic",
+        'title': raw['title'],
+        'company': raw['company'],
+        'location': raw['details'][0],
+        'date_posted': raw['details'][1],
+        'url': raw['url']
+    }
+
+
+@register
+class EmploiticScraper(BaseScraper):
+    """Emploitic: search from the homepage, then click through the result pages.
+
+    The result pages have no url of their own, so resuming a run or
+    retrying a failed page clicks through to it again. Results are sorted
+    by relevance: known offers are skipped but don't stop the crawl.
+    """
+
+    name = "emploitic"
+    default_query = "cybersecurity"
+    resumable = True
+
+    def open(self):
+        # take a warm Chrome from the pool (lean profile: headless, no images / CSS / fonts / trackers)
+        self.driver = get_pool().acquire(profile=self.profile)
+
+        # create a WebDriverWait object that defines a maximum wait time for 10 seconds
+        self.wait = WebDriverWait(self.driver, 10)
+
+        # event-driven waits (the fixed pauses used to cost 1 + 2 seconds per page)
+        self.waits = SmartWaits(self.driver, legacy_sleep=3, host="emploitic.com")
+
+    def close(self):
+        # give the browser back to the pool (cleared cookies and storage) for the next run
+        if getattr(self, "driver", None) is not None:
+            get_pool().release(self.driver)
+            self.driver = None
+
+    def next_page(self, job_items):
+        """click the next page button, False on the last page"""
+        # find the next button
+        next_button = self.driver.find_element(By.CSS_SELECTOR, 'button[aria-label="Go to next page"]')
+
+        # check if button has the disabled class
+        button_classes = next_button.get_attribute('class')
+        if 'Mui-disabled' in button_classes:
+            return False
+
+        #button is enabled so it scrolls to its view and click
+        self.driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
+
+        # reference to current job item for staleness check
+        first_job = job_items[0]
+
+        # click the next button (after the global politeness delay)
+        self.waits.pace()
+        next_button.click()
+
+        # wait for page content to refresh: old items detached, then the new list stops changing
+        if self.waits.staleness(first_job):
+            self.waits.dom_quiet('ul:has(> li[data-testid="jobs-item"])')
+        else:
+            self.waits.network_idle()
+        return True
+
+    def wait_job_items(self):
+        # wait for job items to load and find all job listings
+        return self.wait.until(
+            EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'li[data-testid="jobs-item"]'))
+        )
 
-# wait until the search input element appears on the page or it will stop after 10 seconds
-input_element = wait.until(
-    EC.presence_of_element_located((By.CSS_SELECTOR, 'input[data-testid="search"]'))
-)
+    def open_search(self, target_page=1):
+        """search from the homepage and click through to `target_page`, False when there are fewer pages"""
+        # open the website homepage
+        self.driver.get("https://emploitic.com/")
 
-# type the search world cybersecurity and press Enter to search for related jobs
-search_job ="cybersecurity"
-input_element.send_keys(search_job + Keys.ENTER)
+        # wait until the search input element appears on the page or it will stop after 10 seconds
+        input_element = self.wait.until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, 'input[data-testid="search"]'))
+        )
 
-time.sleep(2)  # brief pause after Enter
+        # type the search words (cybersecurity by default) and press Enter to search for related jobs
+        input_element.send_keys(self.query + Keys.ENTER)
 
-jobs_number =0
-page = 1
+        for _ in range(target_page - 1):
+            if not self.next_page(self.wait_job_items()):
+                return False
+        return True
 
-while True:
-    print(f"\n{'='*50}")
-    print(f"Scraping Page {page}")
-    print(f"{'='*50}")
+    def fetch(self):
+        # the pages of an interrupted run are skipped by clicking through them
+        page = self.checkpoint.page + 1 if self.checkpoint is not None else 1
+        if page > 1:
+            print(f"Resuming run {self.checkpoint.run_id} at page {page}")
+        self.open_search(page)
+        failures = 0
 
-    try:
-        # wait for job items to load and find all job listings 
-        job_items = wait.until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'li[data-testid="jobs-item"]'))
-        )
+        while True:
+            print(f"\n{'='*50}")
+            print(f"Scraping Page {page}")
+            print(f"{'='*50}")
 
-        for index, job in enumerate(job_items, start=1):
             try:
-               # extract job title
-               title = job.find_element(By.CSS_SELECTOR, 'h2.MuiTypography-root').text
-               
-               # extract company name
-               company = job.find_element(By.CSS_SELECTOR, 'p[data-testid="jobs-item-company"]').text
-               
-               # extract job URL
-               job_link = job.find_element(By.CSS_SELECTOR, 'a.MuiLink-root').get_attribute('href')
-               
-               # extract location 
-               location = job.find_elements(By.CSS_SELECTOR, 'div.MuiStack-root.mui-1lwc51h')[0].text
-               
-               # extract posting date
-               date_posted = job.find_elements(By.CSS_SELECTOR, 'div.MuiStack-root.mui-1lwc51h')[1].text
-               
-               job_data = {
-                    'source':"Emploitic",
-                    'title': title,
-                    'company': company,
-                    'location': location,
-                    'date_posted': date_posted,
-                    'url': job_link
-                }
-               insert_job(job_data)
-               jobs_number+=1
-               print(f"Job number : {jobs_number}")
-               print(f"\nJob {index} on Page {page}")
-               print(f"Title: {title}")
-               print(f"Company: {company}")
-               print(f"Location: {location}")
-               print(f"Date Posted: {date_posted}")
-               print(f"URL: {job_link}")
-               print("-" * 40)
-
+                job_items = self.wait_job_items()
+                # extract all the cards at once, the post-processing runs in Python
+                raw_jobs = self.driver.execute_script(JOBS_JS)
             except Exception as e:
-                print(f"Error extracting data from job {index}: {e}")
-
-        # check if the next page button is not disabled
-        try:
-            # find the next button
-            next_button = driver.find_element(By.CSS_SELECTOR, 'button[aria-label="Go to next page"]')
-            
-            # check if button has the disabled class
-            button_classes = next_button.get_attribute('class')
-            if 'Mui-disabled' in button_classes:
-                print("\nReached the last page. Next button is disabled.")
-                break
-            
-            #button is enabled so it scrolls to its view and click
-            driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", next_button)
-            time.sleep(1)
-            
-            # reference to current job item for staleness check
-            first_job = job_items[0]
-            
-            # click the next button
-            next_button.click()
-            page += 1
-            
-            # wait for page content to refresh
+                # retried at the end of the run instead of ending it
+                self.page_failed(page, {"page": page}, e)
+                failures += 1
+                if failures >= MAX_FAILURES:
+                    # an error, not the end of the results: the run stays open for --resume
+                    raise RuntimeError(f"{failures} pages failed in a row, stopping at page {page}")
+                job_items = self.driver.find_elements(By.CSS_SELECTOR, 'li[data-testid="jobs-item"]')
+                if not job_items:
+                    return
+            else:
+                failures = 0
+                yield page, raw_jobs
+
+            # check if the next page button is not disabled
             try:
-                wait.until(EC.staleness_of(first_job))
-                time.sleep(2)
-            except TimeoutException:
-                time.sleep(3)
-                
-        except NoSuchElementException:
-            print("\nNo next button found.")
-            break
-        except Exception as e:
-            print(f"\nError during pagination: {e}")
-            break
-            
-    except Exception as e:
-        print(f"\nError loading page {page}: {e}")
-        break
-
-# the final summary
-print(f"\n{'='*50}")
-print(f"Scraping Complete")
-print(f"{'='*50}")
-print(f"Total pages scraped: {page}")
-print(f"Total jobs collected: {jobs_number}")
-
-
-# close the browser
-driver.quit()
\ No newline at end of file
+                if not self.next_page(job_items):
+                    print("\nReached the last page. Next button is disabled.")
+                    return
+                self.waits.page_done(page)
+                page += 1
+
+            except NoSuchElementException:
+                print("\nNo next button found.")
+                return
+            except Exception as e:
+                # browser crash, lost session...: ending the generator here would mark the run finished,
+                # re-raising keeps the checkpoint at the last completed page for --resume
+                print(f"\nError during pagination: {e}")
+                raise
+
+    def normalize(self, raw):
+        return build_job(raw)
+
+    def refetch(self, cursor):
+        if not self.open_search(cursor["page"]):
+            raise ValueError(f"page {cursor['page']} is past the last page")
+        self.wait_job_items()
+        return self.driver.execute_script(JOBS_JS)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emploitic scraper")
+    parser.add_argument("--query", default=EmploiticScraper.default_query)
+    parser.add_argument("--resume", action="store_true", help="continue the last interrupted run from its last page")
+    parser.add_argument(
+        "--profile",
+        choices=sorted(PROFILES),
+        default=DEFAULT_PROFILE,
+        help="browser profile: lean (headless, no images/CSS/fonts/trackers) or full",
+    )
+    args = parser.parse_args()
+    run_scrapers(
+        ["emploitic"],
+        args.query,
+        resume=args.resume,
+        profile=args.profile,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Run registered scrapers, several sources at the same time.
+
+Each scraper runs in its own thread with its own JobWriter; they share
+the seen-set of known urls, the near-duplicate index (an offer found on
+two boards in one run joins one cluster) and the checkpoint store. The run ends with
+the time spent in each stage (fetch / parse / normalize / sink) per
+scraper.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from database.db import JobWriter, get_client, load_dedup_index
+from scrapers.base import STAGES, get_scraper
+from scrapers.checkpoints import CheckpointStore
+from scrapers.seen import STOP_AFTER_KNOWN, SeenSet
+
+
+def run_scraper(scraper, resume=False, checkpoints=None, dedup=None):
+    """run one scraper with its own JobWriter (and checkpoint when it is resumable)
+
+    `dedup` is the DedupIndex shared by the writers of the run, None when
+    the table has no identity columns.
+    """
+    with JobWriter(dedup=dedup, identify=dedup is not None) as writer:
+        scraper.writer = writer
+        if scraper.resumable and checkpoints is not None:
+            scraper.checkpoint = checkpoints.start(*scraper.checkpoint_key(), resume=resume, flush=writer.flush)
+        scraper.run()
+    return scraper
+
+
+def run_scrapers(
+    names, query=None, concurrency=None, resume=False, stop_after_known=STOP_AFTER_KNOWN, profile=None, options=None
+):
+    """run the scrapers `names` (at most `concurrency` at a time), returns them with their stats
+
+    `query` replaces the default query of every scraper, `options` maps a
+    scraper name to extra keyword arguments of its class.
+    """
+    classes = [get_scraper(name) for name in names]
+    seen = SeenSet.load(client=get_client(), stop_after=stop_after_known)
+    print(f"🔎 {len(seen)} offers already known")
+    checkpoints = CheckpointStore()
+    # one near-duplicate index for every writer (built once, lock-protected)
+    dedup = load_dedup_index(get_client())
+    options = options or {}
+
+    # the early stop on known offers only holds for the listings sorted newest first
+    scrapers = [
+        cls(query, seen_set=seen.fork(None if cls.sorted_by_date else 0), profile=profile, **options.get(cls.name, {}))
+        for cls in classes
+    ]
+    failed = []
+    with ThreadPoolExecutor(max_workers=concurrency or len(scrapers)) as pool:
+        futures = {pool.submit(run_scraper, scraper, resume, checkpoints, dedup): scraper for scraper in scrapers}
+        for future in as_completed(futures):
+            scraper = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                failed.append(scraper)
+                print(f"❌ [{scraper.name}] run aborted: {e!r}")
+
+    seen.save()
+    print_report(scrapers)
+    return scrapers, failed
+
+
+def print_report(scrapers):
+    header = f"{'scraper':<16} {'pages':>6} {'offers':>7} {'new':>6} {'known':>6} {'failed':>7}"
+    header += "".join(f" {stage + ' s':>12}" for stage in STAGES) + f" {'total s':>9}"
+    print("\n" + header)
+    for scraper in scrapers:
+        stats = scraper.stats
+        line = (
+            f"{scraper.name:<16} {stats['pages']:>6} {stats['records']:>7} {stats['new']:>6} "
+            f"{stats['known']:>6} {stats['failed']:>7}"
+        )
+        line += "".join(f" {scraper.timings.seconds[stage]:>12.2f}" for stage in STAGES)
+        print(line + f" {stats['elapsed']:>9.2f}")
+    for scraper in scrapers:
+        if scraper.writer is not None:
+            totals = scraper.writer.totals
+            print(
+                f"💾 [{scraper.name}] {totals['written']} new jobs saved "
+                f"(already in the table: {totals['skipped']}, failed: {totals['failed']})"
+            )
@@ -0,0 +1,133 @@
+"""
+Persistent set of the offer urls already in the jobs table.
+
+Loaded when a scraper starts, it lets the scraper skip the cards it
+already knows before writing anything, and stop paginating after a run
+of known offers when the board lists its results newest first
+(BaseScraper.sorted_by_date): once a whole run of offers is known, the
+rest of the listing was collected by an earlier run.
+
+Urls are canonicalized like in the table (database/identity.py) and kept
+as 64-bit hashes in a sorted numpy array: 8 bytes per url, and unlike a
+Bloom filter no new offer is ever taken for a known one (a collision
+needs billions of urls). The file only mirrors the table: it records the
+highest job id it covers, so a start downloads the urls of the jobs added
+since, including the ones written by the previous run. Urls added during
+a run only avoid handling the same offer twice and are not saved, so an
+offer whose write failed is retried next time.
+
+    seen = SeenSet.load(client=writer.client)
+    for job in jobs:
+        if seen.check(job["url"]):
+            continue
+        writer.add(job)
+        seen.add(job["url"])
+    if seen.exhausted: ...stop paginating...
+    seen.save()
+"""
+
+import copy
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+
+from database.identity import canonical_url, iter_rows
+
+DEFAULT_PATH = Path(__file__).resolve().parents[1] / ".cache" / "seen_urls.npz"
+
+# consecutive known offers after which a scraper stops paginating (0 = never)
+STOP_AFTER_KNOWN = int(os.getenv("SCRAPER_STOP_AFTER_KNOWN", "40"))
+
+
+def url_hash(url):
+    digest = hashlib.blake2b((canonical_url(url) or "").encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+class SeenSet:
+    """Known offer urls, with the count of consecutive known offers met."""
+
+    def __init__(self, path=None, stop_after=STOP_AFTER_KNOWN):
+        self.path = Path(path or os.getenv("SEEN_URLS_PATH") or DEFAULT_PATH)
+        self.stop_after = stop_after
+        self.hashes = np.empty(0, dtype=np.uint64)  # sorted
+        self.synced = set()  # hashes read from the table, not merged into the array yet
+        self.session = set()  # hashes of the offers handled by this run
+        self.max_id = 0
+        self.streak = 0
+        self.skipped = 0
+
+    @classmethod
+    def load(cls, path=None, client=None, stop_after=STOP_AFTER_KNOWN):
+        """read the file, then add the urls of the jobs inserted since (when `client` is given)"""
+        seen = cls(path, stop_after)
+        if seen.path.exists():
+            try:
+                with np.load(seen.path) as data:
+                    seen.hashes = data["hashes"]
+                    seen.max_id = int(data["max_id"])
+            except Exception as e:
+                print(f"Ignoring unreadable seen-set {seen.path}: {e}")
+        if client is not None:
+            try:
+                seen.sync(client)
+            except Exception as e:
+                print(f"⚠️ Seen-set not synced with the database: {e}")
+        return seen
+
+    def sync(self, client, table="jobs"):
+        """add the urls of the jobs with an id above the last synced one"""
+        for row in iter_rows(client, "id,url", table, after_id=self.max_id or None):
+            self.synced.add(url_hash(row["url"]))
+            self.max_id = max(self.max_id, row["id"])
+
+    def fork(self, stop_after=None):
+        """view sharing the urls with its own streak, for one scraper of a concurrent run"""
+        view = copy.copy(self)
+        view.stop_after = self.stop_after if stop_after is None else stop_after
+        view.streak = 0
+        view.skipped = 0
+        return view
+
+    def __len__(self):
+        return len(self.hashes) + len(self.synced)
+
+    def __contains__(self, url):
+        value = url_hash(url)
+        if value in self.synced or value in self.session:
+            return True
+        position = np.searchsorted(self.hashes, np.uint64(value))
+        return position < len(self.hashes) and int(self.hashes[position]) == value
+
+    def add(self, url):
+        """mark an offer handled by this run"""
+        self.session.add(url_hash(url))
+
+    def check(self, url):
+        """True when `url` is known, counting the run of consecutive known urls"""
+        known = url in self
+        if known:
+            self.streak += 1
+            self.skipped += 1
+        else:
+            self.streak = 0
+        return known
+
+    @property
+    def exhausted(self):
+        """the last `stop_after` offers were all known"""
+        return bool(self.stop_after) and self.streak >= self.stop_after
+
+    def save(self):
+        """write the urls read from the table (not the ones of this run)"""
+        if self.synced:
+            synced = np.fromiter(self.synced, dtype=np.uint64, count=len(self.synced))
+            self.hashes = np.union1d(self.hashes, synced)
+            self.synced = set()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # np.savez adds .npz to names that don't end with it
+        tmp_path = self.path.with_name(self.path.stem + ".tmp.npz")
+        np.savez(tmp_path, hashes=self.hashes, max_id=self.max_id)
+        os.replace(tmp_path, self.path)
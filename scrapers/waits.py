@@ -0,0 +1,163 @@
+"""
+Event-driven waits shared by the Selenium scrapers.
+
+Instead of fixed time.sleep() pauses, scrapers wait for something to
+happen in the page: the DOM stops changing, the network goes quiet, an
+element goes stale or a list grows. A global PacingPolicy keeps a minimum
+delay between two page actions on the same host so the job boards are
+not hammered.
+
+    waits = SmartWaits(driver, legacy_sleep=5, host="emploitic.com")
+    waits.pace()
+    next_button.click()
+    waits.staleness(first_item)
+    waits.dom_quiet('li[data-testid="jobs-item"]')
+    waits.page_done(page)   # logs the time saved against the fixed sleeps
+"""
+
+import os
+import random
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class PacingPolicy:
+    """Minimum delay (plus random jitter) between two actions on a job board.
+
+    Each host has its own slot: only the part of the interval that has not
+    already elapsed is slept, so slow pages cost no extra time, and the
+    drivers of one board don't queue behind those of another. Thread-safe,
+    shared by all drivers: the next slot of the host is reserved under the
+    lock and slept after releasing it.
+    """
+
+    def __init__(self, min_interval=0.5, jitter=0.25):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        # host -> monotonic time of its last (or next reserved) action
+        self.last_action = {}
+
+    def wait(self, host=None):
+        """sleep until the next action on `host` is allowed, return the time slept"""
+        with self.lock:
+            now = time.monotonic()
+            target = max(now, self.last_action.get(host, 0.0) + self.min_interval + random.uniform(0, self.jitter))
+            self.last_action[host] = target
+        delay = target - now
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+# politeness settings for every scraper, overridable from the environment
+PACING = PacingPolicy(
+    min_interval=float(os.getenv("SCRAPER_MIN_INTERVAL", "0.5")),
+    jitter=float(os.getenv("SCRAPER_JITTER", "0.25")),
+)
+
+
+# resolves once `target` has not been mutated for `quiet` ms (or after `limit` ms)
+DOM_QUIET_JS = """
+const [selector, quiet, limit, done] = arguments;
+const target = (selector && document.querySelector(selector)) || document.body;
+let timer = null;
+const finish = () => { observer.disconnect(); clearTimeout(timer); clearTimeout(cap); done(true); };
+const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(finish, quiet); });
+observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+timer = setTimeout(finish, quiet);
+const cap = setTimeout(() => { observer.disconnect(); clearTimeout(timer); done(false); }, limit);
+"""
+
+# resolves once the document is loaded and no new resource was fetched for `idle` ms
+NETWORK_IDLE_JS = """
+const [idle, limit, done] = arguments;
+const started = Date.now();
+let count = -1, stableSince = Date.now();
+(function poll() {
+    const current = performance.getEntriesByType('resource').length;
+    if (current !== count) { count = current; stableSince = Date.now(); }
+    if (document.readyState === 'complete' && Date.now() - stableSince >= idle) return done(true);
+    if (Date.now() - started >= limit) return done(false);
+    setTimeout(poll, 50);
+})();
+"""
+
+
+class SmartWaits:
+    """Wait helpers bound to one driver, with per-page time accounting.
+
+    `legacy_sleep` is the fixed pause the scraper used to take per page;
+    page_done() prints how long the event-driven waits actually took
+    compared to it.
+    """
+
+    def __init__(self, driver, timeout=10, legacy_sleep=0.0, pacing=PACING, host=None):
+        self.driver = driver
+        self.host = host
+        self.timeout = timeout
+        self.legacy_sleep = legacy_sleep
+        self.pacing = pacing
+        self.page_waited = 0.0
+        self.total_saved = 0.0
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.page_waited += time.perf_counter() - start
+
+    def pace(self):
+        """respect the politeness delay of the host before a navigation or click"""
+        return self._timed(self.pacing.wait, self.host)
+
+    def until(self, condition):
+        """WebDriverWait.until with the default timeout"""
+        return self._timed(WebDriverWait(self.driver, self.timeout).until, condition)
+
+    def dom_quiet(self, selector=None, quiet_ms=300):
+        """wait until the element matching `selector` (or body) stops changing"""
+        self.driver.set_script_timeout(self.timeout + 1)
+        return self._timed(
+            self.driver.execute_async_script,
+            DOM_QUIET_JS, selector, quiet_ms, self.timeout * 1000,
+        )
+
+    def network_idle(self, idle_ms=500):
+        """wait until the page is loaded and no resource was fetched for `idle_ms`"""
+        self.driver.set_script_timeout(self.timeout + 1)
+        return self._timed(
+            self.driver.execute_async_script,
+            NETWORK_IDLE_JS, idle_ms, self.timeout * 1000,
+        )
+
+    def staleness(self, element):
+        """wait until `element` is detached from the DOM, False on timeout"""
+        try:
+            self.until(EC.staleness_of(element))
+            return True
+        except TimeoutException:
+            return False
+
+    def count_greater(self, selector, previous):
+        """wait until more than `previous` elements match the CSS `selector`"""
+        return self.until(
+            lambda d: len(d.find_elements(By.CSS_SELECTOR, selector)) > previous
+        )
+
+    def page_done(self, page):
+        """log the time spent waiting on this page against the old fixed sleeps"""
+        saved = self.legacy_sleep - self.page_waited
+        self.total_saved += saved
+        print(
+            f"⏱️  Page {page}: waited {self.page_waited:.2f}s "
+            f"(fixed sleeps: {self.legacy_sleep:.1f}s, saved {saved:+.2f}s, "
+            f"total saved {self.total_saved:.1f}s)"
+        )
+        self.page_waited = 0.0